@@ -0,0 +1,89 @@
+"""Measure read throughput of API-style handlers as concurrent clients grow.
+
+Usage (from backend/, against a running Neo4j with at least one analyzed repo):
+    python benchmarks/bench_async_reads.py [--clients 1 2 4 8 16 32] [--requests 400]
+        [--uri bolt://localhost:7687 --user neo4j --password ...] [--repo-id ID]
+
+Each client is a coroutine on one event loop, as requests are under
+uvicorn. The "sync" handler calls GraphDB directly and blocks the loop for
+the whole query; the "async" handler awaits AsyncGraphDB. With the sync
+driver throughput stays flat however many clients there are; with the
+async one it should scale until the pool or the server saturates.
+
+--read functions times the /functions handler; --read dependencies times
+/dependencies: path resolution (--path, e.g. "src/main.py") followed by
+the dependency query. Without --repo-id the path is resolved by the
+stored-path lookups, which then also run on the driver under test.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.graph.graph_db import GraphDB  # noqa: E402
+from src.graph.async_graph_db import AsyncGraphDB  # noqa: E402
+
+
+async def run_clients(handler, clients, requests):
+    remaining = requests
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await handler()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main_async(args):
+    sync_db = GraphDB(args.uri, args.user, args.password)
+    async_db = AsyncGraphDB(args.uri, args.user, args.password, max_pool_size=args.pool_size)
+    repo_id = args.repo_id
+
+    if args.read == 'dependencies':
+        async def sync_handler():
+            sync_db.get_dependencies(args.path, repo_id)
+
+        async def async_handler():
+            await async_db.get_dependencies(await async_db.resolve_file_path(sync_db, args.path, repo_id))
+    else:
+        async def sync_handler():
+            sync_db.get_all_functions(repo_id)
+
+        async def async_handler():
+            await async_db.get_all_functions(repo_id)
+
+    try:
+        await async_handler()  # warm up the pool and the query cache
+        print(f"{'clients':>8} {'sync req/s':>12} {'async req/s':>12}")
+        for clients in args.clients:
+            sync_rate = await run_clients(sync_handler, clients, args.requests)
+            async_rate = await run_clients(async_handler, clients, args.requests)
+            print(f"{clients:>8} {sync_rate:>12.1f} {async_rate:>12.1f}")
+    finally:
+        sync_db.close()
+        await async_db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--pool-size', type=int, default=50)
+    parser.add_argument('--repo-id', default=None, help="restrict queries to one repository")
+    parser.add_argument('--read', choices=['functions', 'dependencies'], default='functions')
+    parser.add_argument('--path', default='main.py', help="file path for --read dependencies")
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
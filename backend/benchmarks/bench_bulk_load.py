@@ -0,0 +1,126 @@
+"""Compare batched UNWIND writes with the offline LOAD CSV bulk load.
+
+Usage (from backend/, against a local Neo4j whose import directory is writable):
+    python benchmarks/bench_bulk_load.py --import-dir /var/lib/neo4j/import \
+        [--files 5000] [--uri bolt://localhost:7687 --user neo4j --password ...]
+
+Both runs write the same synthetic repository under a throwaway repo_id,
+count the nodes and relationships it produced, and delete it afterwards.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.graph.graph_db import GraphDB  # noqa: E402
+from src.graph.bulk_loader import CSVBulkLoader  # noqa: E402
+
+REPO_ID = 'bench-bulk-load'
+
+
+def synthetic_repo(n_files, seed=0):
+    rng = random.Random(seed)
+    parsed = []
+    for i in range(n_files):
+        path = f"/bench/repo/pkg{i % 50}/mod{i}.py"
+        parsed.append({
+            'file': path,
+            'language': 'python',
+            'content_hash': f"{i:064x}",
+            'classes': [{'name': f"C{i}_{j}", 'line': j * 20 + 1} for j in range(rng.randint(0, 3))],
+            'functions': [{'name': f"f{j}", 'line': j * 10 + 1} for j in range(rng.randint(2, 12))],
+            'imports': [f"pkg{rng.randrange(50)}.mod{rng.randrange(n_files)}" for _ in range(rng.randint(1, 8))],
+        })
+    edges = [(p['file'], parsed[rng.randrange(n_files)]['file']) for p in parsed for _ in range(3)]
+    calls = []
+    for p in parsed:
+        target = parsed[rng.randrange(n_files)]
+        if target['functions']:
+            calls.append((p['file'], target['file'], target['functions'][0]['name']))
+    return parsed, edges, calls
+
+
+def counts(db):
+    with db.driver.session() as session:
+        record = session.run("""
+            MATCH (:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+            OPTIONAL MATCH (f)-[r]->()
+            RETURN count(DISTINCT f) as files, count(r) as rels
+            """, repo_id=REPO_ID).single()
+    return record['files'], record['rels']
+
+
+def reset(db, keep_repo=True):
+    with db.driver.session() as session:
+        session.run("""
+            MATCH (r:Repository {repo_id: $repo_id})
+            OPTIONAL MATCH (r)-[:CONTAINS]->(f:File)
+            OPTIONAL MATCH (f)-[:CONTAINS]->(n)
+            DETACH DELETE f, n
+            """, repo_id=REPO_ID).consume()
+        if keep_repo:
+            session.run("MERGE (:Repository {repo_id: $repo_id})", repo_id=REPO_ID).consume()
+        else:
+            session.run("MATCH (r:Repository {repo_id: $repo_id}) DETACH DELETE r", repo_id=REPO_ID).consume()
+
+
+def run_unwind(db, parsed, edges, calls):
+    for p in parsed:
+        db.bulk_create_files([{'path': p['file'], 'language': p['language'],
+                               'content_hash': p['content_hash']}], REPO_ID)
+        db.bulk_create_classes([{'file': p['file'], **c} for c in p['classes']])
+        db.bulk_create_functions([{'file': p['file'], **f} for f in p['functions']])
+    db.bulk_create_dependencies(edges)
+    db.bulk_create_function_calls([{'file': f, 'target_file': t, 'callee': c} for f, t, c in calls])
+
+
+def run_bulk(db, parsed, edges, calls, import_dir, url_prefix, batch_size):
+    loader = CSVBulkLoader(db, import_dir, url_prefix, batch_size, subdir=REPO_ID)
+    try:
+        for p in parsed:
+            loader.add_parsed(dict(p, imports=[]))
+        loader.add_dependencies(edges)
+        loader.add_calls(calls, [])
+        loader.load(REPO_ID)
+    finally:
+        loader.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--import-dir', required=True)
+    parser.add_argument('--url-prefix', default='file:///')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    args = parser.parse_args()
+
+    parsed, edges, calls = synthetic_repo(args.files)
+    print(f"{len(parsed)} files, {sum(len(p['functions']) for p in parsed)} functions, "
+          f"{len(edges)} dependencies, {len(calls)} calls")
+
+    db = GraphDB(args.uri, args.user, args.password)
+    try:
+        for label, run in (
+            ('unwind', lambda: run_unwind(db, parsed, edges, calls)),
+            ('load csv', lambda: run_bulk(db, parsed, edges, calls, args.import_dir,
+                                          args.url_prefix, args.batch_size)),
+        ):
+            reset(db)
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            files, rels = counts(db)
+            print(f"  {label:<9} {elapsed:8.1f} s  ({files} files, {rels} relationships)")
+        reset(db, keep_repo=False)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
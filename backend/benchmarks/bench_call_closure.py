@@ -0,0 +1,104 @@
+"""Benchmark transitive call closure on synthetic call graphs.
+
+Usage (from backend/):
+    python benchmarks/bench_call_closure.py [--functions 20000] [--calls 4] [--hubs 50]
+
+Callees are drawn with a preferential bias towards a few hub functions
+(loggers, helpers), the shape that makes `MATCH (a)-[:CALLS*2..5]->(c)`
+blow up. CallReachability is timed for the default depth cap and unbounded,
+against a per-function breadth-first search; the number of paths the
+variable-length pattern would expand is estimated on a sample.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.graph.call_closure import CallReachability  # noqa: E402
+
+
+def synthetic_calls(n_functions, calls_per_function, n_hubs, cycle_ratio=0.02, seed=0):
+    rng = random.Random(seed)
+    hubs = list(range(n_hubs))
+    edges = set()
+    for caller in range(n_functions):
+        for _ in range(rng.randint(1, calls_per_function * 2 - 1)):
+            if rng.random() < 0.3:
+                callee = rng.choice(hubs)
+            elif rng.random() < cycle_ratio:
+                callee = rng.randrange(n_functions)  # may point backwards: cycles
+            else:
+                callee = rng.randint(caller, min(n_functions - 1, caller + 200))
+            if callee != caller:
+                edges.add((caller, callee))
+    return sorted(edges)
+
+
+def bfs_closure(edges, max_depth):
+    successors = {}
+    for a, b in edges:
+        successors.setdefault(a, []).append(b)
+    total = 0
+    for start in successors:
+        seen, frontier = set(), {start}
+        for depth in range(1, max_depth + 1):
+            frontier = {c for f in frontier for c in successors.get(f, ())}
+            if depth >= 2:
+                seen |= frontier
+            if not frontier:
+                break
+        total += len(seen)
+    return total
+
+
+def expanded_paths(edges, max_depth, sample, seed=1):
+    """Paths of 2..max_depth calls from a sample of functions (what CALLS*2..5 enumerates)"""
+    successors = {}
+    for a, b in edges:
+        successors.setdefault(a, []).append(b)
+    starts = random.Random(seed).sample(sorted(successors), min(sample, len(successors)))
+    total = 0
+    for start in starts:
+        counts = {start: 1}
+        for depth in range(1, max_depth + 1):
+            nxt = {}
+            for node, n in counts.items():
+                for c in successors.get(node, ()):
+                    nxt[c] = nxt.get(c, 0) + n
+            counts = nxt
+            if depth >= 2:
+                total += sum(counts.values())
+    return total * len(successors) / len(starts)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--functions', type=int, default=20000)
+    parser.add_argument('--calls', type=int, default=4)
+    parser.add_argument('--hubs', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--sample', type=int, default=200)
+    args = parser.parse_args()
+
+    edges = synthetic_calls(args.functions, args.calls, args.hubs)
+    print(f"{args.functions} functions, {len(edges)} calls, {args.hubs} hubs")
+    print(f"  CALLS*2..{args.depth} would expand ~{expanded_paths(edges, args.depth, args.sample):,.0f} paths")
+
+    for label, depth in ((f"bitset depth {args.depth}", args.depth), ("bitset unbounded", 0)):
+        index, elapsed = timed(lambda: CallReachability(edges, depth))
+        print(f"  {label:<18} {elapsed * 1000:8.0f} ms  {len(index):,} pairs")
+    total, elapsed = timed(lambda: bfs_closure(edges, args.depth))
+    print(f"  {'bfs depth ' + str(args.depth):<18} {elapsed * 1000:8.0f} ms  {total:,} pairs")
+
+
+if __name__ == '__main__':
+    main()
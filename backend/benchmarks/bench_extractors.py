@@ -0,0 +1,87 @@
+"""Benchmark the tree-walker and query extraction backends on the same trees.
+
+Usage (from backend/):
+    python benchmarks/bench_extractors.py [--repeat 20] [path ...]
+
+Without paths, benchmarks the backend's own sources plus a synthetic module.
+Both backends must produce identical output; any mismatch is reported.
+Timings are the best of --repeat runs per language, alternating between
+the backends so machine noise hits both alike. On small machines the two
+backends are within noise of each other (see the parser_backends setting).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.parser.static_parser import StaticParser  # noqa: E402
+
+LANGUAGES = {'.py': 'python', '.js': 'javascript'}
+
+
+def synthetic_python(classes: int = 200, methods: int = 20) -> bytes:
+    lines = ["import os", "from collections import OrderedDict", ""]
+    for c in range(classes):
+        lines.append(f"class Service{c}:")
+        for m in range(methods):
+            lines.append(f"    def method_{m}(self, value):")
+            lines.append(f"        result = self.method_{(m + 1) % methods}(value)")
+            lines.append("        os.path.join(str(result), helper(value))")
+            lines.append("        return result")
+        lines.append("")
+    return '\n'.join(lines).encode('utf8')
+
+
+def collect_inputs(paths):
+    inputs = []
+    for root in paths:
+        root = Path(root)
+        candidates = [root] if root.is_file() else sorted(p for p in root.rglob('*') if p.suffix in LANGUAGES)
+        for path in candidates:
+            if path.suffix in LANGUAGES:
+                inputs.append((str(path), path.read_bytes(), LANGUAGES[path.suffix]))
+    return inputs
+
+
+def time_backends(parsers, trees, repeat):
+    """Best time per backend, alternating backends between runs"""
+    best = {label: float('inf') for label in parsers}
+    for _ in range(repeat):
+        for label, parser in parsers.items():
+            start = time.perf_counter()
+            for root, code, language in trees:
+                parser.extract(root, code, language)
+            best[label] = min(best[label], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_args()
+    inputs = collect_inputs(args.paths or [str(Path(__file__).resolve().parents[1] / 'src')])
+    inputs.append(('<synthetic>', synthetic_python(), 'python'))
+
+    walker = StaticParser()
+    query = StaticParser(backends={'python': 'query', 'javascript': 'query'})
+    parsers = {'walker': walker, 'query': query}
+
+    trees = {}
+    for name, code, language in inputs:
+        root = walker.parsers[language].parse(code).root_node
+        trees.setdefault(language, []).append((root, code, language))
+        if walker.extract(root, code, language) != query.extract(root, code, language):
+            print(f"MISMATCH: {name}")
+
+    for language, language_trees in sorted(trees.items()):
+        total_bytes = sum(len(code) for _, code, _ in language_trees)
+        print(f"{language}: {len(language_trees)} files, {total_bytes / 1024:.0f} KiB, best of {args.repeat}")
+        for label, elapsed in time_backends(parsers, language_trees, args.repeat).items():
+            print(f"  {label:<7} {elapsed * 1000:8.1f} ms  ({total_bytes / 1024 / 1024 / elapsed:.1f} MiB/s)")
+
+
+if __name__ == '__main__':
+    main()
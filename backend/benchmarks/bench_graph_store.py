@@ -0,0 +1,93 @@
+"""Measure hot structural reads on the embedded graph store (and Neo4j, if given).
+
+Usage (from backend/):
+    python benchmarks/bench_graph_store.py [--files 2000] [--deps 4] [--reads 2000]
+        [--neo4j --uri bolt://localhost:7687 --user neo4j --password ...]
+
+A synthetic repository (files with a few functions each, DEPENDS_ON and
+CALLS edges) is written to each store through the GraphStore interface,
+then the same dependency, blast-radius and caller reads are timed per
+call. With --neo4j the graph goes under a throwaway /bench-graph-store/
+prefix on the server and is deleted afterwards.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.graph.embedded_graph_db import EmbeddedGraphDB  # noqa: E402
+
+ROOT = '/bench-graph-store/src'
+
+
+def populate(store, n_files, deps_per_file, seed=0):
+    rng = random.Random(seed)
+    files = [f"{ROOT}/pkg{i % 20}/module_{i}.py" for i in range(n_files)]
+    with store.batch_writer() as writer:
+        store.bulk_create_files([{'path': f, 'language': 'python', 'content_hash': str(i)}
+                                 for i, f in enumerate(files)], writer=writer)
+        store.bulk_create_functions([{'file': f, 'name': f"func_{i}_{k}", 'line': k * 10}
+                                     for i, f in enumerate(files) for k in range(3)], writer=writer)
+    edges = {(rng.choice(files), rng.choice(files)) for _ in range(n_files * deps_per_file)}
+    store.bulk_create_dependencies(sorted(edges))
+    calls = []
+    for i, f in enumerate(files):
+        for _ in range(deps_per_file):
+            j = rng.randrange(n_files)
+            calls.append({'file': f, 'caller': f"func_{i}_0", 'target_file': files[j], 'callee': f"func_{j}_1"})
+    store.bulk_create_function_to_function_calls(calls)
+    return files
+
+
+def time_reads(store, files, reads, seed=1):
+    rng = random.Random(seed)
+    sample = [rng.randrange(len(files)) for _ in range(reads)]
+    timings = {}
+    for label, read in (
+        ('get_dependencies', lambda i: store.get_dependencies(files[i])),
+        ('get_affected_files', lambda i: store.get_affected_files(files[i])),
+        ('get_function_callers', lambda i: store.get_function_callers(f"func_{i}_1")),
+    ):
+        read(sample[0])  # warm up caches
+        start = time.perf_counter()
+        for i in sample:
+            read(i)
+        timings[label] = (time.perf_counter() - start) / len(sample) * 1e6
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--deps', type=int, default=4)
+    parser.add_argument('--reads', type=int, default=2000)
+    parser.add_argument('--neo4j', action='store_true', help="also time a Neo4j server")
+    parser.add_argument('--uri', default='bolt://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='password')
+    args = parser.parse_args()
+
+    stores = [('embedded', EmbeddedGraphDB())]
+    if args.neo4j:
+        from src.graph.graph_db import GraphDB
+        stores.append(('neo4j', GraphDB(args.uri, args.user, args.password)))
+
+    print(f"{args.files} files, ~{args.files * args.deps} dependencies; microseconds per read")
+    for name, store in stores:
+        start = time.perf_counter()
+        files = populate(store, args.files, args.deps)
+        print(f"  {name}: loaded in {time.perf_counter() - start:.2f}s")
+        try:
+            for label, micros in time_reads(store, files, args.reads).items():
+                print(f"    {label:<22} {micros:10.1f} us")
+        finally:
+            if name == 'neo4j':
+                store.bulk_delete_files(files)
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark import resolution on a synthetic repository tree.
+
+Usage (from backend/):
+    python benchmarks/bench_import_resolver.py [--files 50000] [--imports 200000]
+
+Compares ImportResolver against the previous DependencyMapper strategy (a
+module map plus an `endswith` scan over every entry on a miss). The legacy
+scan is O(imports x files), so it is timed on a sample and extrapolated.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.graph.import_resolver import ImportResolver  # noqa: E402
+
+WORDS = ['api', 'core', 'utils', 'models', 'services', 'views', 'handlers', 'db', 'auth',
+         'config', 'common', 'helpers', 'client', 'server', 'tasks', 'events', 'cache', 'io']
+EXTERNAL = ['os', 'sys', 'json', 'typing', 'react', 'lodash', 'numpy', 'requests', 'express']
+
+
+def synthetic_tree(n_files, seed=0):
+    rng = random.Random(seed)
+    files = set()
+    while len(files) < n_files:
+        depth = rng.randint(1, 6)
+        dirs = [rng.choice(WORDS) + str(rng.randint(0, 30)) for _ in range(depth)]
+        ext = rng.choice(['.py', '.py', '.js'])
+        name = rng.choice(WORDS) + str(rng.randint(0, 200))
+        files.add('/repo/' + '/'.join(dirs) + '/' + name + ext)
+    return sorted(files)
+
+
+def synthetic_imports(files, n_imports, seed=1):
+    rng = random.Random(seed)
+    imports = []
+    for _ in range(n_imports):
+        importer = rng.choice(files)
+        kind = rng.random()
+        if kind < 0.2:
+            imports.append((importer, rng.choice(EXTERNAL)))
+            continue
+        target = rng.choice(files)
+        parts = target[len('/repo/'):].rsplit('.', 1)[0].split('/')
+        if target.endswith('.py'):
+            imports.append((importer, '.'.join(parts[-rng.randint(1, len(parts)):])))
+        else:
+            imports.append((importer, '/'.join(parts[-rng.randint(1, len(parts)):])))
+    return imports
+
+
+def legacy_resolver(files):
+    """The module map previously built by DependencyMapper.build_graph"""
+    file_map = {}
+    for file_path in files:
+        path_obj = Path(file_path)
+        filename = path_obj.stem
+        file_map[filename] = file_path
+        file_map[f'./{filename}'] = file_path
+        file_map[f'../{filename}'] = file_path
+        parts = path_obj.parts
+        if len(parts) >= 2:
+            for i in range(max(0, len(parts) - 3), len(parts)):
+                rel_path = '/'.join(parts[i:]).replace('.py', '').replace('.js', '').replace('.java', '')
+                file_map[rel_path] = file_path
+
+    def resolve(imp):
+        if imp in file_map:
+            return file_map[imp]
+        for module_key, module_file in file_map.items():
+            if imp.endswith(module_key) or module_key.endswith(imp):
+                return module_file
+        return None
+    return resolve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--imports', type=int, default=200000)
+    parser.add_argument('--legacy-sample', type=int, default=300)
+    args = parser.parse_args()
+
+    files = synthetic_tree(args.files)
+    imports = synthetic_imports(files, args.imports)
+    print(f"{len(files)} files, {len(imports)} imports")
+
+    start = time.perf_counter()
+    resolver = ImportResolver(files)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    resolved = sum(1 for importer, imp in imports if resolver.resolve(imp, importer))
+    elapsed = time.perf_counter() - start
+    print(f"  trie    build {build * 1000:7.0f} ms  resolve {elapsed * 1000:9.0f} ms "
+          f"({elapsed / len(imports) * 1e6:.2f} us/import, {resolved} resolved)")
+
+    repeat = ImportResolver(reversed(files))
+    if any(repeat.resolve(imp, importer) != resolver.resolve(imp, importer) for importer, imp in imports[:5000]):
+        print("  NON-DETERMINISTIC: results depend on file order")
+
+    start = time.perf_counter()
+    legacy = legacy_resolver(files)
+    build = time.perf_counter() - start
+    sample = imports[:args.legacy_sample]
+    start = time.perf_counter()
+    for _, imp in sample:
+        legacy(imp)
+    per_import = (time.perf_counter() - start) / len(sample)
+    print(f"  legacy  build {build * 1000:7.0f} ms  resolve {per_import * len(imports) * 1000:9.0f} ms "
+          f"({per_import * 1e6:.2f} us/import, extrapolated from {len(sample)})")
+
+
+if __name__ == '__main__':
+    main()
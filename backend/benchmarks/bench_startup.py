@@ -0,0 +1,79 @@
+"""Measure API worker startup: importing main and constructing the engine.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs N] [--importtime]
+
+Each run is a fresh interpreter, so module caches do not carry over. With
+--importtime, the slowest imports of one run (python -X importtime) are listed
+too. Subsystems such as Neo4j and Chroma are built on first use, so neither
+measurement should open a connection.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+ENGINE_SNIPPET = """
+import time
+from src.analysis_engine import AnalysisEngine
+start = time.perf_counter()
+AnalysisEngine()
+print(time.perf_counter() - start)
+"""
+
+
+def run_snippet(snippet, runs):
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', snippet], cwd=BACKEND_DIR,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def slowest_imports(limit=15):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|', 2)]
+        rows.append((int(cumulative_us), int(self_us), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    for label, snippet in (('import main', IMPORT_SNIPPET), ('AnalysisEngine()', ENGINE_SNIPPET)):
+        try:
+            timings = run_snippet(snippet, args.runs)
+        except RuntimeError as e:
+            print(f"{label:<18} failed: {e}")
+            continue
+        print(f"{label:<18} best {min(timings) * 1000:7.1f} ms  median {statistics.median(timings) * 1000:7.1f} ms")
+
+    if args.importtime:
+        print("\nSlowest imports (cumulative):")
+        for cumulative_us, self_us, name in slowest_imports():
+            print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+
+if __name__ == '__main__':
+    main()
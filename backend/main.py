@@ -4,6 +4,7 @@ from pydantic import BaseModel
 from typing import Dict, List
 import uuid
 from src.analysis_engine import AnalysisEngine
+from src.config import settings
 
 app = FastAPI(title="ARCHITECH API")
 
@@ -17,6 +18,25 @@ app.add_middleware(
 engine = AnalysisEngine()
 jobs = {}
 
+@app.on_event("shutdown")
+async def close_async_graph_db():
+    # Only close the async driver if a request created it
+    if 'async_graph_db' in engine.__dict__:
+        await engine.async_graph_db.close()
+
+async def read_graph(method: str, *args, **kwargs):
+    """Code-graph read for a route: through the async Neo4j driver, or straight
+    from the embedded store, whose reads are in-process lookups"""
+    if settings.graph_backend == "neo4j":
+        return await getattr(engine.async_graph_db, method)(*args, **kwargs)
+    return getattr(engine.graph_db, method)(*args, **kwargs)
+
+async def resolve_graph_path(file_path: str, repo_id: str = None) -> str:
+    """Stored path for a user-supplied path, without blocking the event loop"""
+    if settings.graph_backend == "neo4j":
+        return await engine.async_graph_db.resolve_file_path(engine.graph_db, file_path, repo_id)
+    return engine.graph_db.resolve_file_path(file_path, repo_id)
+
 class AnalysisRequest(BaseModel):
     repo_url: str
 
@@ -115,9 +135,10 @@ async def analyze_impact(request: ImpactRequest):
     return result
 
 @app.get("/dependencies/{file_path:path}")
-async def get_dependencies(file_path: str):
-    resolved = engine._resolve_path(file_path)
-    deps = engine.graph_db.get_dependencies(resolved)
+async def get_dependencies(file_path: str, repo_id: str = None):
+    repo_id = repo_id or engine.current_repo_id
+    resolved = await resolve_graph_path(file_path, repo_id)
+    deps = await read_graph('get_dependencies', resolved)
     return {"file": file_path, "dependencies": deps}
 
 @app.get("/blast-radius/{file_path:path}")
@@ -131,23 +152,16 @@ async def get_blast_radius(file_path: str, change_type: str = "modify", repo_id:
         if repos:
             engine.load_repository_analysis(repos[0]['repo_id'])
     
-    # Find actual file path in database using flexible matching
-    fp_fwd = file_path.replace('\\', '/')
-    fp_bs = file_path.replace('/', '\\')
-    with engine.graph_db.driver.session() as session:
-        result = session.run("""
-            MATCH (f:File)
-            WHERE f.path ENDS WITH $fp_bs OR f.file_path ENDS WITH $fp_bs
-               OR f.path ENDS WITH $fp_fwd OR f.file_path ENDS WITH $fp_fwd
-               OR f.path_normalized ENDS WITH $fp_fwd
-            RETURN COALESCE(f.file_path, f.path) as actual_path
-            LIMIT 1
-        """, fp_bs=fp_bs, fp_fwd=fp_fwd).single()
-        
-        if result:
-            actual_path = result['actual_path']
-        else:
-            actual_path = file_path
+    # Resolve against the repo's in-memory path index
+    lookup = engine.graph_db.lookup_file_path(file_path, repo_id or engine.current_repo_id)
+    if lookup['ambiguous']:
+        return {
+            "error": "Ambiguous file path",
+            "file": file_path,
+            "matched": lookup['matched'],
+            "candidates": lookup['candidates']
+        }
+    actual_path = lookup['path'] or file_path
     
     result = engine.analyze_change_impact(actual_path, change_type)
     return result
@@ -161,28 +175,17 @@ async def get_function_info(function_name: str):
 @app.get("/repository/{repo_id}/snapshots")
 async def list_snapshots(repo_id: str):
     """List all analysis snapshots for a repository"""
-    with engine.graph_db.driver.session() as session:
-        result = session.run("""
-            MATCH (r:Repository {repo_id: $repo_id})-[:HAS_SNAPSHOT]->(s:Snapshot)
-            OPTIONAL MATCH (s)-[:ANALYZED_FILE]->(f:File)
-            WITH s, COUNT(DISTINCT f) as file_count
-            RETURN s.snapshot_id as snapshot_id,
-                   toString(s.created_at) as created_at,
-                   s.commit_hash as commit_hash,
-                   s.total_files as total_files,
-                   s.total_deps as total_deps,
-                   s.avg_coupling as avg_coupling,
-                   s.cycle_count as cycle_count,
-                   file_count
-            ORDER BY s.created_at DESC
-            """, repo_id=repo_id)
-        snapshots = [dict(r) for r in result]
+    snapshots = await engine.async_graph_db.get_snapshots(repo_id)
+    if settings.graph_backend != "neo4j":
+        # File links live in the code graph store, not next to the Snapshot nodes
+        for snapshot in snapshots:
+            snapshot['file_count'] = engine.graph_db.count_snapshot_files(snapshot['snapshot_id'])
     return {"repo_id": repo_id, "total": len(snapshots), "snapshots": snapshots}
 
 @app.delete("/repository/{repo_id}/snapshot/{snapshot_id}")
 async def delete_snapshot(repo_id: str, snapshot_id: str):
     """Delete a specific snapshot"""
-    with engine.graph_db.driver.session() as session:
+    with engine.neo4j.driver.session() as session:
         result = session.run("""
             MATCH (r:Repository {repo_id: $repo_id})-[:HAS_SNAPSHOT]->(s:Snapshot {snapshot_id: $snapshot_id})
             DETACH DELETE s
@@ -190,6 +193,8 @@ async def delete_snapshot(repo_id: str, snapshot_id: str):
             """, repo_id=repo_id, snapshot_id=snapshot_id)
         record = result.single()
         deleted_count = record['deleted'] if record else 0
+    if deleted_count:
+        engine.graph_db.unlink_snapshot_files(snapshot_id)
     return {"status": "success", "deleted": deleted_count}
 
 @app.get("/repository/{repo_id}/compare-snapshots/{snapshot1}/{snapshot2}")
@@ -209,27 +214,12 @@ async def list_repositories():
 @app.get("/repository/{repo_id}/commits")
 async def get_commits(repo_id: str) -> List[Dict]:
     """Get all commits for a repository"""
-    with engine.graph_db.driver.session() as session:
-        result = session.run("""
-            MATCH (r:Repository {repo_id: $repo_id})-[:HAS_COMMIT]->(c:Commit)
-            OPTIONAL MATCH (c)-[:AUTHORED_BY]->(u:User)
-            RETURN c.commit_hash as hash, c.message as message, 
-                   toString(c.timestamp) as timestamp, u.email as author
-            ORDER BY c.timestamp DESC
-            """, repo_id=repo_id)
-        return [dict(r) for r in result]
+    return await engine.async_graph_db.get_commits(repo_id)
 
 @app.get("/repository/{repo_id}/commit/{commit_hash}/files")
 async def get_commit_files(repo_id: str, commit_hash: str) -> List[Dict]:
     """Get all files at a specific commit"""
-    with engine.graph_db.driver.session() as session:
-        result = session.run("""
-            MATCH (c:Commit {repo_id: $repo_id, commit_hash: $commit_hash})
-            MATCH (f:File)-[:VERSION_AT]->(c)
-            OPTIONAL MATCH (f)-[:HAS_VERSION]->(v:Version)-[:VERSION_AT]->(c)
-            RETURN f.file_path as path, v.hash as content_hash
-            """, repo_id=repo_id, commit_hash=commit_hash)
-        return [dict(r) for r in result]
+    return await engine.async_graph_db.get_commit_files(repo_id, commit_hash)
 
 @app.get("/repository/{repo_id}/compare-architecture/{commit1}/{commit2}")
 async def compare_architecture(repo_id: str, commit1: str, commit2: str):
@@ -240,35 +230,24 @@ async def compare_architecture(repo_id: str, commit1: str, commit2: str):
 @app.get("/repository/{repo_id}/compare/{commit1}/{commit2}")
 async def compare_commits(repo_id: str, commit1: str, commit2: str) -> Dict:
     """Compare two commits"""
-    with engine.graph_db.driver.session() as session:
-        result = session.run("""
-            MATCH (c1:Commit {repo_id: $repo_id, commit_hash: $commit1})
-            MATCH (c2:Commit {repo_id: $repo_id, commit_hash: $commit2})
-            OPTIONAL MATCH (f1:File)-[:VERSION_AT]->(c1)
-            OPTIONAL MATCH (f1)-[:HAS_VERSION]->(v1:Version)-[:VERSION_AT]->(c1)
-            OPTIONAL MATCH (f2:File {file_path: f1.file_path})-[:VERSION_AT]->(c2)
-            OPTIONAL MATCH (f2)-[:HAS_VERSION]->(v2:Version)-[:VERSION_AT]->(c2)
-            RETURN f1.file_path as path, v1.hash as hash1, v2.hash as hash2
-            """, repo_id=repo_id, commit1=commit1, commit2=commit2)
-        
-        files = [dict(r) for r in result]
-        added = [f['path'] for f in files if not f['hash1'] and f['hash2']]
-        removed = [f['path'] for f in files if f['hash1'] and not f['hash2']]
-        modified = [f['path'] for f in files if f['hash1'] and f['hash2'] and f['hash1'] != f['hash2']]
-        
-        return {
-            "commit1": commit1[:8],
-            "commit2": commit2[:8],
-            "added": added,
-            "removed": removed,
-            "modified": modified,
-            "summary": {
-                "total_changes": len(added) + len(removed) + len(modified),
-                "files_added": len(added),
-                "files_removed": len(removed),
-                "files_modified": len(modified)
-            }
+    files = await engine.async_graph_db.get_commit_file_hashes(repo_id, commit1, commit2)
+    added = [f['path'] for f in files if not f['hash1'] and f['hash2']]
+    removed = [f['path'] for f in files if f['hash1'] and not f['hash2']]
+    modified = [f['path'] for f in files if f['hash1'] and f['hash2'] and f['hash1'] != f['hash2']]
+    
+    return {
+        "commit1": commit1[:8],
+        "commit2": commit2[:8],
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+        "summary": {
+            "total_changes": len(added) + len(removed) + len(modified),
+            "files_added": len(added),
+            "files_removed": len(removed),
+            "files_modified": len(modified)
         }
+    }
 
 @app.get("/repository/{repo_id}/versions")
 async def get_repository_versions(repo_id: str):
@@ -308,7 +287,7 @@ async def import_git_history(repo_id: str, max_commits: int = 100):
 @app.delete("/repository/{repo_id}")
 async def delete_repository(repo_id: str):
     """Delete repository and all its data including cache"""
-    with engine.graph_db.driver.session() as session:
+    with engine.neo4j.driver.session() as session:
         session.run("""
             MATCH (r:Repository {repo_id: $repo_id})
             OPTIONAL MATCH (r)-[:HAS_SNAPSHOT]->(s:Snapshot)
@@ -319,7 +298,9 @@ async def delete_repository(repo_id: str):
             DETACH DELETE r, s, f, c, v, cm
             """, repo_id=repo_id)
     
-    # Clear from memory cache
+    # Code graph (its own store unless graph_backend is neo4j) and memory cache
+    engine.graph_db.clear_repo(repo_id)
+    engine.vector_store.drop_repo(repo_id)
     if engine.current_repo_id == repo_id:
         engine.current_repo_id = None
         engine.current_snapshot_id = None
@@ -336,13 +317,13 @@ async def list_files(repo_id: str = None):
     # Use current repo if not specified
     if not repo_id and engine.current_repo_id:
         repo_id = engine.current_repo_id
-    files = engine.graph_db.get_all_files(repo_id=repo_id)
+    files = await read_graph('get_all_files', repo_id=repo_id)
     return {"total": len(files), "files": files}
 
 @app.get("/debug/files")
 async def debug_files():
     """Show all files stored in graph for debugging"""
-    files = engine.graph_db.get_all_files()
+    files = await read_graph('get_all_files')
     return {"total": len(files), "files": files[:20], "repo_path": str(engine.repo_path) if engine.repo_path else None}
 
 @app.post("/repository/{repo_id}/load")
@@ -414,7 +395,7 @@ async def list_functions(repo_id: str = None):
     # Use current repo if not specified
     if not repo_id and engine.current_repo_id:
         repo_id = engine.current_repo_id
-    functions = engine.graph_db.get_all_functions(repo_id)
+    functions = await read_graph('get_all_functions', repo_id)
     return {"total": len(functions), "functions": functions}
 
 @app.get("/graph/functions")
@@ -181,29 +181,18 @@ class ConfidenceAnalyzer:
     def _analyze_cycle_confidence(self) -> Dict:
         """Analyze confidence for circular dependency detection"""
         
-        # Query Neo4j for circular dependencies
-        with self.graph_db.driver.session() as session:
-            result = session.run("""
-                MATCH (f1:File)-[:DEPENDS_ON*1..5]->(f2:File)
-                WHERE f1 = f2
-                RETURN DISTINCT f1.path as cycle_file
-                LIMIT 1
-            """)
-            
-            cycle = result.single()
-            
-            if not cycle:
-                return None
-            
-            cycle_file = cycle['cycle_file']
-            
-            return {
-                "claim": f"Circular dependency detected in {Path(cycle_file).name}",
-                "confidence": 1.0,
-                "reasoning": "Static import analysis detected direct cycle in dependency graph via Neo4j traversal",
-                "failure_scenario": "Cannot detect runtime circular dependencies or dynamic imports (e.g., importlib, __import__). May miss circular dependencies across more than 5 hops.",
-                "evidence": [cycle_file]
-            }
+        # Ask the graph store for a file on a short DEPENDS_ON cycle
+        cycle_file = self.graph_db.find_dependency_cycle(5)
+        if not cycle_file:
+            return None
+        
+        return {
+            "claim": f"Circular dependency detected in {Path(cycle_file).name}",
+            "confidence": 1.0,
+            "reasoning": "Static import analysis detected direct cycle in dependency graph via graph traversal",
+            "failure_scenario": "Cannot detect runtime circular dependencies or dynamic imports (e.g., importlib, __import__). May miss circular dependencies across more than 5 hops.",
+            "evidence": [cycle_file]
+        }
     
     def _generate_summary(self, claims: List[Dict]) -> str:
         """Generate human-readable summary of confidence report"""
@@ -1,20 +1,15 @@
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 import hashlib
 import subprocess
-from threading import Lock
+from threading import Lock, RLock
 from collections import OrderedDict
 from .parser.repo_loader import RepositoryLoader
-from .parser.static_parser import StaticParser
-from .graph.graph_db import GraphDB
-from .graph.dependency_mapper import DependencyMapper
-from .graph.analyzers import PatternDetector, CouplingAnalyzer
-from .graph.version_tracker import VersionTracker
+from .parser.parallel_parser import ParallelParser
+from .parser.file_classifier import FileClassifier
 from .graph.blast_radius import BlastRadiusAnalyzer
-from .retrieval.vector_store import VectorStore
-from .retrieval.retrieval_engine import RetrievalEngine
-from .reasoning.llm_reasoner import LLMReasoner
+from .pipeline import Pipeline, Stage
 from .config import settings
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,20 +17,33 @@ logger = logging.getLogger(__name__)
 
 MAX_CACHE_SIZE = 100
 
+
+class subsystem:
+    """Engine attribute built on first access instead of in __init__.
+
+    Keeps engine construction (and importing main) free of network
+    connections and heavy imports. Creation is serialized by the engine's
+    init lock; afterwards the value lives in the instance dict, so reads cost
+    a plain attribute lookup and assignment replaces it as before.
+    """
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+    
+    def __get__(self, engine, owner=None):
+        if engine is None:
+            return self
+        with engine._init_lock:
+            if self.name not in engine.__dict__:
+                engine.__dict__[self.name] = self.factory(engine)
+        return engine.__dict__[self.name]
+
+
 class AnalysisEngine:
     def __init__(self):
-        self.repo_loader = RepositoryLoader()
-        self.parser = StaticParser()
-        self.graph_db = GraphDB(
-            settings.neo4j_uri,
-            settings.neo4j_user,
-            settings.neo4j_password
-        )
-        self.dependency_mapper = DependencyMapper()
-        self.vector_store = VectorStore(settings.chroma_path)
-        self.retrieval_engine = RetrievalEngine(self.vector_store, self.graph_db)
-        self.llm = LLMReasoner()
-        self.version_tracker = VersionTracker(self.graph_db)
+        self._init_lock = RLock()  # guards lazy subsystem creation
         self.pattern_detector = None
         self.coupling_analyzer = None
         self.blast_radius_analyzer = None
@@ -45,17 +53,116 @@ class AnalysisEngine:
         self.analysis_cache = {}  # Cache for loaded analyses
         self.memory_cache = OrderedDict()  # LRU cache for LLM results
         self.cache_lock = Lock()  # Thread-safe cache access
+        self.bulk_loader = None  # set while an offline bulk load collects rows
+        self.call_reachability = None  # CallReachability (or GraphCallReachability) of the current repo
+        self.graph_writer = None  # BatchWriter shared by the graph-write stage
+        self.stored_file_hashes = {}  # stored path -> (content_hash, extractor_version) before this analysis
+        self.graph_diff = None  # stored paths by 'added' / 'modified' / 'unchanged'
+        self.stored_chunk_hashes = {}  # vector chunk id -> (content_hash, extractor_version) before this analysis
+        self.embedded_chunks = []  # chunk ids seen by this analysis
+    
+    @subsystem
+    def repo_loader(self):
+        return RepositoryLoader(mirror_max_bytes=settings.mirror_cache_max_bytes)
+    
+    @subsystem
+    def file_classifier(self):
+        return FileClassifier(settings.max_file_size)
+    
+    @subsystem
+    def parallel_parser(self):
+        return ParallelParser(
+            settings.parse_workers, settings.parse_chunksize, settings.parser_backends,
+            settings.parse_cache_dir or None, settings.parse_cache_max_bytes,
+            incremental=settings.parse_incremental
+        )
+    
+    @subsystem
+    def neo4j(self):
+        """Neo4j server: repositories, commits, versions and snapshots, and the
+        code graph too unless graph_backend selects another store"""
+        from .graph.graph_db import GraphDB
+        return GraphDB(
+            settings.neo4j_uri,
+            settings.neo4j_user,
+            settings.neo4j_password,
+            write_batch_size=settings.graph_write_batch_size,
+            write_max_retries=settings.graph_write_max_retries,
+            write_retry_backoff=settings.graph_write_retry_backoff,
+            index_wait_timeout=settings.neo4j_index_wait_timeout
+        )
+    
+    @subsystem
+    def graph_db(self):
+        """GraphStore holding the code graph (files, functions, their edges)"""
+        if settings.graph_backend == "neo4j":
+            return self.neo4j
+        if settings.graph_backend == "embedded":
+            from .graph.embedded_graph_db import EmbeddedGraphDB
+            return EmbeddedGraphDB(settings.embedded_graph_path, settings.graph_write_batch_size)
+        raise ValueError(f"Unknown graph_backend: {settings.graph_backend!r}")
+    
+    @subsystem
+    def async_graph_db(self):
+        from .graph.async_graph_db import AsyncGraphDB
+        return AsyncGraphDB(
+            settings.neo4j_uri,
+            settings.neo4j_user,
+            settings.neo4j_password,
+            settings.neo4j_async_pool_size,
+            settings.neo4j_acquisition_timeout
+        )
+    
+    @subsystem
+    def dependency_mapper(self):
+        from .graph.dependency_mapper import DependencyMapper
+        return DependencyMapper()
+    
+    @subsystem
+    def vector_store(self):
+        from .retrieval.vector_store import VectorStore
+        return VectorStore(settings.chroma_path)
+    
+    @subsystem
+    def retrieval_engine(self):
+        from .retrieval.retrieval_engine import RetrievalEngine
+        return RetrievalEngine(self.vector_store, self.graph_db)
+    
+    @subsystem
+    def llm(self):
+        from .reasoning.llm_reasoner import LLMReasoner
+        return LLMReasoner()
+    
+    @subsystem
+    def version_tracker(self):
+        from .graph.version_tracker import VersionTracker
+        return VersionTracker(self.neo4j)
     
     def analyze_repository(self, repo_url: str) -> Dict:
         logger.info(f"\n{'='*60}")
         logger.info("🚀 Starting repository analysis")
         logger.info(f"{'='*60}")
         
+        repo_id = hashlib.sha256(repo_url.encode()).hexdigest()[:16]
+        
+        # Fast path: remote HEAD already has a complete snapshot, so serve it
+        # without cloning, fetching or touching the workspace. The workspace
+        # is only used if it still holds that commit; otherwise repo_path
+        # stays unset and paths resolve through the graph store.
+        remote_head = self.repo_loader.resolve_remote_head(repo_url)
+        if remote_head:
+            with self.cache_lock:
+                cached = self._get_cached_snapshot(repo_id, remote_head)
+            if self._is_servable_snapshot(cached):
+                logger.info(f"⚡ Remote HEAD {remote_head[:8]} unchanged - skipping clone")
+                return self._serve_cached_analysis(
+                    repo_id, self.repo_loader.checked_out_path(repo_url, remote_head), remote_head, cached
+                )
+        
         repo_path = self.repo_loader.clone_repository(repo_url)
         self.repo_path = repo_path
         
         # Check if repo has changes
-        repo_id = hashlib.sha256(repo_url.encode()).hexdigest()[:16]
         commit_info = self.version_tracker.get_current_commit(str(repo_path))
         
         # Check for uncommitted changes
@@ -67,79 +174,82 @@ class AnalysisEngine:
         if commit_info:
             with self.cache_lock:
                 cached = self._get_cached_snapshot(repo_id, commit_info['commit_hash'])
-            if cached and cached.get('total_files', 0) > 0 and cached.get('patterns') and cached.get('arch_macro'):
+            if self._is_servable_snapshot(cached):
                 logger.info("✅ No changes detected - using cached analysis")
-                logger.info(f"📦 Repository ID: {repo_id}")
-                logger.info(f"📸 Cached Snapshot ID: {cached['snapshot_id']}")
-                logger.info(f"💾 Commit: {commit_info['commit_hash'][:8]}")
-                
-                self.current_repo_id = repo_id
-                self.current_snapshot_id = cached['snapshot_id']
-                self.repo_path = repo_path
-                
-                # Rebuild analyzers from cached data
-                self._rebuild_from_cache(repo_id)
-                
-                # Warm memory cache with architecture data (version-scoped key)
-                cache_key = f"arch_{repo_id}_{commit_info['commit_hash']}"
-                with self.cache_lock:
-                    self.memory_cache[cache_key] = cached.get('architecture', {})
-                    self._enforce_cache_limit()
-                
-                # Link files to snapshot if not already linked
-                with self.graph_db.driver.session() as session:
-                    session.run("""
-                        MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
-                        MATCH (s:Snapshot {snapshot_id: $snapshot_id})
-                        MERGE (s)-[:ANALYZED_FILE]->(f)
-                        """,
-                        repo_id=repo_id,
-                        snapshot_id=cached['snapshot_id']
-                    )
-                
-                return {
-                    'repo_path': str(repo_path),
-                    'repo_id': repo_id,
-                    'total_files': cached['total_files'],
-                    'patterns': cached['patterns'],
-                    'coupling': cached['coupling'],
-                    'architecture': {
-                        'overview': cached.get('architecture', {}).get('overview', ''),
-                        'modules': cached.get('architecture', {}).get('modules', ''),
-                        'key_files': cached.get('architecture', {}).get('key_files', ''),
-                        'stats': self._compute_arch_stats(),
-                        'evidence': cached.get('architecture', {}).get('evidence', []),
-                        'macro': cached.get('architecture', {}).get('macro', ''),
-                        'meso': cached.get('architecture', {}).get('meso', ''),
-                        'micro': cached.get('architecture', {}).get('micro', ''),
-                    },
-                    'status': 'completed',
-                    'cached': True
-                }
+                return self._serve_cached_analysis(repo_id, repo_path, commit_info['commit_hash'], cached)
             elif cached:
                 logger.info("⚠️ Incomplete cached snapshot - re-analyzing with LLM")
         
         # Full analysis with LLM
         return self._full_analysis(repo_url, repo_path, repo_id)
+    
+    def _is_servable_snapshot(self, cached: Dict) -> bool:
+        return bool(cached and cached.get('total_files', 0) > 0 and cached.get('patterns') and cached.get('arch_macro'))
+    
+    def _serve_cached_analysis(self, repo_id: str, repo_path: Optional[Path], commit_hash: str, cached: Dict) -> Dict:
+        """Return a complete cached snapshot as the analysis result (repo_path None if not checked out)"""
+        logger.info(f"📦 Repository ID: {repo_id}")
+        logger.info(f"📸 Cached Snapshot ID: {cached['snapshot_id']}")
+        logger.info(f"💾 Commit: {commit_hash[:8]}")
+        
+        # Analyzers already hold this snapshot (repeat request): nothing to rebuild
+        already_loaded = (
+            self.current_repo_id == repo_id and
+            self.current_snapshot_id == cached['snapshot_id'] and
+            self.pattern_detector is not None
+        )
+        self.current_repo_id = repo_id
+        self.current_snapshot_id = cached['snapshot_id']
+        self.repo_path = repo_path
+        
+        if not already_loaded:
+            # Rebuild analyzers from cached data
+            self._rebuild_from_cache(repo_id)
+            
+            # Link files to snapshot if not already linked
+            self.graph_db.link_snapshot_files(repo_id, cached['snapshot_id'])
+        
+        # Warm memory cache with architecture data (version-scoped key)
+        cache_key = f"arch_{repo_id}_{commit_hash}"
+        with self.cache_lock:
+            self.memory_cache[cache_key] = cached.get('architecture', {})
+            self._enforce_cache_limit()
+        
+        return {
+            'repo_path': str(repo_path) if repo_path else None,
+            'repo_id': repo_id,
+            'total_files': cached['total_files'],
+            'patterns': cached['patterns'],
+            'coupling': cached['coupling'],
+            'architecture': {
+                'overview': cached.get('architecture', {}).get('overview', ''),
+                'modules': cached.get('architecture', {}).get('modules', ''),
+                'key_files': cached.get('architecture', {}).get('key_files', ''),
+                'stats': self._compute_arch_stats(),
+                'evidence': cached.get('architecture', {}).get('evidence', []),
+                'macro': cached.get('architecture', {}).get('macro', ''),
+                'meso': cached.get('architecture', {}).get('meso', ''),
+                'micro': cached.get('architecture', {}).get('micro', ''),
+            },
+            'status': 'completed',
+            'cached': True
+        }
+    
     def _is_snapshot_complete(self, snapshot_id: str) -> bool:
         """Check if a snapshot has all required data (patterns, coupling, files)."""
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             result = session.run("""
                 MATCH (s:Snapshot {snapshot_id: $sid})
                 WHERE s.patterns IS NOT NULL AND s.coupling IS NOT NULL AND s.total_files > 0
-                OPTIONAL MATCH (s)-[af:ANALYZED_FILE]->()
-                WITH s, COUNT(af) as file_links
-                RETURN s.snapshot_id as sid, file_links, s.snapshot_files as sf
+                RETURN s.snapshot_id as sid, s.snapshot_files as sf
                 """, sid=snapshot_id)
             record = result.single()
-            if not record:
-                return False
-            # Complete if has live file links OR preserved snapshot_files
-            if record['file_links'] > 0:
-                return True
-            if record['sf'] is not None:
-                return True
+        if not record:
             return False
+        # Complete if has preserved snapshot_files OR live file links
+        if record['sf'] is not None:
+            return True
+        return self.graph_db.count_snapshot_files(snapshot_id) > 0
     
     def _full_analysis(self, repo_url: str, repo_path: Path, repo_id: str) -> Dict:
         """Perform full analysis with LLM and caching"""
@@ -209,9 +319,21 @@ class AnalysisEngine:
         logger.info("📋 Preserving snapshot file metadata...")
         self._preserve_snapshot_file_data(self.current_repo_id)
         
-        # Only clear graph/vector for THIS repo, not version history
-        logger.info("🧹 Clearing analysis data (preserving versions)...")
-        self._clear_repo_analysis(self.current_repo_id)
+        if settings.graph_incremental_update:
+            # Files are diffed against their stored content hashes as they are ingested
+            self.stored_file_hashes = self.graph_db.get_file_hashes(self.current_repo_id)
+            logger.info(f"🧮 Updating graph incrementally ({len(self.stored_file_hashes)} files stored)")
+            self.graph_db.drop_path_index(self.current_repo_id)
+            self.stored_chunk_hashes = self.vector_store.get_chunk_hashes(self.current_repo_id)
+        else:
+            # Only clear graph/vector for THIS repo, not version history
+            logger.info("🧹 Clearing analysis data (preserving versions)...")
+            self._clear_repo_analysis(self.current_repo_id)
+            self.stored_file_hashes = {}
+            self.stored_chunk_hashes = {}
+        self.embedded_chunks = []
+        self.graph_diff = {'added': [], 'modified': [], 'unchanged': []}
+        from .graph.dependency_mapper import DependencyMapper
         self.dependency_mapper = DependencyMapper()
         self.pattern_detector = None
         self.coupling_analyzer = None
@@ -220,62 +342,77 @@ class AnalysisEngine:
             repo_path,
             ['.py', '.js', '.java']
         )
+        files, skipped_files = self.file_classifier.partition(files)
+        # Bulk load is for first loads; later analyses only write what changed
+        self.bulk_loader = None if self.stored_file_hashes else self._make_bulk_loader(len(files))
         
-        logger.info(f"\n📝 Parsing {len(files)} files...")
-        parsed_files = []
-        for i, file_info in enumerate(files, 1):
-            if i % 5 == 1 or i == len(files):
-                logger.info(f"  [{i}/{len(files)}] Parsing: {file_info['relative_path']}")
-            parsed = self.parser.parse_file(
-                file_info['path'],
-                file_info['language']
-            )
-            parsed_files.append(parsed)
+        try:
+            logger.info(f"\n📝 Parsing {len(files)} files...")
+            parsed_files = []
+            parse_errors = []
             
-            # Track version with SHA-256 (only creates new version if commit changed)
-            version_result = self.version_tracker.track_file_version(
-                self.current_repo_id,
-                file_info['path'],
-                str(repo_path)
-            )
-            parsed['version_status'] = version_result['status']
-            parsed['file_hash'] = version_result.get('hash', '')
+            def parsed_stream():
+                parse_results = self.parallel_parser.parse_files(files, ordered=settings.parse_ordered)
+                for i, (file_info, parsed, error) in enumerate(parse_results, 1):
+                    if i % 5 == 1 or i == len(files):
+                        logger.info(f"  [{i}/{len(files)}] Parsed: {file_info['relative_path']}")
+                    if error:
+                        logger.warning(f"   ⚠ Failed to parse {file_info['relative_path']}: {error}")
+                        parse_errors.append({'file': file_info['relative_path'], 'error': error})
+                        continue
+                    if not parsed:
+                        continue  # no grammar for this language
+                    parsed_files.append(parsed)
+                    yield file_info, parsed
             
-            if version_result['status'] == 'new_version':
-                logger.info(f"   📌 New version: {file_info['relative_path']}")
-            elif version_result['status'] == 'unchanged':
-                logger.debug(f"   ✓ Unchanged: {file_info['relative_path']} (commit {version_result.get('commit', 'N/A')})")
+            # Parsing feeds the store stages through bounded queues, so Neo4j and
+            # Chroma writes overlap with parsing instead of waiting on each file
+            pipeline = Pipeline([
+                Stage('version-track', lambda item: self._ingest_version(item, repo_path), settings.ingest_version_workers),
+                Stage('graph-write', self._ingest_graph, settings.ingest_graph_workers),
+                Stage('vector-write', self._ingest_vector, settings.ingest_vector_workers),
+            ], settings.ingest_queue_size)
+            # Graph writes from all files are grouped into a few managed transactions
+            with self.graph_db.batch_writer() as self.graph_writer:
+                ingest_errors = pipeline.run(parsed_stream(), describe=lambda item: item[0]['relative_path'])
+            logger.info(f"   💾 Graph writes: {self.graph_writer.statements} statements "
+                        f"in {self.graph_writer.transactions} transactions")
+            self.graph_writer = None
+            self._remove_deleted_files()
+            self._remove_deleted_chunks()
             
-            self._store_in_graph(parsed)
-            self._store_in_vector(parsed)
+            logger.info("\n🕸️ Building dependency graph...")
+            self.dependency_mapper.build_graph(parsed_files)
             
-            # Link file to snapshot
-            with self.graph_db.driver.session() as session:
-                session.run("""
-                    MATCH (s:Snapshot {snapshot_id: $snapshot_id})
-                    MATCH (f:File {file_path: $file_path})
-                    MERGE (s)-[:ANALYZED_FILE]->(f)
-                    """,
-                    snapshot_id=self.current_snapshot_id,
-                    file_path=file_info['path']
-                )
-        
-        logger.info("\n🕸️ Building dependency graph...")
-        self.dependency_mapper.build_graph(parsed_files)
-        
-        # Store dependencies in Neo4j
-        logger.info("💾 Storing dependencies in Neo4j...")
-        self._store_dependencies_in_neo4j()
+            logger.info("📞 Resolving function calls...")
+            function_calls = self._store_call_graph(parsed_files)
+            
+            if self.bulk_loader:
+                self._finish_bulk_load()
+            else:
+                # Store dependencies in Neo4j
+                logger.info("💾 Storing dependencies in Neo4j...")
+                self._store_dependencies_in_neo4j()
+        finally:
+            if self.bulk_loader:
+                # Parsing or a write failed before the load: drop the CSV files
+                self.bulk_loader.cleanup()
+                self.bulk_loader = None
+        # Linked once the File writes are committed (the writer flushed above)
+        self._link_snapshot_files()
+        self.graph_db.get_path_index(self.current_repo_id, rebuild=True)
         
         # Create transitive function call relationships
         logger.info("🔗 Creating transitive function relationships...")
-        transitive_count = self.graph_db.create_transitive_function_calls(self.current_repo_id)
-        logger.info(f"   ✅ Created {transitive_count} transitive relationships")
+        self._store_transitive_calls(function_calls)
         
         logger.info("🔍 Detecting architectural patterns...")
+        from .graph.analyzers import PatternDetector, CouplingAnalyzer
         self.pattern_detector = PatternDetector(self.dependency_mapper.graph)
         self.coupling_analyzer = CouplingAnalyzer(self.dependency_mapper.graph)
-        self.blast_radius_analyzer = BlastRadiusAnalyzer(self.dependency_mapper, self.graph_db)
+        self.blast_radius_analyzer = BlastRadiusAnalyzer(
+            self.dependency_mapper, self.graph_db, self.get_call_reachability
+        )
         
         patterns = self.pattern_detector.detect_patterns()
         coupling = self.coupling_analyzer.analyze()
@@ -286,7 +423,7 @@ class AnalysisEngine:
             edges = [(u, v) for u, v in self.dependency_mapper.graph.edges()]
             
             # Store in snapshot instead of commit
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 session.run("""
                     MATCH (s:Snapshot {snapshot_id: $snapshot_id})
                     SET s.dependencies = $deps,
@@ -307,7 +444,7 @@ class AnalysisEngine:
             }
             
             # Store metrics in snapshot
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 session.run("""
                     MATCH (s:Snapshot {snapshot_id: $snapshot_id})
                     SET s.avg_coupling = $avg_coupling,
@@ -340,13 +477,16 @@ class AnalysisEngine:
             'patterns': patterns,
             'coupling': coupling,
             'architecture': arch_explanation,
+            'parse_errors': parse_errors,
+            'ingest_errors': ingest_errors,
+            'skipped_files': skipped_files,
             'status': 'completed'
         }
     
     def load_repository_analysis(self, repo_id: str) -> bool:
         """Load existing analysis for a repository"""
         try:
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 result = session.run("""
                     MATCH (r:Repository {repo_id: $repo_id})
                     RETURN r.path as path, r.current_commit as commit
@@ -425,7 +565,7 @@ class AnalysisEngine:
         # Store in database
         if self.current_snapshot_id:
             import json
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 session.run("""
                     MATCH (s:Snapshot {snapshot_id: $snapshot_id})
                     SET s.arch_macro = $macro,
@@ -461,7 +601,7 @@ class AnalysisEngine:
         
         # Fallback: if no live files found, read from Snapshot node properties
         if total_files == 0 and self.current_snapshot_id:
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 result = session.run("""
                     MATCH (s:Snapshot {snapshot_id: $sid})
                     RETURN s.total_files as tf, s.total_deps as td,
@@ -535,7 +675,8 @@ class AnalysisEngine:
         
         # Retrieve evidence from vector store
         evidence = self.retrieval_engine.retrieve_evidence(
-            "system architecture patterns modules structure"
+            "system architecture patterns modules structure",
+            repo_id=self.current_repo_id
         )
         
         # Compute structural stats (no LLM tokens needed)
@@ -605,7 +746,7 @@ class AnalysisEngine:
                                    patterns: Dict, coupling: Dict, arch_explanation: Dict):
         """Store analysis results in snapshot atomically"""
         import json
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             # Atomic update - all properties set in single operation
             session.run("""
                 MATCH (s:Snapshot {snapshot_id: $snapshot_id})
@@ -629,15 +770,12 @@ class AnalysisEngine:
     def _get_cached_snapshot(self, repo_id: str, commit_hash: str) -> Dict:
         """Check if snapshot exists for this commit with valid data"""
         import json
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             # Check if commit changed - invalidate cache if different
             result = session.run("""
                 MATCH (r:Repository {repo_id: $repo_id})
                 OPTIONAL MATCH (s:Snapshot {repo_id: $repo_id, commit_hash: $commit_hash})
                 WHERE s.patterns IS NOT NULL AND s.total_files > 0
-                OPTIONAL MATCH (s)-[:ANALYZED_FILE]->(f:File)
-                WITH r, s, COUNT(f) as file_count
-                WHERE file_count > 0
                 RETURN r.current_commit as current_commit,
                        s.snapshot_id as snapshot_id,
                        s.patterns as patterns,
@@ -651,6 +789,9 @@ class AnalysisEngine:
                 commit_hash=commit_hash
             )
             record = result.single()
+            # Only a snapshot whose files are still linked can be served
+            if record and not (record['snapshot_id'] and self.graph_db.count_snapshot_files(record['snapshot_id'])):
+                record = None
             
             # Invalidate cache if commit changed
             if record and record['current_commit'] != commit_hash:
@@ -680,42 +821,29 @@ class AnalysisEngine:
     def _rebuild_from_cache(self, repo_id: str):
         """Rebuild analyzers from cached snapshot data"""
         import json as json_mod
-        with self.graph_db.driver.session() as session:
-            # Get files with their imports and dependencies
-            result = session.run("""
-                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
-                OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
-                OPTIONAL MATCH (f)-[:DEPENDS_ON]->(dep:File)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(cls:Class)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
-                RETURN COALESCE(f.file_path, f.path) as file,
-                       f.language as language,
-                       COLLECT(DISTINCT m.name) as imports,
-                       COLLECT(DISTINCT COALESCE(dep.file_path, dep.path)) as dependencies,
-                       COLLECT(DISTINCT cls.name) as classes,
-                       COLLECT(DISTINCT fn.name) as functions
-                """, repo_id=repo_id)
-            
-            parsed_files = []
-            deps_map = {}  # file -> list of dependency file paths
-            for r in result:
-                file_path = r['file']
-                imports = [imp for imp in r['imports'] if imp]
-                deps = [d for d in r['dependencies'] if d]
-                parsed_files.append({
-                    'file': file_path,
-                    'language': r['language'] or 'python',
-                    'imports': imports,
-                    'classes': [{'name': c} for c in r['classes'] if c],
-                    'functions': [{'name': f} for f in r['functions'] if f]
-                })
-                if deps:
-                    deps_map[file_path] = deps
+        self.call_reachability = None  # rebuilt on demand from stored CALLS
+        self.graph_db.get_path_index(repo_id)
+        parsed_files = []
+        deps_map = {}  # file -> list of dependency file paths
+        # Files with their imports and dependencies
+        for r in self.graph_db.get_file_summaries(repo_id):
+            file_path = r['file']
+            imports = [imp for imp in r['imports'] if imp]
+            deps = [d for d in r['dependencies'] if d]
+            parsed_files.append({
+                'file': file_path,
+                'language': r['language'] or 'python',
+                'imports': imports,
+                'classes': [{'name': c} for c in r['classes'] if c],
+                'functions': [{'name': f} for f in r['functions'] if f]
+            })
+            if deps:
+                deps_map[file_path] = deps
         
         # If no live File nodes, try to rebuild from snapshot_files JSON + dependencies
         if not parsed_files and self.current_snapshot_id:
             logger.info("📂 No live File nodes — rebuilding from snapshot_files")
-            with self.graph_db.driver.session() as session:
+            with self.neo4j.driver.session() as session:
                 result = session.run("""
                     MATCH (s:Snapshot {snapshot_id: $sid})
                     RETURN s.snapshot_files as sf, s.dependencies as deps
@@ -752,6 +880,7 @@ class AnalysisEngine:
                         logger.warning(f"Could not parse stored dependencies: {e}")
         
         # Rebuild dependency graph with import data
+        from .graph.dependency_mapper import DependencyMapper
         self.dependency_mapper = DependencyMapper()
         self.dependency_mapper.build_graph(parsed_files)
         
@@ -769,14 +898,17 @@ class AnalysisEngine:
         logger.info(f"   📊 Rebuilt graph: {self.dependency_mapper.graph.number_of_nodes()} nodes, {self.dependency_mapper.graph.number_of_edges()} edges")
         
         # Rebuild analyzers
+        from .graph.analyzers import PatternDetector, CouplingAnalyzer
         self.pattern_detector = PatternDetector(self.dependency_mapper.graph)
         self.coupling_analyzer = CouplingAnalyzer(self.dependency_mapper.graph)
-        self.blast_radius_analyzer = BlastRadiusAnalyzer(self.dependency_mapper, self.graph_db)
+        self.blast_radius_analyzer = BlastRadiusAnalyzer(
+            self.dependency_mapper, self.graph_db, self.get_call_reachability
+        )
     
     def _get_cached_architecture(self, repo_id: str, commit_hash: str) -> Dict:
         """Retrieve cached architecture explanation from snapshot"""
         import json
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             result = session.run("""
                 MATCH (s:Snapshot {repo_id: $repo_id, commit_hash: $commit_hash})
                 WHERE s.arch_macro IS NOT NULL AND s.arch_macro <> ''
@@ -842,7 +974,9 @@ class AnalysisEngine:
             
             # If still not initialized, create it
             if not self.blast_radius_analyzer:
-                self.blast_radius_analyzer = BlastRadiusAnalyzer(self.dependency_mapper, self.graph_db)
+                self.blast_radius_analyzer = BlastRadiusAnalyzer(
+                    self.dependency_mapper, self.graph_db, self.get_call_reachability
+                )
         
         # Get blast radius analysis
         result = self.blast_radius_analyzer.analyze(resolved_path, change_type, self.current_repo_id)
@@ -940,8 +1074,16 @@ Provide a concise 2-3 sentence summary explaining:
                 'line': c.get('line', 0)
             })
         
+        # Callers reaching it only through longer call chains
+        reachability = self.get_call_reachability()
+        transitive_callers = [
+            {'caller_name': name, 'caller_file': caller_file}
+            for caller_file, name in (reachability.callers((file_path, function_name)) if reachability else [])
+        ]
+        
         # Get semantic context from vector store
         search_results = self.vector_store.search(
+            self.current_repo_id,
             f"function {function_name} implementation usage",
             n_results=3
         )
@@ -962,6 +1104,7 @@ Provide a concise 2-3 sentence summary explaining:
             "code": function_code,
             "callers": callers,
             "usage_count": len(callers),
+            "transitive_callers": transitive_callers,
             "explanation": explanation,
             "related_code": search_results
         }
@@ -971,8 +1114,8 @@ Provide a concise 2-3 sentence summary explaining:
         
         return result
     
-    def _resolve_path(self, file_path: str) -> str:
-        """Convert relative path to absolute path stored in graph"""
+    def _resolve_path(self, file_path: str, repo_id: str = None) -> str:
+        """Convert relative path to absolute path stored in graph (repo_id defaults to the current repo)"""
         # Strategy 1: Try filesystem resolution
         if self.repo_path and not Path(file_path).is_absolute():
             full_path = self.repo_path / file_path
@@ -983,7 +1126,7 @@ Provide a concise 2-3 sentence summary explaining:
         # was cloned to temp dir that no longer exists)
         if hasattr(self, 'graph_db') and self.graph_db:
             try:
-                resolved = self.graph_db.resolve_file_path(file_path)
+                resolved = self.graph_db.resolve_file_path(file_path, repo_id or self.current_repo_id)
                 if resolved != file_path:
                     return resolved
             except:
@@ -991,71 +1134,229 @@ Provide a concise 2-3 sentence summary explaining:
         
         return file_path
     
-    def _store_in_graph(self, parsed: Dict):
-        # Compute file content hash
-        import hashlib
+    def _ingest_version(self, item, repo_path: Path):
+        """Pipeline stage: track the file version by its content hash"""
+        file_info, parsed = item
+        # Only creates a new version if the commit changed
+        version_result = self.version_tracker.track_file_version(
+            self.current_repo_id,
+            file_info['path'],
+            str(repo_path),
+            content_hash=parsed.get('content_hash')
+        )
+        parsed['version_status'] = version_result['status']
+        parsed['file_hash'] = version_result.get('hash', '')
+        
+        if version_result['status'] == 'new_version':
+            logger.info(f"   📌 New version: {file_info['relative_path']}")
+        elif version_result['status'] == 'unchanged':
+            logger.debug(f"   ✓ Unchanged: {file_info['relative_path']} (commit {version_result.get('commit', 'N/A')})")
+        return item
+    
+    def _ingest_graph(self, item):
+        if self.bulk_loader:
+            from .parser.static_parser import EXTRACTOR_VERSION
+            self.bulk_loader.add_parsed(item[1], EXTRACTOR_VERSION)
+        else:
+            self._store_in_graph(item[1])
+        return item
+    
+    def _make_bulk_loader(self, file_count: int):
+        """CSVBulkLoader for a repository big enough to bulk load, else None"""
+        if not settings.bulk_load_import_dir or file_count < settings.bulk_load_min_files:
+            return None
+        if self.graph_db is not self.neo4j:
+            return None  # LOAD CSV is Neo4j only; the embedded store batches its writes
+        from .graph.bulk_loader import CSVBulkLoader
+        logger.info(f"📦 {file_count} files: using offline bulk load via {settings.bulk_load_import_dir}")
+        return CSVBulkLoader(
+            self.graph_db,
+            settings.bulk_load_import_dir,
+            settings.bulk_load_url_prefix,
+            settings.bulk_load_batch_size,
+            subdir=f"bulk-{self.current_repo_id}"
+        )
+    
+    def _finish_bulk_load(self):
+        """LOAD CSV the collected graph, then go back to regular incremental writes"""
+        loader, self.bulk_loader = self.bulk_loader, None
         try:
-            with open(parsed['file'], 'rb') as f:
-                content_hash = hashlib.sha256(f.read()).hexdigest()
-        except:
-            content_hash = None
-        
-        self.graph_db.create_file_node(parsed['file'], parsed['language'], content_hash)
-        
-        for cls in parsed.get('classes', []):
-            self.graph_db.create_class_node(
-                parsed['file'],
-                cls['name'],
-                cls['line']
-            )
-        
-        for func in parsed.get('functions', []):
-            self.graph_db.create_function_node(
-                parsed['file'],
-                func['name'],
-                func['line'],
-                self.current_repo_id
-            )
+            loader.add_dependencies(self.dependency_mapper.file_dependencies())
+            logger.info("📥 Bulk loading graph with LOAD CSV...")
+            loader.load(self.current_repo_id)
+        finally:
+            loader.cleanup()
+    
+    def _ingest_vector(self, item):
+        self._store_in_vector(item[1])
+        return item
+    
+    def _link_snapshot_files(self):
+        """Link every stored file of the repo to the current snapshot in one statement"""
+        self.graph_db.link_snapshot_files(self.current_repo_id, self.current_snapshot_id)
+    
+    def _store_in_graph(self, parsed: Dict):
+        # Content hash is computed by the parser; fall back to hashing the file
+        content_hash = parsed.get('content_hash')
+        if not content_hash:
+            import hashlib
+            try:
+                with open(parsed['file'], 'rb') as f:
+                    content_hash = hashlib.sha256(f.read()).hexdigest()
+            except:
+                content_hash = None
+        
+        from .parser.static_parser import EXTRACTOR_VERSION
+        file_path = parsed['file']
+        writer = self.graph_writer
+        stored_path = self.graph_db._normalize_path(file_path)
+        if stored_path not in self.stored_file_hashes:
+            self.graph_diff['added'].append(stored_path)
+        elif content_hash and self.stored_file_hashes[stored_path] == (content_hash, EXTRACTOR_VERSION):
+            # Same content extracted by the same extractor: the stored rows are current
+            self.graph_diff['unchanged'].append(stored_path)
+            return
+        else:
+            self.graph_diff['modified'].append(stored_path)
+            self.graph_db.bulk_prune_files([{
+                'path': file_path,
+                'classes': [cls['name'] for cls in parsed.get('classes', [])],
+                'functions': [func['name'] for func in parsed.get('functions', [])]
+            }], writer)
+        
+        self.graph_db.bulk_create_files(
+            [{'path': file_path, 'language': parsed['language'], 'content_hash': content_hash,
+              'extractor_version': EXTRACTOR_VERSION}],
+            self.current_repo_id, writer
+        )
+        self.graph_db.bulk_create_classes(
+            [{'file': file_path, 'name': cls['name'], 'line': cls['line']} for cls in parsed.get('classes', [])],
+            writer
+        )
+        self.graph_db.bulk_create_functions(
+            [{'file': file_path, 'name': func['name'], 'line': func['line']} for func in parsed.get('functions', [])],
+            writer
+        )
         
         imports = parsed.get('imports', [])
         if imports:
-            logger.info(f"   📦 Storing {len(imports)} imports for {parsed['file']}")
-        for imp in imports:
-            self.graph_db.create_import_relationship(parsed['file'], imp)
-        
-        # Store function calls
-        function_calls = parsed.get('function_calls', [])
-        if function_calls:
-            logger.info(f"   📞 Storing {len(set(function_calls))} unique function calls from {Path(parsed['file']).name}")
-            for called_func in set(function_calls):
-                self.graph_db.create_function_call(parsed['file'], called_func, self.current_repo_id)
-        
-        # Store function-to-function calls
-        func_to_func_calls = parsed.get('function_to_function_calls', [])
-        if func_to_func_calls:
-            logger.info(f"   🔗 Storing {len(func_to_func_calls)} function-to-function calls")
-            for call in func_to_func_calls:
-                self.graph_db.create_function_to_function_call(
-                    parsed['file'], 
-                    call['caller'], 
-                    call['callee'], 
-                    self.current_repo_id
-                )
+            logger.info(f"   📦 Storing {len(imports)} imports for {file_path}")
+        self.graph_db.bulk_create_imports([{'file': file_path, 'module': imp} for imp in imports], writer)
+    
+    def _remove_deleted_files(self):
+        """Delete stored files that are gone from this analysis, and log the graph diff"""
+        if self.bulk_loader:
+            return  # first load: nothing stored to diff against
+        seen = set().union(*self.graph_diff.values())
+        removed = [path for path in self.stored_file_hashes if path not in seen]
+        if removed:
+            self.graph_db.bulk_delete_files(removed)
+            self.graph_db.delete_orphan_modules()
+        logger.info(f"   🧮 Graph diff: {len(self.graph_diff['added'])} added, "
+                    f"{len(self.graph_diff['modified'])} modified, {len(removed)} removed, "
+                    f"{len(self.graph_diff['unchanged'])} unchanged")
+    
+    def _remove_deleted_chunks(self):
+        """Delete this repo's vector chunks of files that are gone"""
+        seen = set(self.embedded_chunks)
+        removed = [chunk_id for chunk_id in self.stored_chunk_hashes if chunk_id not in seen]
+        self.vector_store.delete_chunks(self.current_repo_id, removed)
+        logger.info(f"   🧮 Vector chunks: {len(self.embedded_chunks)} current, {len(removed)} removed")
+    
+    def _store_call_graph(self, parsed_files: List[Dict]):
+        """Create CALLS edges for calls the symbol table can resolve.
+        
+        Runs once every file is stored, since resolving a call needs the
+        symbols of the file that defines the callee.
+        """
+        from .graph.symbol_table import SymbolTable
+        symbol_table = SymbolTable(parsed_files, self.dependency_mapper.import_resolver)
+        file_calls, function_calls = symbol_table.resolve_calls()
+        
+        if self.bulk_loader:
+            self.bulk_loader.add_calls(file_calls, function_calls)
+            logger.info(f"   🔗 Queued {len(file_calls)} file calls, {len(function_calls)} function-to-function calls")
+            return function_calls
+        
+        # Only CALLS edges that appeared or disappeared are written
+        file_added, file_removed = self.graph_db.sync_function_calls(self.current_repo_id, file_calls)
+        func_added, func_removed = self.graph_db.sync_function_to_function_calls(
+            self.current_repo_id, function_calls
+        )
+        logger.info(f"   🔗 {len(file_calls)} file calls (+{file_added}/-{file_removed}), "
+                    f"{len(function_calls)} function-to-function calls (+{func_added}/-{func_removed})")
+        return function_calls
+    
+    def _store_transitive_calls(self, function_calls: List[tuple]):
+        """Compute transitive calls in memory and, if configured, store them as CALLS_TRANSITIVE"""
+        import time
+        from .graph.call_closure import CallReachability
+        start = time.perf_counter()
+        # Keyed by stored paths, like get_function_call_edges, so lookups with
+        # paths read back from the graph match right after this analysis
+        stored = {}
+        for file, _, target_file, _ in function_calls:
+            for path in (file, target_file):
+                if path not in stored:
+                    stored[path] = self.graph_db._normalize_path(path)
+        self.call_reachability = self._build_call_reachability([
+            ((stored[file], caller), (stored[target_file], callee))
+            for file, caller, target_file, callee in function_calls
+        ])
+        pairs = ()
+        if isinstance(self.call_reachability, CallReachability):
+            logger.info(f"   🧮 {len(self.call_reachability)} transitive calls over "
+                        f"{len(self.call_reachability.nodes)} functions in {time.perf_counter() - start:.2f}s")
+            if settings.transitive_calls_materialize:
+                pairs = self.call_reachability.pairs()
+        # Without materialization, stale CALLS_TRANSITIVE from earlier analyses are removed
+        added, removed = self.graph_db.sync_transitive_calls(self.current_repo_id, pairs)
+        logger.info(f"   ✅ Transitive relationships: +{added}/-{removed}")
+    
+    def get_call_reachability(self):
+        """Transitive-caller index of the current repo, built from stored CALLS edges if needed"""
+        if self.call_reachability is None and self.current_repo_id:
+            self.call_reachability = self._build_call_reachability(
+                self.graph_db.get_function_call_edges(self.current_repo_id)
+            )
+        return self.call_reachability
+    
+    def _build_call_reachability(self, edges: List[tuple]):
+        """CallReachability over function call edges, or graph queries for transitive
+        callers if the repo has more than transitive_call_max_functions functions"""
+        from .graph.call_closure import CallReachability, GraphCallReachability
+        limit = settings.transitive_call_max_functions
+        functions = {function for edge in edges for function in edge}
+        if limit and len(functions) > limit:
+            logger.warning(f"   ⚠️ {len(functions)} functions exceed transitive_call_max_functions ({limit}): "
+                           f"transitive callers are queried from the graph")
+            return GraphCallReachability(self.graph_db, self.current_repo_id, settings.transitive_call_depth)
+        return CallReachability(edges, settings.transitive_call_depth)
     
     def _store_in_vector(self, parsed: Dict):
         """Store code in vector database for semantic search"""
+        chunk_id = parsed['file']
+        content_hash = parsed.get('content_hash') or ''
         code_text = self._extract_code_text(parsed)
-        if code_text.strip():
-            self.vector_store.add_code_chunk(
-                chunk_id=parsed['file'],
-                code=code_text,
-                metadata={
-                    'file_path': parsed['file'],
-                    'language': parsed['language'],
-                    'num_classes': len(parsed.get('classes', [])),
-                    'num_functions': len(parsed.get('functions', []))
-                }
-            )
+        if not code_text.strip():
+            return
+        self.embedded_chunks.append(chunk_id)
+        from .parser.static_parser import EXTRACTOR_VERSION
+        if content_hash and self.stored_chunk_hashes.get(chunk_id) == (content_hash, EXTRACTOR_VERSION):
+            return  # embedding is still current
+        self.vector_store.add_code_chunk(
+            repo_id=self.current_repo_id,
+            chunk_id=chunk_id,
+            code=code_text,
+            metadata={
+                'file_path': parsed['file'],
+                'content_hash': content_hash,
+                'extractor_version': EXTRACTOR_VERSION,
+                'language': parsed['language'],
+                'num_classes': len(parsed.get('classes', [])),
+                'num_functions': len(parsed.get('functions', []))
+            }
+        )
     
     def _extract_code_text(self, parsed: Dict) -> str:
         """Extract meaningful code text for embedding"""
@@ -1083,22 +1384,24 @@ Provide a concise 2-3 sentence summary explaining:
         DETACH DELETE on File nodes also removes ANALYZED_FILE edges,
         so we store the file list directly on the Snapshot node."""
         import json
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             # Get all snapshots that don't yet have preserved file data
             result = session.run("""
                 MATCH (r:Repository {repo_id: $repo_id})-[:HAS_SNAPSHOT]->(s:Snapshot)
                 WHERE s.snapshot_files IS NULL
-                MATCH (s)-[:ANALYZED_FILE]->(f:File)
-                WITH s, collect({path: f.file_path, hash: f.content_hash}) as files
-                RETURN s.snapshot_id as sid, files
+                RETURN s.snapshot_id as sid
                 """, repo_id=repo_id)
+            snapshot_ids = [record['sid'] for record in result]
             
             count = 0
-            for record in result:
+            for sid in snapshot_ids:
+                files = self.graph_db.get_snapshot_files(sid)
+                if not files:
+                    continue
                 session.run("""
                     MATCH (s:Snapshot {snapshot_id: $sid})
                     SET s.snapshot_files = $files_json
-                    """, sid=record['sid'], files_json=json.dumps(record['files']))
+                    """, sid=sid, files_json=json.dumps(files))
                 count += 1
             
             if count > 0:
@@ -1106,33 +1409,29 @@ Provide a concise 2-3 sentence summary explaining:
             else:
                 logger.info("   ✓ All snapshots already preserved")
     
+    def _snapshot_file_list(self, session, snapshot_id: str) -> List[Dict]:
+        """[{path, hash}] as analyzed by a snapshot: the preserved snapshot_files
+        if set, else its live ANALYZED_FILE links (not yet preserved)"""
+        import json
+        record = session.run("""
+            MATCH (s:Snapshot {snapshot_id: $sid})
+            RETURN s.snapshot_files as sf
+            """, sid=snapshot_id).single()
+        if record and record['sf']:
+            logger.info(f"📂 Using preserved file data for snapshot {snapshot_id[:8]}")
+            return json.loads(record['sf'])
+        return self.graph_db.get_snapshot_files(snapshot_id)
+    
     def _clear_repo_analysis(self, repo_id: str):
         """Clear only analysis nodes (File/Class/Function), keep Repository/Commit/Version nodes"""
-        with self.graph_db.driver.session() as session:
-            # Delete File nodes and their children for this repo
-            session.run("""
-                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
-                OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
-                DETACH DELETE f, c, fn, m
-                """, repo_id=repo_id)
-            
-            # Clean up orphaned nodes (from deleted repos)
-            session.run("""
-                MATCH (f:File)
-                WHERE NOT (f)<-[:CONTAINS]-(:Repository)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)
-                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
-                DETACH DELETE f, c, fn
-                """)
-        self.vector_store.clear()
+        self.graph_db.clear_repo(repo_id)
+        self.vector_store.drop_repo(repo_id)
     
     def compare_snapshots(self, repo_id: str, snapshot1: str, snapshot2: str) -> Dict:
         """Compare two snapshots with cached architecture, coupling, and dependencies"""
         import json
         
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             # Get cached data from both snapshots
             result = session.run("""
                 MATCH (s1:Snapshot {snapshot_id: $snapshot1})
@@ -1158,47 +1457,10 @@ Provide a concise 2-3 sentence summary explaining:
             coupling1 = json.loads(record['c1']) if record['c1'] else {}
             coupling2 = json.loads(record['c2']) if record['c2'] else {}
             
-            # Get file changes - try live File nodes first, fall back to snapshot_files property
-            files1_raw = []
-            files2_raw = []
-            
-            # Try live File nodes for snapshot 1
-            r1 = session.run("""
-                MATCH (s1:Snapshot {snapshot_id: $sid})-[:ANALYZED_FILE]->(f:File)
-                RETURN collect({path: f.file_path, hash: f.content_hash}) as files
-                """, sid=snapshot1)
-            rec1 = r1.single()
-            if rec1 and rec1['files']:
-                files1_raw = rec1['files']
-            else:
-                # Fall back to preserved snapshot_files property
-                r1b = session.run("""
-                    MATCH (s1:Snapshot {snapshot_id: $sid})
-                    RETURN s1.snapshot_files as sf
-                    """, sid=snapshot1)
-                rec1b = r1b.single()
-                if rec1b and rec1b['sf']:
-                    files1_raw = json.loads(rec1b['sf'])
-                    logger.info(f"📂 Using preserved file data for snapshot {snapshot1[:8]}")
-            
-            # Try live File nodes for snapshot 2
-            r2 = session.run("""
-                MATCH (s2:Snapshot {snapshot_id: $sid})-[:ANALYZED_FILE]->(f:File)
-                RETURN collect({path: f.file_path, hash: f.content_hash}) as files
-                """, sid=snapshot2)
-            rec2 = r2.single()
-            if rec2 and rec2['files']:
-                files2_raw = rec2['files']
-            else:
-                # Fall back to preserved snapshot_files property
-                r2b = session.run("""
-                    MATCH (s2:Snapshot {snapshot_id: $sid})
-                    RETURN s2.snapshot_files as sf
-                    """, sid=snapshot2)
-                rec2b = r2b.single()
-                if rec2b and rec2b['sf']:
-                    files2_raw = json.loads(rec2b['sf'])
-                    logger.info(f"📂 Using preserved file data for snapshot {snapshot2[:8]}")
+            # Preserved file lists first: older snapshots still link to File
+            # nodes that later analyses have rewritten in place
+            files1_raw = self._snapshot_file_list(session, snapshot1)
+            files2_raw = self._snapshot_file_list(session, snapshot2)
             
             # Normalize paths to relative (strip repo root) for accurate cross-snapshot comparison
             def _normalize_path(p):
@@ -1422,7 +1684,7 @@ Provide a concise 2-3 sentence summary explaining:
         import json
         
         # Get snapshots for each commit
-        with self.graph_db.driver.session() as session:
+        with self.neo4j.driver.session() as session:
             result = session.run("""
                 MATCH (s1:Snapshot {repo_id: $repo_id, commit_hash: $commit1})
                 MATCH (s2:Snapshot {repo_id: $repo_id, commit_hash: $commit2})
@@ -1581,38 +1843,11 @@ Provide a concise 2-3 sentence summary explaining:
             return f"# Error reading function code: {str(e)}"
     
     def _store_dependencies_in_neo4j(self):
-        """Store NetworkX graph dependencies as DEPENDS_ON relationships in Neo4j"""
+        """Store the DependencyMapper's resolved file-to-file edges as DEPENDS_ON in Neo4j"""
         if not self.dependency_mapper or not self.dependency_mapper.graph:
             return
         
-        edge_count = 0
-        with self.graph_db.driver.session() as session:
-            for source, target in self.dependency_mapper.graph.edges():
-                # Only store file-to-file dependencies (not external modules)
-                if '\\' in target or '/' in target:  # It's a file path
-                    # Normalize paths for consistent matching
-                    norm_source = str(Path(source).resolve()) if Path(source).exists() else source
-                    norm_target = str(Path(target).resolve()) if Path(target).exists() else target
-                    
-                    # Use flexible matching to find File nodes
-                    source_name = Path(source).name
-                    target_name = Path(target).name
-                    
-                    session.run("""
-                        MATCH (f1:File)
-                        WHERE f1.path = $source OR f1.file_path = $source
-                           OR f1.path ENDS WITH '\\\\' + $source_name
-                           OR f1.path ENDS WITH '/' + $source_name
-                        WITH f1
-                        MATCH (f2:File)
-                        WHERE f2.path = $target OR f2.file_path = $target
-                           OR f2.path ENDS WITH '\\\\' + $target_name
-                           OR f2.path ENDS WITH '/' + $target_name
-                        WITH f1, f2
-                        WHERE f1 <> f2
-                        MERGE (f1)-[:DEPENDS_ON]->(f2)
-                        """, source=norm_source, target=norm_target,
-                            source_name=source_name, target_name=target_name)
-                    edge_count += 1
-        
-        logger.info(f"   ✅ Stored {edge_count} DEPENDS_ON relationships in Neo4j")
+        added, removed = self.graph_db.sync_dependencies(
+            self.current_repo_id, self.dependency_mapper.file_dependencies()
+        )
+        logger.info(f"   ✅ DEPENDS_ON relationships: +{added}/-{removed}")
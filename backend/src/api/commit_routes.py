@@ -3,10 +3,10 @@ from typing import Dict, List
 
 router = APIRouter()
 
-# Dependency to get graph_db from main app
+# Dependency to get the Neo4j store (commits and versions) from main app
 def get_graph_db():
     from main import engine
-    return engine.graph_db
+    return engine.neo4j
 
 @router.get("/repository/{repo_id}/commits")
 def get_commits(repo_id: str, graph_db = Depends(get_graph_db)) -> List[Dict]:
@@ -1,17 +1,89 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
 class Settings(BaseSettings):
     neo4j_uri: str
     neo4j_user: str
     neo4j_password: str
     
+    # Async driver used by the API read endpoints: pool size and how long a
+    # request waits for a free connection before failing (seconds)
+    neo4j_async_pool_size: int = 50
+    neo4j_acquisition_timeout: float = 10.0
+    # Seconds to wait at connect for new indexes to come online (0 = don't wait)
+    neo4j_index_wait_timeout: float = 5.0
+    
+    # Store for the code graph (files, classes, functions, DEPENDS_ON / CALLS):
+    # "neo4j", or "embedded" for SQLite in process at embedded_graph_path.
+    # Repositories, commits, versions and snapshots always stay in Neo4j; which
+    # files a snapshot analyzed is kept in the selected store. "embedded" is
+    # experimental: per-file version history still reads File nodes in Neo4j.
+    graph_backend: str = "neo4j"
+    embedded_graph_path: str = str(BACKEND_DIR / "graph_store.sqlite")
+    
     chroma_path: str
     
     groq_api_key: str
     
     max_file_size: int = 1000000
+    mirror_cache_max_bytes: int = 5 * 1024 ** 3  # quota for bare mirrors in the workspace
     supported_languages: list = ["python", "javascript", "java"]
     
+    parse_workers: int = 0  # 0 = one per CPU core
+    parse_chunksize: int = 16
+    parse_ordered: bool = True
+    # Extraction backend per language: "walker" (default) or "query"; both give
+    # the same output. benchmarks/bench_extractors.py compares them: on the
+    # frontend JS "query" took ~17 ms vs ~30 ms, on Python neither was
+    # consistently faster (within +-10%, varies by machine).
+    parser_backends: dict = {}  # language -> "walker" | "query"
+    parse_cache_dir: str = str(BACKEND_DIR / "parse_cache")  # empty string disables the cache
+    parse_cache_max_bytes: int = 256 * 1024 * 1024
+    # Keep tree-sitter trees between analyses and reparse only edited regions.
+    # Files changed since the previous analysis are parsed in process that way;
+    # the rest still go to the worker pool.
+    parse_incremental: bool = False
+    
+    # Ingestion pipeline: bounded queue size and worker threads per store stage.
+    # Graph stages default to one worker since concurrent MERGEs on shared
+    # nodes (modules, users) can race without uniqueness constraints.
+    ingest_queue_size: int = 64
+    ingest_version_workers: int = 1
+    ingest_graph_workers: int = 1
+    ingest_vector_workers: int = 1
+    
+    # Graph writes during ingestion: statements per managed transaction (the
+    # commit size), and retries with exponential backoff on transient errors
+    graph_write_batch_size: int = 200
+    graph_write_max_retries: int = 5
+    graph_write_retry_backoff: float = 0.2
+    
+    # Re-analysis diffs files against their stored content_hash and rewrites
+    # only added / modified / removed files (graph nodes, vector chunks) and
+    # the edges that changed; False clears the repo's graph and vector
+    # collection and rebuilds them from scratch
+    graph_incremental_update: bool = True
+    
+    # Offline bulk load: analyses of at least bulk_load_min_files files write the
+    # graph as CSV into a directory Neo4j can LOAD CSV from (usually its import
+    # directory, reachable at bulk_load_url_prefix). Empty dir disables it.
+    bulk_load_min_files: int = 20000
+    bulk_load_import_dir: str = ""
+    bulk_load_url_prefix: str = "file:///"
+    bulk_load_batch_size: int = 10000
+    
+    # Transitive calls are computed in memory (graph/call_closure.py) up to this
+    # many calls deep (0 = unbounded). Materialize them as CALLS_TRANSITIVE, or
+    # keep only the in-memory index and answer lookups on demand.
+    transitive_call_depth: int = 5
+    transitive_calls_materialize: bool = True
+    # The in-memory index holds up to N^2 bits per direction for N functions.
+    # Above this many functions (0 = no limit), transitive callers are queried
+    # from the stored CALLS edges instead, and none are materialized.
+    transitive_call_max_functions: int = 20000
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
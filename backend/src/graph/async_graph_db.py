@@ -0,0 +1,133 @@
+from neo4j import AsyncGraphDatabase
+from typing import Dict, List
+import logging
+from pathlib import Path
+from .graph_db import (
+    FILE_LOOKUPS, DEPENDENCIES_QUERY, REPO_FILES_QUERY, ALL_FILES_QUERY, REPO_FUNCTIONS_QUERY, ALL_FUNCTIONS_QUERY
+)
+from .path_index import PathIndex
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGraphDB:
+    """Read-only graph access for the API handlers, on the async Neo4j driver.
+
+    Handlers await these queries instead of blocking the event loop on the
+    synchronous driver, so one slow query no longer stalls every other
+    request. Writes (analysis, snapshots) stay on GraphDB.
+
+    The pool is bounded by max_pool_size connections; a request that cannot
+    get one within acquisition_timeout seconds fails instead of queueing
+    forever behind slow queries.
+    """
+
+    def __init__(self, uri: str, user: str, password: str,
+                 max_pool_size: int = 50, acquisition_timeout: float = 10.0):
+        # Connections are opened on first use, not here
+        self.driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=max_pool_size,
+            connection_acquisition_timeout=acquisition_timeout
+        )
+        logger.info(f"🔌 Async Neo4j driver for {uri} (pool {max_pool_size}, acquire timeout {acquisition_timeout}s)")
+
+    async def close(self):
+        await self.driver.close()
+
+    async def query(self, cypher: str, **params) -> List[Dict]:
+        """Run a read query in a managed read transaction; returns records as dicts"""
+        async def work(tx):
+            result = await tx.run(cypher, **params)
+            return [dict(record) async for record in result]
+
+        async with self.driver.session() as session:
+            return await session.execute_read(work)
+
+    async def resolve_file_path(self, graph_db, file_path: str, repo_id: str = None) -> str:
+        """graph_db.resolve_file_path without blocking the event loop.
+        
+        A repo's PathIndex that is not built yet is built from an awaited
+        file query; without a repo_id the stored-path lookups are awaited.
+        """
+        if repo_id:
+            if repo_id not in graph_db.path_indexes:
+                graph_db.path_indexes[repo_id] = PathIndex(await self.get_all_files(repo_id))
+            lookup = graph_db.path_indexes[repo_id].lookup(file_path)
+        else:
+            lookup = graph_db._stored_path_lookup(file_path, await self._query_file_path(graph_db, file_path))
+        return graph_db._resolved_path(file_path, lookup)
+
+    async def _query_file_path(self, graph_db, file_path: str) -> str:
+        """GraphDB._query_file_path on the async driver"""
+        suffix_fwd = graph_db._get_path_suffix(file_path).replace('\\', '/')
+        filename = '/' + Path(file_path.replace('\\', '/')).name
+        values = [file_path, file_path, suffix_fwd, filename]
+        for (_, query), value in zip(FILE_LOOKUPS + FILE_LOOKUPS[-1:], values):
+            records = await self.query(query, value=value)
+            if records and records[0]['resolved_path']:
+                return records[0]['resolved_path']
+        return None
+
+    async def get_dependencies(self, path: str) -> List[str]:
+        """Dependencies of a stored file path (resolve user input with resolve_file_path)"""
+        records = await self.query(DEPENDENCIES_QUERY, path=path)
+        return [d for d in records[0]["dependencies"] if d] if records else []
+
+    async def get_all_files(self, repo_id: str = None) -> List[str]:
+        if repo_id:
+            records = await self.query(REPO_FILES_QUERY, repo_id=repo_id)
+        else:
+            records = await self.query(ALL_FILES_QUERY)
+        return [record["path"] for record in records if record["path"]]
+
+    async def get_all_functions(self, repo_id: str = None) -> List[Dict]:
+        if repo_id:
+            return await self.query(REPO_FUNCTIONS_QUERY, repo_id=repo_id)
+        return await self.query(ALL_FUNCTIONS_QUERY)
+
+    async def get_snapshots(self, repo_id: str) -> List[Dict]:
+        return await self.query("""
+            MATCH (r:Repository {repo_id: $repo_id})-[:HAS_SNAPSHOT]->(s:Snapshot)
+            OPTIONAL MATCH (s)-[:ANALYZED_FILE]->(f:File)
+            WITH s, COUNT(DISTINCT f) as file_count
+            RETURN s.snapshot_id as snapshot_id,
+                   toString(s.created_at) as created_at,
+                   s.commit_hash as commit_hash,
+                   s.total_files as total_files,
+                   s.total_deps as total_deps,
+                   s.avg_coupling as avg_coupling,
+                   s.cycle_count as cycle_count,
+                   file_count
+            ORDER BY s.created_at DESC
+            """, repo_id=repo_id)
+
+    async def get_commits(self, repo_id: str) -> List[Dict]:
+        return await self.query("""
+            MATCH (r:Repository {repo_id: $repo_id})-[:HAS_COMMIT]->(c:Commit)
+            OPTIONAL MATCH (c)-[:AUTHORED_BY]->(u:User)
+            RETURN c.commit_hash as hash, c.message as message,
+                   toString(c.timestamp) as timestamp, u.email as author
+            ORDER BY c.timestamp DESC
+            """, repo_id=repo_id)
+
+    async def get_commit_files(self, repo_id: str, commit_hash: str) -> List[Dict]:
+        return await self.query("""
+            MATCH (c:Commit {repo_id: $repo_id, commit_hash: $commit_hash})
+            MATCH (f:File)-[:VERSION_AT]->(c)
+            OPTIONAL MATCH (f)-[:HAS_VERSION]->(v:Version)-[:VERSION_AT]->(c)
+            RETURN f.file_path as path, v.hash as content_hash
+            """, repo_id=repo_id, commit_hash=commit_hash)
+
+    async def get_commit_file_hashes(self, repo_id: str, commit1: str, commit2: str) -> List[Dict]:
+        """Per file: its version hash at commit1 (hash1) and at commit2 (hash2)"""
+        return await self.query("""
+            MATCH (c1:Commit {repo_id: $repo_id, commit_hash: $commit1})
+            MATCH (c2:Commit {repo_id: $repo_id, commit_hash: $commit2})
+            OPTIONAL MATCH (f1:File)-[:VERSION_AT]->(c1)
+            OPTIONAL MATCH (f1)-[:HAS_VERSION]->(v1:Version)-[:VERSION_AT]->(c1)
+            OPTIONAL MATCH (f2:File {file_path: f1.file_path})-[:VERSION_AT]->(c2)
+            OPTIONAL MATCH (f2)-[:HAS_VERSION]->(v2:Version)-[:VERSION_AT]->(c2)
+            RETURN f1.file_path as path, v1.hash as hash1, v2.hash as hash2
+            """, repo_id=repo_id, commit1=commit1, commit2=commit2)
@@ -0,0 +1,90 @@
+import logging
+import random
+import time
+from threading import Lock
+from typing import Callable, Dict, List, Tuple
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+logger = logging.getLogger(__name__)
+
+# Worth retrying: deadlocks / lock timeouts between overlapping ingests, and
+# connections dropped by a restarting or failing-over server
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+def run_with_retry(work: Callable, max_retries: int = 5, backoff: float = 0.2):
+    """Call work(), retrying transient failures with exponential backoff and jitter.
+
+    execute_write already retries inside the driver for a while; this covers
+    what escapes it, e.g. a deadlock that keeps recurring while two analyses
+    write the same nodes.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return work()
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * (2 ** attempt) * (1 + random.random())
+            logger.warning(f"⚠️ Transient Neo4j error, retrying in {delay:.2f}s "
+                           f"({attempt + 1}/{max_retries}): {e}")
+            time.sleep(delay)
+
+
+class BatchWriter:
+    """Groups write statements into managed transactions.
+
+    Statements are queued with add() and committed batch_size at a time in
+    one execute_write transaction, retried as a whole on transient errors.
+    Retrying is safe because a failed transaction is rolled back entirely
+    and every statement queued here (MERGE/SET, and the DELETE / DETACH
+    DELETE of pruned files) is idempotent when re-run.
+    Batches commit in the order statements were added, even with several
+    threads adding, so a statement can rely on nodes created by earlier
+    ones. Use as a context manager to flush the remainder on exit.
+    """
+
+    def __init__(self, driver, batch_size: int = 200, max_retries: int = 5, backoff: float = 0.2):
+        self.driver = driver
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pending: List[Tuple[str, Dict]] = []
+        self.statements = 0
+        self.transactions = 0
+        self._lock = Lock()  # guards pending
+        self._commit_lock = Lock()  # keeps batches in order
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, query: str, **params):
+        with self._lock:
+            self.pending.append((query, params))
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._commit_lock:
+            with self._lock:
+                batch, self.pending = self.pending, []
+            if batch:
+                self.commit(batch)
+
+    def commit(self, batch: List[Tuple[str, Dict]]):
+        """Run the statements in a single write transaction, with retry"""
+        def work(tx):
+            for query, params in batch:
+                tx.run(query, **params).consume()
+
+        def attempt():
+            with self.driver.session() as session:
+                session.execute_write(work)
+
+        run_with_retry(attempt, self.max_retries, self.backoff)
+        self.statements += len(batch)
+        self.transactions += 1
@@ -1,23 +1,25 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
 class BlastRadiusAnalyzer:
-    def __init__(self, dependency_mapper, graph_db):
+    def __init__(self, dependency_mapper, graph_db, call_reachability=None):
         self.dependency_mapper = dependency_mapper
         self.graph_db = graph_db
+        # Callable returning the repo's CallReachability (or None)
+        self.call_reachability = call_reachability
     
-    def _normalize_file_path(self, file_path: str) -> str:
-        """Normalize file path for consistent Neo4j matching.
+    def _normalize_file_path(self, file_path: str, repo_id: str = None) -> str:
+        """Normalize file path for consistent store lookups.
         
         Returns both the resolved path and a forward-slash variant
         for cross-platform ENDS WITH matching.
         """
-        # Try Neo4j-based resolution first
+        # Try the repo's path index / Neo4j-based resolution first
         if hasattr(self.graph_db, 'resolve_file_path'):
-            resolved = self.graph_db.resolve_file_path(file_path)
+            resolved = self.graph_db.resolve_file_path(file_path, repo_id)
             if resolved != file_path:
                 return resolved
         
@@ -35,16 +37,13 @@ class BlastRadiusAnalyzer:
             file_path: Target file path
             change_type: "delete", "modify", or "move"
         """
-        # Normalize file path at entry point for consistent matching
-        resolved_path = self._normalize_file_path(file_path)
-        # Also keep a forward-slash variant for ENDS WITH matching
-        file_path_fwd = file_path.replace('\\', '/')
+        # Resolve to the stored path once so every query is an index lookup
+        resolved_path = self._normalize_file_path(file_path, repo_id)
         
-        direct = self._get_direct_dependents(resolved_path, file_path_fwd, repo_id)
-        indirect = self._get_indirect_dependents(resolved_path, file_path_fwd, direct, repo_id)
+        direct, indirect = self._get_dependents(resolved_path)
         
         # Get function-level impact
-        function_impact = self._get_function_impact(resolved_path, file_path_fwd, repo_id)
+        function_impact = self._get_function_impact(resolved_path, repo_id)
         
         # Calculate impact based on change type
         if change_type == "delete":
@@ -70,7 +69,8 @@ class BlastRadiusAnalyzer:
             "impact_breakdown": {
                 "direct_count": len(direct),
                 "indirect_count": len(indirect),
-                "function_callers": len(function_impact.get("callers", []))
+                "function_callers": len(function_impact.get("callers", [])),
+                "transitive_callers": len(function_impact.get("transitive_callers", []))
             }
         }
     
@@ -97,106 +97,51 @@ class BlastRadiusAnalyzer:
             logger.warning(f"Could not compute structural risk: {e}")
             return {'score': 0, 'level': 'unknown', 'fan_in': 0, 'fan_out': 0, 'in_cycle': False, 'breakdown': {}}
     
-    def _get_direct_dependents(self, file_path: str, file_path_fwd: str = None, repo_id: str = None) -> Set[str]:
-        """Files that directly import/depend on this file"""
-        direct = set()
-        if not file_path_fwd:
-            file_path_fwd = file_path.replace('\\', '/')
-        
-        # Use Neo4j DEPENDS_ON relationships
-        # Query: Find files that DEPEND ON the target file
-        with self.graph_db.driver.session() as session:
-            result = session.run("""
-                MATCH (target:File)
-                WHERE target.file_path = $file_path OR target.path = $file_path
-                   OR target.file_path ENDS WITH $file_path OR target.path ENDS WITH $file_path
-                   OR target.path_normalized ENDS WITH $file_path_fwd
-                MATCH (source:File)-[:DEPENDS_ON]->(target)
-                WHERE source <> target
-                RETURN DISTINCT COALESCE(source.file_path, source.path) as dependent
-                """, file_path=file_path, file_path_fwd=file_path_fwd)
-            
-            for record in result:
-                if record['dependent']:
-                    direct.add(record['dependent'])
-        
-        return direct
-    
-    def _get_indirect_dependents(self, file_path: str, file_path_fwd: str = None, direct: Set[str] = None, repo_id: str = None) -> Set[str]:
+    def _get_dependents(self, file_path: str) -> Tuple[Set[str], Set[str]]:
         """
-        Files that transitively depend on this file
+        Files that import/depend on this file: directly, and through 2-3 hops
         
         Note: Limited to 2-3 hops for performance and relevance.
         Deeper dependencies (4+ hops) are considered too distant to be critical.
         """
-        if direct is None:
-            direct = set()
-        if not file_path_fwd:
-            file_path_fwd = file_path.replace('\\', '/')
-        indirect = set()
-        
-        # Use Neo4j path queries for transitive dependencies
-        # Query: Find files that depend on target through 2-3 hops
-        with self.graph_db.driver.session() as session:
-            result = session.run("""
-                MATCH (target:File)
-                WHERE target.file_path = $file_path OR target.path = $file_path
-                   OR target.file_path ENDS WITH $file_path OR target.path ENDS WITH $file_path
-                   OR target.path_normalized ENDS WITH $file_path_fwd
-                MATCH (source:File)
-                WHERE source <> target
-                MATCH path = (source)-[:DEPENDS_ON*2..3]->(target)
-                RETURN DISTINCT COALESCE(source.file_path, source.path) as dependent
-                """, file_path=file_path, file_path_fwd=file_path_fwd)
-            
-            for record in result:
-                dep = record['dependent']
-                if dep and dep not in direct:
-                    indirect.add(dep)
-        
-        return indirect
+        dependents = self.graph_db.get_dependents(file_path, max_hops=3)
+        direct = {dep for dep, hops in dependents.items() if hops == 1}
+        indirect = {dep for dep, hops in dependents.items() if hops > 1}
+        return direct, indirect
     
-    def _get_function_impact(self, file_path: str, file_path_fwd: str = None, repo_id: str = None) -> Dict:
-        """Get functions in this file and their callers (excluding self-calls)"""
-        if not file_path_fwd:
-            file_path_fwd = file_path.replace('\\', '/')
+    def _get_function_impact(self, file_path: str, repo_id: str = None) -> Dict:
+        """Get functions in this file and their callers (excluding self-calls).
         
-        with self.graph_db.driver.session() as session:
-            if repo_id:
-                result = session.run("""
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)-[:CONTAINS]->(fn:Function)
-                    WHERE f.file_path = $file_path OR f.path = $file_path
-                       OR f.path_normalized ENDS WITH $file_path_fwd
-                    OPTIONAL MATCH (caller:File)-[:CALLS]->(fn)
-                    WHERE (r)-[:CONTAINS]->(caller) AND caller <> f
-                    RETURN fn.name as function, COLLECT(DISTINCT COALESCE(caller.file_path, caller.path)) as callers
-                    """, repo_id=repo_id, file_path=file_path, file_path_fwd=file_path_fwd)
-            else:
-                result = session.run("""
-                    MATCH (f:File)-[:CONTAINS]->(fn:Function)
-                    WHERE f.file_path = $file_path OR f.path = $file_path
-                       OR f.path_normalized ENDS WITH $file_path_fwd
-                    OPTIONAL MATCH (caller:File)-[:CALLS]->(fn)
-                    WHERE caller <> f
-                    RETURN fn.name as function, COLLECT(DISTINCT COALESCE(caller.file_path, caller.path)) as callers
-                    """, file_path=file_path, file_path_fwd=file_path_fwd)
-            
-            functions = []
-            all_callers = set()
-            for record in result:
-                callers = [c for c in record["callers"] if c]
-                functions.append({
-                    "name": record["function"],
-                    "callers": callers,
-                    "caller_count": len(callers)
-                })
-                all_callers.update(callers)
-            
-            return {
-                "functions": functions,
-                "callers": list(all_callers),
-                "total_functions": len(functions)
-            }
+        Files reaching a function only through longer call chains come from
+        the in-memory CallReachability, as transitive_callers.
+        """
+        functions = []
+        all_callers = set()
+        for name, callers in self.graph_db.get_file_function_callers(file_path, repo_id).items():
+            functions.append({
+                "name": name,
+                "callers": callers,
+                "caller_count": len(callers)
+            })
+            all_callers.update(callers)
+        
+        reachability = self.call_reachability() if self.call_reachability else None
+        transitive = set()
+        if reachability is not None:
+            for function in functions:
+                callers = {
+                    caller_file for caller_file, _ in reachability.callers((file_path, function["name"]))
+                    if caller_file != file_path and caller_file not in all_callers
+                }
+                function["transitive_callers"] = sorted(callers)
+                transitive.update(callers)
+        
+        return {
+            "functions": functions,
+            "callers": list(all_callers),
+            "transitive_callers": sorted(transitive),
+            "total_functions": len(functions)
+        }
     
     def _assess_delete_risk(self, file_path: str, direct: Set[str], function_impact: Dict) -> Dict:
         """
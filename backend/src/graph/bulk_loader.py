@@ -0,0 +1,168 @@
+import csv
+import logging
+import shutil
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (file name, header). Paths are normalized the same way GraphDB normalizes them.
+TABLES = {
+    'files': ('files.csv', ['path', 'path_normalized', 'language', 'content_hash', 'extractor_version']),
+    'classes': ('classes.csv', ['file', 'name', 'line']),
+    'functions': ('functions.csv', ['file', 'name', 'line']),
+    'imports': ('imports.csv', ['file', 'module']),
+    'depends_on': ('depends_on.csv', ['source', 'target']),
+    'calls': ('calls.csv', ['file', 'target_file', 'callee']),
+    'function_calls': ('function_calls.csv', ['file', 'caller', 'target_file', 'callee']),
+}
+
+# Load order matters: relationships MATCH the nodes loaded before them
+LOAD_STATEMENTS: List[Tuple[str, str]] = [
+    ('files', """
+        MERGE (f:File {path: row.path})
+        SET f.language = row.language,
+            f.file_path = row.path,
+            f.content_hash = row.content_hash,
+            f.extractor_version = row.extractor_version,
+            f.path_normalized = row.path_normalized
+        WITH f
+        MATCH (r:Repository {repo_id: $repo_id})
+        MERGE (r)-[:CONTAINS]->(f)
+    """),
+    ('classes', """
+        MATCH (f:File {path: row.file})
+        MERGE (c:Class {name: row.name, file: row.file})
+        SET c.line = toInteger(row.line)
+        MERGE (f)-[:CONTAINS]->(c)
+    """),
+    ('functions', """
+        MATCH (f:File {path: row.file})
+        MERGE (fn:Function {name: row.name, file: row.file})
+        SET fn.line = toInteger(row.line)
+        MERGE (f)-[:CONTAINS]->(fn)
+    """),
+    ('imports', """
+        MATCH (f:File {path: row.file})
+        MERGE (m:Module {name: row.module})
+        MERGE (f)-[:IMPORTS]->(m)
+    """),
+    ('depends_on', """
+        MATCH (source:File {path: row.source})
+        MATCH (target:File {path: row.target})
+        MERGE (source)-[:DEPENDS_ON]->(target)
+    """),
+    ('calls', """
+        MATCH (f:File {path: row.file})
+        MATCH (fn:Function {name: row.callee, file: row.target_file})
+        MERGE (f)-[:CALLS]->(fn)
+    """),
+    ('function_calls', """
+        MATCH (caller:Function {name: row.caller, file: row.file})
+        MATCH (callee:Function {name: row.callee, file: row.target_file})
+        MERGE (caller)-[:CALLS]->(callee)
+    """),
+]
+
+
+class CSVBulkLoader:
+    """Offline bulk load of a freshly cleared repository graph.
+
+    Rows are streamed to CSV files in a directory Neo4j can read (its
+    `import` directory, or any directory `LOAD CSV` is allowed to access),
+    then each table is loaded with `LOAD CSV ... CALL { } IN TRANSACTIONS`,
+    which commits every `batch_size` rows. Only meant for the initial load:
+    afterwards the graph is updated through GraphDB as usual.
+    """
+
+    def __init__(self, graph_db, import_dir: str, url_prefix: str = "file:///",
+                 batch_size: int = 10000, subdir: str = "bulk"):
+        self.graph_db = graph_db
+        self.batch_size = int(batch_size)
+        self.directory = Path(import_dir) / subdir
+        self.url_prefix = url_prefix + subdir if url_prefix.endswith('/') else f"{url_prefix}/{subdir}"
+        self.counts = {table: 0 for table in TABLES}
+        self._lock = Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._handles = {}
+        self._writers = {}
+        try:
+            for table, (file_name, header) in TABLES.items():
+                handle = open(self.directory / file_name, 'w', newline='', encoding='utf-8')
+                self._handles[table] = handle
+                self._writers[table] = csv.writer(handle)
+                self._writers[table].writerow(header)
+        except BaseException:
+            self.cleanup()  # close what was opened and drop the directory
+            raise
+
+    def _write(self, table: str, rows: Iterable[List]):
+        with self._lock:
+            writer = self._writers[table]
+            for row in rows:
+                writer.writerow(row)
+                self.counts[table] += 1
+
+    def add_parsed(self, parsed: Dict, extractor_version: str = None):
+        """Queue a parsed file's File, Class, Function and Module rows"""
+        path = self.graph_db._normalize_path(parsed['file'])
+        self._write('files', [[path, path.replace('\\', '/'), parsed['language'],
+                               parsed.get('content_hash'), extractor_version]])
+        self._write('classes', ([path, c['name'], c['line']] for c in parsed.get('classes', [])))
+        self._write('functions', ([path, f['name'], f['line']] for f in parsed.get('functions', [])))
+        self._write('imports', ([path, imp] for imp in parsed.get('imports', [])))
+
+    def add_dependencies(self, edges: Iterable[Tuple[str, str]]):
+        """Queue resolved file-to-file DEPENDS_ON edges"""
+        normalize = self.graph_db._path_normalizer()
+        self._write('depends_on', ([normalize(source), normalize(target)] for source, target in edges))
+
+    def add_calls(self, file_calls, function_calls):
+        """Queue SymbolTable.resolve_calls() output"""
+        normalize = self.graph_db._path_normalizer()
+        self._write('calls', (
+            [normalize(file), normalize(target_file), callee]
+            for file, target_file, callee in file_calls
+        ))
+        self._write('function_calls', (
+            [normalize(file), caller, normalize(target_file), callee]
+            for file, caller, target_file, callee in function_calls
+        ))
+
+    def load(self, repo_id: str) -> Dict[str, int]:
+        """Close the CSV files and LOAD CSV every table; returns rows per table"""
+        self._close()
+        start = time.perf_counter()
+        with self.graph_db.driver.session() as session:
+            for table, body in LOAD_STATEMENTS:
+                if not self.counts[table]:
+                    continue
+                table_start = time.perf_counter()
+                # IN TRANSACTIONS needs an auto-commit transaction: session.run
+                session.run(
+                    f"""
+                    LOAD CSV WITH HEADERS FROM $url AS row
+                    CALL {{
+                        WITH row
+                        {body}
+                    }} IN TRANSACTIONS OF {self.batch_size} ROWS
+                    """,
+                    url=f"{self.url_prefix}/{TABLES[table][0]}",
+                    repo_id=repo_id
+                ).consume()
+                logger.info(f"   📥 Loaded {self.counts[table]} {table} rows "
+                            f"in {time.perf_counter() - table_start:.1f}s")
+        logger.info(f"   ✅ Bulk load finished in {time.perf_counter() - start:.1f}s")
+        return dict(self.counts)
+
+    def _close(self):
+        for handle in self._handles.values():
+            if not handle.closed:
+                handle.close()
+
+    def cleanup(self):
+        """Remove the CSV files"""
+        self._close()
+        shutil.rmtree(self.directory, ignore_errors=True)
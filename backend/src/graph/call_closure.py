@@ -0,0 +1,163 @@
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+import networkx as nx
+
+
+class CallReachability:
+    """Transitive calls of a call graph, computed with integer bitsets.
+
+    reach[v] has bit u set when function u is reachable from v through a
+    call chain of 2..max_depth calls (max_depth <= 0: any length), the
+    pairs the old `MATCH (a)-[:CALLS*2..5]->(c)` query produced.
+
+    Unbounded closure condenses strongly connected components (every
+    function of a cycle reaches the whole cycle) and ORs successor sets in
+    reverse topological order: one pass over the condensed edges. A depth
+    cap takes that path too when the graph has no cycles and no chain
+    longer than the cap; otherwise it propagates walks one hop per round,
+    stopping early once the walk sets stop changing.
+
+    reach_rev is the transpose (bit v of reach_rev[u] set when v reaches u),
+    so callers() is one lookup like reachable(). Both hold up to N^2 bits;
+    callers beyond a size limit use GraphCallReachability instead.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[Hashable, Hashable]], max_depth: int = 5):
+        self.max_depth = max_depth
+        self.nodes: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        successors: List[set] = []
+        for caller, callee in edges:
+            a, b = self._node(caller, successors), self._node(callee, successors)
+            successors[a].add(b)
+        self.successors = [sorted(s) for s in successors]
+        self.succ_bits = [self._bits(s) for s in self.successors]
+        self.reach = self._compute()
+        self.reach_rev = self._transpose()
+
+    def _node(self, node: Hashable, successors: List[set]) -> int:
+        i = self.index.get(node)
+        if i is None:
+            i = self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+            successors.append(set())
+        return i
+
+    @staticmethod
+    def _bits(indices: Iterable[int]) -> int:
+        # Set in a byte buffer: OR-ing one bit at a time into an int copies it each time
+        indices = list(indices)
+        if not indices:
+            return 0
+        buffer = bytearray((max(indices) >> 3) + 1)
+        for i in indices:
+            buffer[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buffer, 'little')
+
+    def _compute(self) -> List[int]:
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(len(self.nodes)))
+        graph.add_edges_from((a, b) for a, succ in enumerate(self.successors) for b in succ)
+        condensed = nx.condensation(graph)
+        cyclic = any(len(condensed.nodes[c]['members']) > 1 for c in condensed) or \
+            any(a in succ for a, succ in enumerate(self.successors))
+        if self.max_depth <= 0 or (not cyclic and nx.dag_longest_path_length(condensed) <= self.max_depth):
+            return self._closure(condensed)
+        return self._bounded()
+
+    def _closure(self, condensed: nx.DiGraph) -> List[int]:
+        """Any-length closure over the SCC condensation"""
+        # reach_plus[c]: functions reachable from component c in one or more calls
+        reach_plus: Dict[int, int] = {}
+        for c in reversed(list(nx.topological_sort(condensed))):
+            members = condensed.nodes[c]['members']
+            bits = 0
+            for d in condensed.successors(c):
+                bits |= reach_plus[d] | self._bits(condensed.nodes[d]['members'])
+            if len(members) > 1 or any(m in self.successors[m] for m in members):
+                bits |= self._bits(members)
+            reach_plus[c] = bits
+        mapping = condensed.graph['mapping']
+        plus = [reach_plus[mapping[v]] for v in range(len(self.nodes))]
+        # Two or more calls: whatever the direct callees reach in one or more
+        reach = []
+        for succ in self.successors:
+            bits = 0
+            for u in succ:
+                bits |= plus[u]
+            reach.append(bits)
+        return reach
+
+    def _bounded(self) -> List[int]:
+        """Walks of 2..max_depth calls, one hop per round"""
+        walks = list(self.succ_bits)  # exactly k calls away, k = 1
+        reach = [0] * len(self.nodes)
+        for _ in range(2, self.max_depth + 1):
+            previous, walks = walks, [self._union(walks, succ) for succ in self.successors]
+            for v, bits in enumerate(walks):
+                reach[v] |= bits
+            if walks == previous or not any(walks):
+                break  # every later round would add the same sets again
+        return reach
+
+    def _transpose(self) -> List[int]:
+        callers: List[List[int]] = [[] for _ in self.nodes]
+        for v, bits in enumerate(self.reach):
+            for u in self._members(bits):
+                callers[u].append(v)
+        return [self._bits(c) for c in callers]
+
+    @staticmethod
+    def _union(sets: List[int], indices: List[int]) -> int:
+        bits = 0
+        for i in indices:
+            bits |= sets[i]
+        return bits
+
+    def __len__(self) -> int:
+        return sum(bin(bits).count('1') for bits in self.reach)
+
+    def reachable(self, node: Hashable) -> List[Hashable]:
+        """Functions node reaches transitively (2..max_depth calls)"""
+        i = self.index.get(node)
+        if i is None:
+            return []
+        return [self.nodes[j] for j in self._members(self.reach[i])]
+
+    def callers(self, node: Hashable) -> List[Hashable]:
+        """Functions reaching node transitively (2..max_depth calls)"""
+        i = self.index.get(node)
+        if i is None:
+            return []
+        return [self.nodes[v] for v in self._members(self.reach_rev[i])]
+
+    def pairs(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        for i, bits in enumerate(self.reach):
+            for j in self._members(bits):
+                yield self.nodes[i], self.nodes[j]
+
+    @staticmethod
+    def _members(bits: int) -> Iterator[int]:
+        # Scanning the binary digits is linear; clearing the low bit of a
+        # large int one member at a time would copy it for every member
+        digits = bin(bits)[:1:-1]  # least significant first
+        i = digits.find('1')
+        while i >= 0:
+            yield i
+            i = digits.find('1', i + 1)
+
+
+class GraphCallReachability:
+    """callers() answered by depth-bounded queries on the stored CALLS edges.
+
+    Stands in for CallReachability when a repo has too many functions to
+    hold its transitive calls as bitsets (transitive_call_max_functions).
+    """
+
+    def __init__(self, graph_db, repo_id: str, max_depth: int = 5):
+        self.graph_db = graph_db
+        self.repo_id = repo_id
+        self.max_depth = max_depth
+
+    def callers(self, node: Tuple[str, str]) -> List[Tuple[str, str]]:
+        """Functions reaching node transitively (2..max_depth calls)"""
+        return self.graph_db.get_transitive_callers(node, self.repo_id, self.max_depth)
@@ -1,6 +1,7 @@
 from typing import Dict, List
 from pathlib import Path
 import networkx as nx
+from .import_resolver import ImportResolver
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,34 +9,18 @@ logger = logging.getLogger(__name__)
 class DependencyMapper:
     def __init__(self):
         self.graph = nx.DiGraph()
+        self.import_resolver = ImportResolver([])
     
     def build_graph(self, parsed_files: List[Dict]):
         # First pass: Add all files as nodes
-        file_map = {}  # Map module paths to file paths
         for file_data in parsed_files:
             file_path = file_data['file']
-            self.graph.add_node(file_path, **file_data)
-            
-            # Build module-to-file mapping
-            path_obj = Path(file_path)
-            filename = path_obj.stem  # filename without extension
-            
-            # Map: filename → file_path
-            file_map[filename] = file_path
-            
-            # Map: ./filename → file_path (relative imports)
-            file_map[f'./{filename}'] = file_path
-            file_map[f'../{filename}'] = file_path
-            
-            # Map: full relative path from repo root
-            parts = path_obj.parts
-            if len(parts) >= 2:
-                # Get last 2-3 parts for matching
-                for i in range(max(0, len(parts)-3), len(parts)):
-                    rel_path = '/'.join(parts[i:]).replace('.py', '').replace('.js', '').replace('.java', '')
-                    file_map[rel_path] = file_path
+            # Only the language is kept on the node; copying every parsed
+            # symbol onto the graph doubled peak memory on large repositories
+            self.graph.add_node(file_path, language=file_data.get('language'))
         
-        logger.info(f"   📋 Built module map with {len(file_map)} entries")
+        resolver = self.import_resolver = ImportResolver(file_data['file'] for file_data in parsed_files)
+        logger.info(f"   📋 Built module index with {len(resolver)} entries")
         
         # Second pass: Create edges based on imports
         edge_count = 0
@@ -43,18 +28,7 @@ class DependencyMapper:
             file_path = file_data['file']
             
             for imp in file_data.get('imports', []):
-                # Try to resolve import to actual file
-                target_file = None
-                
-                # Direct match
-                if imp in file_map:
-                    target_file = file_map[imp]
-                else:
-                    # Try partial matches
-                    for module_key, module_file in file_map.items():
-                        if imp.endswith(module_key) or module_key.endswith(imp):
-                            target_file = module_file
-                            break
+                target_file = resolver.resolve(imp, file_path)
                 
                 if target_file and target_file != file_path:
                     self.graph.add_edge(file_path, target_file, type='imports')
@@ -66,6 +40,13 @@ class DependencyMapper:
         logger.info(f"   🔗 Created {edge_count} file-to-file dependencies")
         logger.info(f"   📊 Graph: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
     
+    def file_dependencies(self) -> List[tuple]:
+        """Resolved file-to-file edges (source, target); external modules excluded"""
+        return [
+            (source, target) for source, target, edge_type in self.graph.edges(data='type')
+            if edge_type == 'imports'
+        ]
+    
     def detect_cycles(self) -> List[List[str]]:
         try:
             cycles = list(nx.simple_cycles(self.graph))
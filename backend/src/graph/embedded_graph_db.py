@@ -0,0 +1,579 @@
+import json
+import logging
+import sqlite3
+from threading import RLock
+from typing import Dict, Iterable, List, Set, Tuple
+from .graph_store import GraphStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, language TEXT, content_hash TEXT, extractor_version TEXT, path_normalized TEXT
+);
+CREATE TABLE IF NOT EXISTS repo_files (
+    repo_id TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (repo_id, path)
+);
+CREATE INDEX IF NOT EXISTS repo_files_path ON repo_files (path);
+CREATE TABLE IF NOT EXISTS classes (
+    name TEXT NOT NULL, file TEXT NOT NULL, line INTEGER, PRIMARY KEY (name, file)
+);
+CREATE INDEX IF NOT EXISTS classes_file ON classes (file);
+CREATE TABLE IF NOT EXISTS functions (
+    name TEXT NOT NULL, file TEXT NOT NULL, line INTEGER, PRIMARY KEY (name, file)
+);
+CREATE INDEX IF NOT EXISTS functions_file ON functions (file);
+CREATE TABLE IF NOT EXISTS imports (
+    file TEXT NOT NULL, module TEXT NOT NULL, PRIMARY KEY (file, module)
+);
+CREATE TABLE IF NOT EXISTS depends_on (
+    source TEXT NOT NULL, target TEXT NOT NULL, PRIMARY KEY (source, target)
+);
+CREATE INDEX IF NOT EXISTS depends_on_target ON depends_on (target);
+CREATE TABLE IF NOT EXISTS file_calls (
+    file TEXT NOT NULL, target_file TEXT NOT NULL, callee TEXT NOT NULL,
+    PRIMARY KEY (file, target_file, callee)
+);
+CREATE INDEX IF NOT EXISTS file_calls_callee ON file_calls (callee, target_file);
+CREATE TABLE IF NOT EXISTS function_calls (
+    file TEXT NOT NULL, caller TEXT NOT NULL, target_file TEXT NOT NULL, callee TEXT NOT NULL,
+    PRIMARY KEY (file, caller, target_file, callee)
+);
+CREATE INDEX IF NOT EXISTS function_calls_callee ON function_calls (callee, target_file);
+CREATE TABLE IF NOT EXISTS transitive_calls (
+    file TEXT NOT NULL, caller TEXT NOT NULL, target_file TEXT NOT NULL, callee TEXT NOT NULL,
+    PRIMARY KEY (file, caller, target_file, callee)
+);
+CREATE INDEX IF NOT EXISTS transitive_calls_callee ON transitive_calls (callee, target_file);
+CREATE TABLE IF NOT EXISTS snapshot_files (
+    snapshot_id TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (snapshot_id, path)
+);
+CREATE INDEX IF NOT EXISTS snapshot_files_path ON snapshot_files (path);
+"""
+
+TABLES = ['files', 'repo_files', 'classes', 'functions', 'imports',
+          'depends_on', 'file_calls', 'function_calls', 'transitive_calls', 'snapshot_files']
+
+# Edges only link stored endpoints, as MATCH does in the Neo4j statements
+FILE_EXISTS = "EXISTS (SELECT 1 FROM files WHERE path = {})"
+FUNCTION_EXISTS = "EXISTS (SELECT 1 FROM functions WHERE name = {} AND file = {})"
+
+STORED_EDGE_QUERIES = {
+    'depends_on': """
+        SELECT d.source, d.target FROM depends_on d
+        JOIN repo_files r ON r.path = d.source WHERE r.repo_id = ?
+    """,
+    'file_calls': """
+        SELECT c.file, c.target_file, c.callee FROM file_calls c
+        JOIN repo_files r ON r.path = c.file WHERE r.repo_id = ?
+    """,
+    'function_calls': """
+        SELECT c.file, c.caller, c.target_file, c.callee FROM function_calls c
+        JOIN repo_files r ON r.path = c.file WHERE r.repo_id = ?
+    """,
+    'transitive_calls': """
+        SELECT c.file, c.caller, c.target_file, c.callee FROM transitive_calls c
+        JOIN repo_files r ON r.path = c.file WHERE r.repo_id = ?
+    """,
+}
+DELETE_EDGE_QUERIES = {
+    'depends_on': "DELETE FROM depends_on WHERE source = :source AND target = :target",
+    'file_calls': "DELETE FROM file_calls WHERE file = :file AND target_file = :target_file AND callee = :callee",
+    'function_calls': "DELETE FROM function_calls WHERE file = :file AND caller = :caller "
+                      "AND target_file = :target_file AND callee = :callee",
+    'transitive_calls': "DELETE FROM transitive_calls WHERE file = :file AND caller = :caller "
+                        "AND target_file = :target_file AND callee = :callee",
+}
+
+
+class SQLiteBatchWriter:
+    """BatchWriter counterpart for EmbeddedGraphDB: queued statements are
+    committed batch_size at a time in one SQLite transaction."""
+
+    def __init__(self, store: 'EmbeddedGraphDB', batch_size: int = 200):
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.pending: List[Tuple[str, List[Dict]]] = []
+        self.statements = 0
+        self.transactions = 0
+        self._lock = RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, sql: str, rows: List[Dict]):
+        with self._lock:
+            self.pending.append((sql, rows))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self.pending = self.pending, []
+            if batch:
+                self.store._execute(batch)
+                self.statements += len(batch)
+                self.transactions += 1
+
+
+class EmbeddedGraphDB(GraphStore):
+    """GraphStore in process: SQLite tables plus in-memory adjacency.
+
+    The tables are the source of truth. File-level adjacency (imports,
+    DEPENDS_ON both ways, repository membership) is loaded into dicts on
+    the first read after a write, so dependency and blast-radius reads
+    are dictionary lookups instead of round trips to a server.
+
+    Covers the GraphStore interface only: commits, versions and snapshots
+    are still kept in Neo4j by VersionTracker, which links them to files
+    here through snapshot_files.
+    """
+
+    def __init__(self, path: str = ':memory:', write_batch_size: int = 200):
+        super().__init__()
+        self.path = path
+        self.write_batch_size = write_batch_size
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = RLock()  # one connection, shared by pipeline threads
+        self._adjacency = None
+        logger.info(f"🗃️ Embedded graph store at {path}")
+
+    def close(self):
+        self.conn.close()
+
+    def clear_database(self):
+        self._execute([(f"DELETE FROM {table}", [{}]) for table in TABLES])
+
+    def batch_writer(self, batch_size: int = None) -> SQLiteBatchWriter:
+        return SQLiteBatchWriter(self, batch_size or self.write_batch_size)
+
+    def _execute(self, statements: List[Tuple[str, List[Dict]]]) -> int:
+        """Run (sql, rows) statements in one transaction and invalidate the adjacency.
+        Returns the number of rows they inserted, updated or deleted."""
+        with self._lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN")
+            try:
+                for sql, rows in statements:
+                    self.conn.executemany(sql, rows)
+                self.conn.execute("COMMIT")
+                return self.conn.total_changes - before
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._adjacency = None
+
+    def _write(self, sql: str, rows: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        if not rows:
+            return 0
+        if writer is not None:
+            writer.add(sql, rows)
+            return len(rows)  # not run yet
+        return self._execute([(sql, rows)])
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _adjacent(self) -> Dict:
+        """File-level adjacency, rebuilt from the tables after writes"""
+        with self._lock:
+            if self._adjacency is None:
+                adjacency = {'depends_on': {}, 'dependents': {}, 'imports': {}, 'repo_files': {}}
+                for source, target in self.conn.execute("SELECT source, target FROM depends_on"):
+                    adjacency['depends_on'].setdefault(source, set()).add(target)
+                    adjacency['dependents'].setdefault(target, set()).add(source)
+                for file, module in self.conn.execute("SELECT file, module FROM imports"):
+                    adjacency['imports'].setdefault(file, set()).add(module)
+                for repo_id, path in self.conn.execute("SELECT repo_id, path FROM repo_files"):
+                    adjacency['repo_files'].setdefault(repo_id, set()).add(path)
+                self._adjacency = adjacency
+            return self._adjacency
+
+    def bulk_create_files(self, files: List[Dict], repo_id: str = None, writer: SQLiteBatchWriter = None) -> int:
+        rows = []
+        for row in files:
+            if not row.get('path'):
+                logger.warning("Attempted to create File node with empty path, skipping")
+                continue
+            normalized_path = self._normalize_path(row['path'])
+            rows.append({
+                'path': normalized_path,
+                'language': row.get('language'),
+                'hash': row.get('content_hash'),
+                'extractor_version': row.get('extractor_version'),
+                'path_suffix': normalized_path.replace('\\', '/'),
+                'repo_id': repo_id
+            })
+        count = self._write(
+            """
+            INSERT INTO files (path, language, content_hash, extractor_version, path_normalized)
+            VALUES (:path, :language, :hash, :extractor_version, :path_suffix)
+            ON CONFLICT (path) DO UPDATE SET language = excluded.language,
+                content_hash = excluded.content_hash, extractor_version = excluded.extractor_version,
+                path_normalized = excluded.path_normalized
+            """,
+            rows, writer
+        )
+        if repo_id:
+            self._write("INSERT OR IGNORE INTO repo_files (repo_id, path) VALUES (:repo_id, :path)", rows, writer)
+        return count
+
+    def _create_members(self, table: str, members: List[Dict], writer: SQLiteBatchWriter) -> int:
+        rows = [{'file': self._normalize_path(m['file']), 'name': m['name'], 'line': m['line']} for m in members]
+        return self._write(
+            f"""
+            INSERT INTO {table} (name, file, line)
+            SELECT :name, :file, :line WHERE {FILE_EXISTS.format(':file')}
+            ON CONFLICT (name, file) DO UPDATE SET line = excluded.line
+            """,
+            rows, writer
+        )
+
+    def bulk_create_classes(self, classes: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        return self._create_members('classes', classes, writer)
+
+    def bulk_create_functions(self, functions: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        return self._create_members('functions', functions, writer)
+
+    def bulk_create_imports(self, imports: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        rows = [{'file': self._normalize_path(row['file']), 'module': row['module']} for row in imports]
+        return self._write(
+            f"""
+            INSERT OR IGNORE INTO imports (file, module)
+            SELECT :file, :module WHERE {FILE_EXISTS.format(':file')}
+            """,
+            rows, writer
+        )
+
+    def bulk_create_dependencies(self, edges: List[tuple], writer: SQLiteBatchWriter = None) -> int:
+        normalize = self._path_normalizer()
+        rows = [
+            {'source': normalize(source), 'target': normalize(target)}
+            for source, target in edges if source != target
+        ]
+        return self._write(
+            f"""
+            INSERT OR IGNORE INTO depends_on (source, target)
+            SELECT :source, :target
+            WHERE {FILE_EXISTS.format(':source')} AND {FILE_EXISTS.format(':target')}
+            """,
+            rows, writer
+        )
+
+    def bulk_create_function_calls(self, calls: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(c['file']), 'target_file': normalize(c['target_file']),
+             'callee': c['callee']}
+            for c in calls
+        ]
+        return self._write(
+            f"""
+            INSERT OR IGNORE INTO file_calls (file, target_file, callee)
+            SELECT :file, :target_file, :callee
+            WHERE {FILE_EXISTS.format(':file')} AND {FUNCTION_EXISTS.format(':callee', ':target_file')}
+            """,
+            rows, writer
+        )
+
+    def _create_function_edges(self, table: str, rows: List[Dict], writer: SQLiteBatchWriter) -> int:
+        return self._write(
+            f"""
+            INSERT OR IGNORE INTO {table} (file, caller, target_file, callee)
+            SELECT :file, :caller, :target_file, :callee
+            WHERE {FUNCTION_EXISTS.format(':caller', ':file')}
+              AND {FUNCTION_EXISTS.format(':callee', ':target_file')}
+            """,
+            rows, writer
+        )
+
+    def bulk_create_function_to_function_calls(self, calls: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(c['file']), 'caller': c['caller'],
+             'target_file': normalize(c['target_file']), 'callee': c['callee']}
+            for c in calls
+        ]
+        return self._create_function_edges('function_calls', rows, writer)
+
+    def bulk_create_transitive_calls(self, pairs: Iterable[tuple], writer: SQLiteBatchWriter = None) -> int:
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(caller[0]), 'caller': caller[1],
+             'target_file': normalize(callee[0]), 'callee': callee[1]}
+            for caller, callee in pairs
+        ]
+        return self._create_function_edges('transitive_calls', rows, writer)
+
+    def bulk_prune_files(self, files: List[Dict], writer: SQLiteBatchWriter = None) -> int:
+        rows = [
+            {'path': self._normalize_path(f['path']),
+             'classes': json.dumps(list(f['classes'])), 'functions': json.dumps(list(f['functions']))}
+            for f in files
+        ]
+        stale = "{} NOT IN (SELECT value FROM json_each(:functions))"
+        for table in ('function_calls', 'transitive_calls'):
+            self._write(
+                f"DELETE FROM {table} WHERE (file = :path AND {stale.format('caller')}) "
+                f"OR (target_file = :path AND {stale.format('callee')})",
+                rows, writer
+            )
+        self._write(f"DELETE FROM file_calls WHERE target_file = :path AND {stale.format('callee')}", rows, writer)
+        self._write(f"DELETE FROM functions WHERE file = :path AND {stale.format('name')}", rows, writer)
+        self._write("DELETE FROM classes WHERE file = :path "
+                    "AND name NOT IN (SELECT value FROM json_each(:classes))", rows, writer)
+        self._write("DELETE FROM imports WHERE file = :path", rows, writer)
+        return len(rows)
+
+    def bulk_delete_files(self, paths: Iterable[str], writer: SQLiteBatchWriter = None) -> int:
+        rows = [{'path': self._normalize_path(path)} for path in paths]
+        for sql in (
+            "DELETE FROM depends_on WHERE source = :path OR target = :path",
+            "DELETE FROM file_calls WHERE file = :path OR target_file = :path",
+            "DELETE FROM function_calls WHERE file = :path OR target_file = :path",
+            "DELETE FROM transitive_calls WHERE file = :path OR target_file = :path",
+            "DELETE FROM classes WHERE file = :path",
+            "DELETE FROM functions WHERE file = :path",
+            "DELETE FROM imports WHERE file = :path",
+            "DELETE FROM repo_files WHERE path = :path",
+            "DELETE FROM snapshot_files WHERE path = :path",
+        ):
+            self._write(sql, rows, writer)
+        return self._write("DELETE FROM files WHERE path = :path", rows, writer)
+
+    def delete_orphan_modules(self) -> int:
+        return 0  # modules only exist as import rows
+
+    def _stored_edges(self, repo_id: str, kind: str) -> Set[tuple]:
+        return set(self._query(STORED_EDGE_QUERIES[kind], (repo_id,)))
+
+    def _delete_edges(self, kind: str, rows: List[Dict]) -> int:
+        return self._write(DELETE_EDGE_QUERIES[kind], rows)
+
+    def get_file_hashes(self, repo_id: str) -> Dict[str, Tuple[str, str]]:
+        return {
+            path: (content_hash, extractor_version)
+            for path, content_hash, extractor_version in self._query(
+                "SELECT f.path, f.content_hash, f.extractor_version FROM files f "
+                "JOIN repo_files r ON r.path = f.path WHERE r.repo_id = ?",
+                (repo_id,)
+            )
+        }
+
+    def get_function_call_edges(self, repo_id: str) -> List[tuple]:
+        return [
+            ((file, caller), (target_file, callee))
+            for file, caller, target_file, callee in self._stored_edges(repo_id, 'function_calls')
+        ]
+
+    def get_transitive_callers(self, function: tuple, repo_id: str, max_depth: int = 5) -> List[tuple]:
+        # Walk CALLS backwards from the direct callers' callers; the depth
+        # column bounds the walk (and is left out when unbounded, so cycles end)
+        depth, next_depth, bound = ("", "", "") if max_depth <= 0 else (
+            ", 2", ", w.depth + 1", "WHERE w.depth < :max_depth"
+        )
+        columns = "file, name, depth" if max_depth > 0 else "file, name"
+        return self._query(
+            f"""
+            WITH RECURSIVE walk({columns}) AS (
+                SELECT c.file, c.caller{depth} FROM function_calls c
+                JOIN function_calls d ON c.target_file = d.file AND c.callee = d.caller
+                WHERE d.target_file = :file AND d.callee = :name
+                UNION
+                SELECT c.file, c.caller{next_depth} FROM walk w
+                JOIN function_calls c ON c.target_file = w.file AND c.callee = w.name
+                {bound}
+            )
+            SELECT DISTINCT w.file, w.name FROM walk w
+            JOIN repo_files r ON r.path = w.file AND r.repo_id = :repo_id
+            ORDER BY w.file, w.name
+            """,
+            {'file': function[0], 'name': function[1], 'repo_id': repo_id, 'max_depth': max_depth}
+        )
+
+    def get_dependencies(self, file_path: str, repo_id: str = None) -> List[str]:
+        path = self.resolve_file_path(file_path, repo_id)
+        adjacency = self._adjacent()
+        return sorted(adjacency['imports'].get(path, ())) + sorted(adjacency['depends_on'].get(path, ()))
+
+    def get_affected_files(self, file_path: str, repo_id: str = None) -> List[str]:
+        path = self.resolve_file_path(file_path, repo_id)
+        dependents = self._adjacent()['dependents']
+        # Files reaching path in 1..3 DEPENDS_ON hops (path itself if on a short cycle)
+        affected, frontier = set(), {path}
+        for _ in range(3):
+            frontier = {f for target in frontier for f in dependents.get(target, ())}
+            affected |= frontier
+        return sorted(affected)
+
+    def get_dependents(self, file_path: str, max_hops: int = 3) -> Dict[str, int]:
+        dependents = self._adjacent()['dependents']
+        hops, frontier = {}, {file_path}
+        for hop in range(1, max_hops + 1):
+            frontier = {f for target in frontier for f in dependents.get(target, ())
+                        if f not in hops and f != file_path}
+            hops.update(dict.fromkeys(frontier, hop))
+        return hops
+
+    def get_file_function_callers(self, file_path: str, repo_id: str = None) -> Dict[str, List[str]]:
+        in_repo = "AND c.file IN (SELECT path FROM repo_files WHERE repo_id = :repo_id)" if repo_id else ""
+        callers: Dict[str, List[str]] = {}
+        for name, caller in self._query(
+            f"""
+            SELECT fn.name, c.file FROM functions fn
+            LEFT JOIN file_calls c ON c.callee = fn.name AND c.target_file = fn.file
+                AND c.file <> fn.file {in_repo}
+            WHERE fn.file = :path
+            ORDER BY fn.line, fn.name, c.file
+            """,
+            {'path': file_path, 'repo_id': repo_id}
+        ):
+            callers.setdefault(name, [])
+            if caller:
+                callers[name].append(caller)
+        return callers
+
+    def get_file_summaries(self, repo_id: str) -> List[Dict]:
+        adjacency = self._adjacent()
+        members = {'classes': {}, 'functions': {}}
+        for table, names in members.items():
+            for file, name in self._query(
+                f"SELECT t.file, t.name FROM {table} t JOIN repo_files r ON r.path = t.file WHERE r.repo_id = ?",
+                (repo_id,)
+            ):
+                names.setdefault(file, []).append(name)
+        return [
+            {
+                'file': path,
+                'language': language,
+                'imports': sorted(adjacency['imports'].get(path, ())),
+                'dependencies': sorted(adjacency['depends_on'].get(path, ())),
+                'classes': members['classes'].get(path, []),
+                'functions': members['functions'].get(path, []),
+            }
+            for path, language in self._query(
+                "SELECT f.path, f.language FROM files f JOIN repo_files r ON r.path = f.path "
+                "WHERE r.repo_id = ? ORDER BY f.path",
+                (repo_id,)
+            )
+        ]
+
+    def get_all_files(self, repo_id: str = None) -> List[str]:
+        if repo_id:
+            return sorted(self._adjacent()['repo_files'].get(repo_id, ()))
+        return [path for (path,) in self._query("SELECT path FROM files ORDER BY path")]
+
+    def get_all_functions(self, repo_id: str = None) -> List[Dict]:
+        if repo_id:
+            rows = self._query(
+                "SELECT fn.name, fn.file, fn.line FROM functions fn "
+                "JOIN repo_files r ON r.path = fn.file WHERE r.repo_id = ? ORDER BY fn.name",
+                (repo_id,)
+            )
+        else:
+            rows = self._query("SELECT name, file, line FROM functions ORDER BY name")
+        return [{'name': name, 'file': file, 'line': line} for name, file, line in rows]
+
+    def get_function_info(self, function_name: str) -> Dict:
+        rows = self._query("SELECT name, file, line FROM functions WHERE name = ? LIMIT 1", (function_name,))
+        return {'name': rows[0][0], 'file': rows[0][1], 'line': rows[0][2]} if rows else None
+
+    def get_function_callers(self, function_name: str, repo_id: str = None) -> List[Dict]:
+        params = {'name': function_name, 'repo_id': repo_id}
+        in_repo = ("AND c.file IN (SELECT path FROM repo_files WHERE repo_id = :repo_id) "
+                   "AND c.target_file IN (SELECT path FROM repo_files WHERE repo_id = :repo_id)") if repo_id else ""
+        file_rows = self._query(f"SELECT DISTINCT c.file FROM file_calls c WHERE c.callee = :name {in_repo}", params)
+        func_rows = self._query(
+            f"""
+            SELECT DISTINCT c.file, c.caller, fn.line FROM function_calls c
+            JOIN functions fn ON fn.name = c.caller AND fn.file = c.file
+            WHERE c.callee = :name {in_repo}
+            """,
+            params
+        )
+        # Function-level callers are more specific than file-level ones
+        return self._merge_callers(
+            [{'file': file, 'caller_name': caller, 'line': line} for file, caller, line in func_rows],
+            [{'file': file} for (file,) in file_rows]
+        )
+    
+    def get_graph_data(self, repo_id: str = None) -> Dict:
+        adjacency = self._adjacent()
+        if repo_id:
+            files = adjacency['repo_files'].get(repo_id, set())
+        else:
+            files = {path for (path,) in self._query("SELECT path FROM files")}
+
+        def node(path):
+            parts = path.replace('\\', '/').split('/')
+            return {'id': path, 'label': '/'.join(parts[-2:]) if len(parts) >= 2 else parts[-1]}
+
+        nodes, edges, seen = [], [], set()
+        for path in sorted(files):
+            if path not in seen:
+                nodes.append(node(path))
+                seen.add(path)
+            for target in sorted(adjacency['depends_on'].get(path, ())):
+                if repo_id and target not in files:
+                    continue
+                if target not in seen:
+                    nodes.append(node(target))
+                    seen.add(target)
+                edges.append({'source': path, 'target': target, 'type': 'DEPENDS_ON'})
+        return {'nodes': nodes, 'edges': edges}
+
+    def find_dependency_cycle(self, max_hops: int = 5) -> str:
+        depends_on = self._adjacent()['depends_on']
+        for start in sorted(depends_on):
+            seen, frontier = set(), {start}
+            for _ in range(max_hops):
+                frontier = {t for f in frontier for t in depends_on.get(f, ())} - seen
+                if start in frontier:
+                    return start
+                seen |= frontier
+        return None
+
+    def link_snapshot_files(self, repo_id: str, snapshot_id: str) -> int:
+        return self._write(
+            "INSERT OR IGNORE INTO snapshot_files (snapshot_id, path) "
+            "SELECT :snapshot_id, path FROM repo_files WHERE repo_id = :repo_id",
+            [{'snapshot_id': snapshot_id, 'repo_id': repo_id}]
+        )
+
+    def get_snapshot_files(self, snapshot_id: str) -> List[Dict]:
+        return [
+            {'path': path, 'hash': content_hash}
+            for path, content_hash in self._query(
+                "SELECT f.path, f.content_hash FROM snapshot_files s JOIN files f ON f.path = s.path "
+                "WHERE s.snapshot_id = ? ORDER BY f.path",
+                (snapshot_id,)
+            )
+        ]
+
+    def count_snapshot_files(self, snapshot_id: str) -> int:
+        return self._query("SELECT COUNT(*) FROM snapshot_files WHERE snapshot_id = ?", (snapshot_id,))[0][0]
+
+    def unlink_snapshot_files(self, snapshot_id: str) -> int:
+        return self._write("DELETE FROM snapshot_files WHERE snapshot_id = :snapshot_id",
+                           [{'snapshot_id': snapshot_id}])
+
+    def _query_file_path(self, file_path: str) -> str:
+        """Same strategies as GraphDB: exact path, then path suffix, then filename"""
+        suffix_fwd = self._get_path_suffix(file_path).replace('\\', '/')
+        filename = '/' + file_path.replace('\\', '/').rsplit('/', 1)[-1]
+        rows = self._query("SELECT path FROM files WHERE path = ?", (file_path,))
+        for value in (suffix_fwd, filename):
+            if rows:
+                break
+            rows = self._query(
+                "SELECT path FROM files WHERE substr(path_normalized, -length(?1)) = ?1 LIMIT 1", (value,)
+            )
+        return rows[0][0] if rows else None
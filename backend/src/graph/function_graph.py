@@ -4,211 +4,88 @@ import logging
 logger = logging.getLogger(__name__)
 
 class FunctionGraphBuilder:
+    """Function call graphs for visualization, read from a GraphStore.
+
+    Call edges are stored per repository, so both views need a repo_id;
+    without one they are empty.
+    """
     def __init__(self, graph_db):
         self.graph_db = graph_db
-    
+
     def get_function_graph_data(self, repo_id: str = None) -> Dict:
         """Get function nodes and call relationships for visualization"""
-        with self.graph_db.driver.session() as session:
-            if repo_id:
-                result = session.run(
-                    """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(file:File)-[:CONTAINS]->(fn:Function)
-                    OPTIONAL MATCH (caller_file:File)-[:CALLS]->(fn)
-                    WHERE (r)-[:CONTAINS]->(caller_file)
-                    OPTIONAL MATCH (r)-[:CONTAINS]->(:File)-[:CONTAINS]->(caller_fn:Function)-[:CALLS]->(fn)
-                    OPTIONAL MATCH (fn)-[:CALLS]->(callee_fn:Function)<-[:CONTAINS]-(:File)<-[:CONTAINS]-(r)
-                    OPTIONAL MATCH (callee_fn)<-[:CONTAINS]-(callee_file:File)
-                    WITH fn, file,
-                         COLLECT(DISTINCT caller_file) as caller_files,
-                         COLLECT(DISTINCT caller_fn) as caller_functions,
-                         COLLECT(DISTINCT {func: callee_fn, file: callee_file}) as called_functions
-                    RETURN fn.name as name, 
-                           COALESCE(file.path, file.file_path) as file, 
-                           fn.line as line,
-                           [cf IN caller_files WHERE cf IS NOT NULL | COALESCE(cf.path, cf.file_path)] as file_callers,
-                           [cfn IN caller_functions WHERE cfn IS NOT NULL | {name: cfn.name, file: COALESCE(cfn.file, 'unknown')}] as function_callers,
-                           [cf IN called_functions WHERE cf.func IS NOT NULL | {name: cf.func.name, file: COALESCE(cf.func.file, COALESCE(cf.file.path, cf.file.file_path, 'unknown'))}] as function_callees
-                    """,
-                    repo_id=repo_id
-                )
-            else:
-                result = session.run(
-                    """
-                    MATCH (file:File)-[:CONTAINS]->(fn:Function)
-                    OPTIONAL MATCH (caller_file:File)-[:CALLS]->(fn)
-                    OPTIONAL MATCH (:File)-[:CONTAINS]->(caller_fn:Function)-[:CALLS]->(fn)
-                    OPTIONAL MATCH (fn)-[:CALLS]->(callee_fn:Function)<-[:CONTAINS]-(callee_file:File)
-                    WITH fn, file,
-                         COLLECT(DISTINCT caller_file) as caller_files,
-                         COLLECT(DISTINCT caller_fn) as caller_functions,
-                         COLLECT(DISTINCT {func: callee_fn, file: callee_file}) as called_functions
-                    RETURN fn.name as name, 
-                           COALESCE(file.path, file.file_path) as file, 
-                           fn.line as line,
-                           [cf IN caller_files WHERE cf IS NOT NULL | COALESCE(cf.path, cf.file_path)] as file_callers,
-                           [cfn IN caller_functions WHERE cfn IS NOT NULL | {name: cfn.name, file: COALESCE(cfn.file, 'unknown')}] as function_callers,
-                           [cf IN called_functions WHERE cf.func IS NOT NULL | {name: cf.func.name, file: COALESCE(cf.func.file, COALESCE(cf.file.path, cf.file.file_path, 'unknown'))}] as function_callees
-                    """
-                )
-            
-            nodes = []
-            edges = []
-            seen_nodes = set()
-            seen_edges = set()
-            
-            for record in result:
-                func_name = record['name']
-                file_path = record['file']
-                
-                # Skip if function has no file (orphaned)
-                if not func_name or not file_path:
-                    logger.warning(f"Skipping orphaned function: {func_name} (no file)")
-                    continue
-                
-                node_id = f"{file_path}::{func_name}"
-                
-                if node_id not in seen_nodes:
-                    nodes.append({
-                        'id': node_id,
-                        'label': func_name,
-                        'file': file_path,
-                        'line': record['line'],
-                        'type': 'function'
-                    })
-                    seen_nodes.add(node_id)
-                
-                # File-to-function calls (incoming)
-                for caller_file in record['file_callers']:
-                    if caller_file:
-                        caller_id = caller_file
-                        if caller_id not in seen_nodes:
-                            file_label = caller_file.replace('\\', '/').split('/')[-1]
-                            nodes.append({
-                                'id': caller_id,
-                                'label': file_label,
-                                'file': caller_file,
-                                'type': 'file'
-                            })
-                            seen_nodes.add(caller_id)
-                        
-                        edge_key = (caller_id, node_id)
-                        if edge_key not in seen_edges:
-                            edges.append({
-                                'source': caller_id,
-                                'target': node_id,
-                                'type': 'calls'
-                            })
-                            seen_edges.add(edge_key)
-                
-                # Function-to-function calls (incoming — who calls this function)
-                for caller_fn in record['function_callers']:
-                    if caller_fn and caller_fn.get('name') and caller_fn.get('file'):
-                        caller_id = f"{caller_fn['file']}::{caller_fn['name']}"
-                        if caller_id not in seen_nodes:
-                            nodes.append({
-                                'id': caller_id,
-                                'label': caller_fn['name'],
-                                'file': caller_fn['file'],
-                                'type': 'function'
-                            })
-                            seen_nodes.add(caller_id)
-                        
-                        edge_key = (caller_id, node_id)
-                        if edge_key not in seen_edges:
-                            edges.append({
-                                'source': caller_id,
-                                'target': node_id,
-                                'type': 'calls'
-                            })
-                            seen_edges.add(edge_key)
-                
-                # Function-to-function calls (outgoing — what this function calls)
-                for callee_fn in record.get('function_callees', []):
-                    if callee_fn and callee_fn.get('name') and callee_fn.get('file'):
-                        callee_id = f"{callee_fn['file']}::{callee_fn['name']}"
-                        if callee_id not in seen_nodes:
-                            nodes.append({
-                                'id': callee_id,
-                                'label': callee_fn['name'],
-                                'file': callee_fn['file'],
-                                'type': 'function'
-                            })
-                            seen_nodes.add(callee_id)
-                        
-                        edge_key = (node_id, callee_id)
-                        if edge_key not in seen_edges:
-                            edges.append({
-                                'source': node_id,
-                                'target': callee_id,
-                                'type': 'calls'
-                            })
-                            seen_edges.add(edge_key)
-            
-            return {'nodes': nodes, 'edges': edges}
-    
+        graph = _CallGraph()
+        if not repo_id:
+            return graph.data()
+
+        functions = set()
+        for fn in self.graph_db.get_all_functions(repo_id):
+            # Skip if function has no file (orphaned)
+            if not fn['name'] or not fn['file']:
+                logger.warning(f"Skipping orphaned function: {fn['name']} (no file)")
+                continue
+            graph.function(fn['file'], fn['name'], fn['line'])
+            functions.add((fn['file'], fn['name']))
+
+        # File-to-function calls, then function-to-function calls, within the repo
+        for caller_file, callee in self.graph_db.get_file_call_edges(repo_id):
+            if callee in functions:
+                graph.edge(graph.file(caller_file), graph.function(*callee))
+        for caller, callee in self.graph_db.get_function_call_edges(repo_id):
+            if caller in functions and callee in functions:
+                graph.edge(graph.function(*caller), graph.function(*callee))
+
+        return graph.data()
+
     def get_function_call_chain(self, function_name: str, repo_id: str = None, depth: int = 3) -> Dict:
         """Get call chain for a specific function"""
-        with self.graph_db.driver.session() as session:
-            if repo_id:
-                result = session.run(
-                    """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(file:File)-[:CONTAINS]->(target:Function {name: $name})
-                    OPTIONAL MATCH (r)-[:CONTAINS]->(caller:File)-[:CALLS]->(target)
-                    WITH target, file, COLLECT(DISTINCT caller) as callers
-                    RETURN target.name as name, 
-                           COALESCE(file.path, file.file_path) as file,
-                           [c IN callers WHERE c IS NOT NULL | COALESCE(c.path, c.file_path)] as caller_paths
-                    """,
-                    repo_id=repo_id,
-                    name=function_name
-                )
-            else:
-                result = session.run(
-                    """
-                    MATCH (file:File)-[:CONTAINS]->(target:Function {name: $name})
-                    OPTIONAL MATCH (caller:File)-[:CALLS]->(target)
-                    WITH target, file, COLLECT(DISTINCT caller) as callers
-                    RETURN target.name as name, 
-                           COALESCE(file.path, file.file_path) as file,
-                           [c IN callers WHERE c IS NOT NULL | COALESCE(c.path, c.file_path)] as caller_paths
-                    """,
-                    name=function_name
-                )
-            
-            record = result.single()
-            if not record or not record['file']:
-                return {'nodes': [], 'edges': []}
-            
-            nodes = []
-            edges = []
-            seen = set()
-            
-            func_id = f"{record['file']}::{record['name']}"
-            nodes.append({
-                'id': func_id,
-                'label': record['name'],
-                'file': record['file'],
-                'type': 'function'
-            })
-            seen.add(func_id)
-            
-            for caller_path in record['caller_paths']:
-                if caller_path:
-                    if caller_path not in seen:
-                        file_label = caller_path.replace('\\', '/').split('/')[-1]
-                        nodes.append({
-                            'id': caller_path,
-                            'label': file_label,
-                            'file': caller_path,
-                            'type': 'file'
-                        })
-                        seen.add(caller_path)
-                    
-                    edges.append({
-                        'source': caller_path,
-                        'target': func_id,
-                        'type': 'calls'
-                    })
-            
-            return {'nodes': nodes, 'edges': edges}
+        graph = _CallGraph()
+        if not repo_id:
+            return graph.data()
+
+        target = next((fn for fn in self.graph_db.get_all_functions(repo_id)
+                       if fn['name'] == function_name and fn['file']), None)
+        if not target:
+            return graph.data()
+
+        func_id = graph.function(target['file'], target['name'])
+        # Files of the repo calling it
+        for caller_file, callee in sorted(self.graph_db.get_file_call_edges(repo_id)):
+            if callee == (target['file'], target['name']):
+                graph.edge(graph.file(caller_file), func_id)
+
+        return graph.data()
+
+
+class _CallGraph:
+    """Nodes and deduplicated 'calls' edges, in insertion order"""
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.edges: Dict[tuple, Dict] = {}
+
+    def function(self, file_path: str, name: str, line: int = None) -> str:
+        node_id = f"{file_path}::{name}"
+        if node_id not in self.nodes:
+            node = {'id': node_id, 'label': name, 'file': file_path}
+            if line is not None:
+                node['line'] = line
+            node['type'] = 'function'
+            self.nodes[node_id] = node
+        return node_id
+
+    def file(self, file_path: str) -> str:
+        if file_path not in self.nodes:
+            self.nodes[file_path] = {
+                'id': file_path,
+                'label': file_path.replace('\\', '/').split('/')[-1],
+                'file': file_path,
+                'type': 'file'
+            }
+        return file_path
+
+    def edge(self, source: str, target: str):
+        self.edges.setdefault((source, target), {'source': source, 'target': target, 'type': 'calls'})
+
+    def data(self) -> Dict[str, List[Dict]]:
+        return {'nodes': list(self.nodes.values()), 'edges': list(self.edges.values())}
@@ -1,12 +1,112 @@
 from neo4j import GraphDatabase
-from typing import Dict, List
+from typing import Dict, Iterable, List, Set, Tuple
 from pathlib import Path
 import logging
+from .schema import SchemaManager
+from .graph_store import EDGE_KEYS, GraphStore
+from .batch_writer import BatchWriter, run_with_retry
 
 logger = logging.getLogger(__name__)
 
-class GraphDB:
-    def __init__(self, uri: str, user: str, password: str):
+# Rows per UNWIND statement; keeps each transaction's memory bounded
+BULK_CHUNK_SIZE = 1000
+
+# resolve_file_path strategies, most precise first. Each is a single
+# predicate so it can be answered from one index (see schema.INDEXES).
+FILE_LOOKUPS = [
+    ('exact path', "MATCH (f:File {path: $value}) RETURN f.path as resolved_path LIMIT 1"),
+    ('exact file_path', "MATCH (f:File {file_path: $value}) WHERE f.path IS NOT NULL "
+                        "RETURN f.path as resolved_path LIMIT 1"),
+    ('path suffix', "MATCH (f:File) WHERE f.path_normalized ENDS WITH $value "
+                    "RETURN f.path as resolved_path LIMIT 1"),
+]
+
+# Read queries shared with AsyncGraphDB
+DEPENDENCIES_QUERY = """
+    MATCH (f:File {path: $path})
+    OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
+    OPTIONAL MATCH (f)-[:DEPENDS_ON]->(dep:File)
+    RETURN COLLECT(DISTINCT m.name) + COLLECT(DISTINCT dep.path) as dependencies
+"""
+REPO_FILES_QUERY = """
+    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+    WHERE f.path IS NOT NULL
+    RETURN f.path as path
+    ORDER BY f.path
+"""
+ALL_FILES_QUERY = """
+    MATCH (f:File)
+    WHERE f.path IS NOT NULL
+    RETURN f.path as path
+    ORDER BY f.path
+"""
+REPO_FUNCTIONS_QUERY = """
+    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)-[:CONTAINS]->(fn:Function)
+    RETURN fn.name as name, fn.file as file, fn.line as line
+    ORDER BY fn.name
+"""
+ALL_FUNCTIONS_QUERY = """
+    MATCH (fn:Function)
+    RETURN fn.name as name, fn.file as file, fn.line as line
+    ORDER BY fn.name
+"""
+
+# Per diff-synced edge kind (graph_store.EDGE_KEYS): a repo's stored edges,
+# and deleting edges given as UNWIND rows
+STORED_EDGE_QUERIES = {
+    'depends_on': """
+        MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(s:File)-[:DEPENDS_ON]->(t:File)
+        RETURN s.path as source, t.path as target
+    """,
+    'file_calls': """
+        MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)-[:CALLS]->(fn:Function)
+        RETURN f.path as file, fn.file as target_file, fn.name as callee
+    """,
+    'function_calls': """
+        MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(:File)-[:CONTAINS]->(a:Function)
+        MATCH (a)-[:CALLS]->(c:Function)
+        RETURN a.file as file, a.name as caller, c.file as target_file, c.name as callee
+    """,
+    'transitive_calls': """
+        MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(:File)-[:CONTAINS]->(a:Function)
+        MATCH (a)-[:CALLS_TRANSITIVE]->(c:Function)
+        RETURN a.file as file, a.name as caller, c.file as target_file, c.name as callee
+    """,
+}
+DELETE_EDGE_QUERIES = {
+    'depends_on': """
+        UNWIND $rows AS row
+        MATCH (:File {path: row.source})-[d:DEPENDS_ON]->(:File {path: row.target})
+        DELETE d
+        RETURN count(*) AS written
+    """,
+    'file_calls': """
+        UNWIND $rows AS row
+        MATCH (:File {path: row.file})-[c:CALLS]->(:Function {name: row.callee, file: row.target_file})
+        DELETE c
+        RETURN count(*) AS written
+    """,
+    'function_calls': """
+        UNWIND $rows AS row
+        MATCH (:Function {name: row.caller, file: row.file})-[c:CALLS]->(:Function {name: row.callee, file: row.target_file})
+        DELETE c
+        RETURN count(*) AS written
+    """,
+    'transitive_calls': """
+        UNWIND $rows AS row
+        MATCH (:Function {name: row.caller, file: row.file})-[t:CALLS_TRANSITIVE]->(:Function {name: row.callee, file: row.target_file})
+        DELETE t
+        RETURN count(*) AS written
+    """,
+}
+
+class GraphDB(GraphStore):
+    """GraphStore on a Neo4j server"""
+    
+    def __init__(self, uri: str, user: str, password: str, write_batch_size: int = 200,
+                 write_max_retries: int = 5, write_retry_backoff: float = 0.2,
+                 index_wait_timeout: float = 5.0):
+        super().__init__()
         logger.info(f"🔌 Attempting to connect to Neo4j at {uri}")
         logger.info(f"   User: {user}")
         try:
@@ -21,6 +121,13 @@ class GraphDB:
             logger.error(f"❌ Neo4j connection failed: {e}")
             logger.error("   Make sure Neo4j Desktop is running and database is started")
             raise
+        self.write_batch_size = write_batch_size
+        self.write_max_retries = write_max_retries
+        self.write_retry_backoff = write_retry_backoff
+        # Index creation is asynchronous; new indexes finish building in the
+        # background if they are not online within index_wait_timeout
+        self.schema = SchemaManager(self.driver)
+        self.schema.ensure(index_wait_timeout)
     
     def close(self):
         self.driver.close()
@@ -54,8 +161,7 @@ class GraphDB:
         with self.driver.session() as session:
             session.run(
                 """
-                MATCH (f:File)
-                WHERE f.path = $file_path OR f.file_path = $file_path
+                MATCH (f:File {path: $file_path})
                 MERGE (c:Class {name: $name, file: $file_path})
                 SET c.line = $line
                 MERGE (f)-[:CONTAINS]->(c)
@@ -72,8 +178,7 @@ class GraphDB:
                 session.run(
                     """
                     MATCH (r:Repository {repo_id: $repo_id})
-                    MATCH (f:File)
-                    WHERE f.path = $file_path OR f.file_path = $file_path
+                    MATCH (f:File {path: $file_path})
                     MERGE (r)-[:CONTAINS]->(f)
                     """,
                     repo_id=repo_id, file_path=normalized_path
@@ -81,8 +186,7 @@ class GraphDB:
                 # Then create function and link to file
                 session.run(
                     """
-                    MATCH (f:File)
-                    WHERE f.path = $file_path OR f.file_path = $file_path
+                    MATCH (f:File {path: $file_path})
                     MERGE (fn:Function {name: $name, file: $file_path})
                     SET fn.line = $line
                     MERGE (f)-[:CONTAINS]->(fn)
@@ -92,8 +196,7 @@ class GraphDB:
             else:
                 session.run(
                     """
-                    MATCH (f:File)
-                    WHERE f.path = $file_path OR f.file_path = $file_path
+                    MATCH (f:File {path: $file_path})
                     MERGE (fn:Function {name: $name, file: $file_path})
                     SET fn.line = $line
                     MERGE (f)-[:CONTAINS]->(fn)
@@ -104,52 +207,44 @@ class GraphDB:
     def create_import_relationship(self, from_file: str, to_module: str):
         # Normalize from_file path for matching
         normalized_from = self._normalize_path(from_file)
+        # File-to-file DEPENDS_ON edges come from DependencyMapper (bulk_create_dependencies)
         with self.driver.session() as session:
             session.run(
                 """
-                MATCH (f:File)
-                WHERE f.path = $from_file OR f.file_path = $from_file
+                MATCH (f:File {path: $from_file})
                 MERGE (m:Module {name: $to_module})
                 MERGE (f)-[:IMPORTS]->(m)
                 """,
                 from_file=normalized_from, to_module=to_module
             )
-            
-            # Build module path with both separators for cross-platform matching
-            module_parts_backslash = to_module.replace('.', '\\\\')
-            module_parts_forward = to_module.replace('.', '/')
-            module_name = to_module.split('.')[-1]
-            
-            session.run(
-                """
-                MATCH (f:File)
-                WHERE f.path = $from_file OR f.file_path = $from_file
-                MATCH (target:File)
-                WHERE target.path ENDS WITH $module_bs + '.py' 
-                   OR target.path ENDS WITH $module_bs + '.js'
-                   OR target.path ENDS WITH $module_fs + '.py'
-                   OR target.path ENDS WITH $module_fs + '.js'
-                   OR target.path ENDS WITH '\\\\' + $module_name + '.py'
-                   OR target.path ENDS WITH '\\\\' + $module_name + '.js'
-                   OR target.path ENDS WITH '/' + $module_name + '.py'
-                   OR target.path ENDS WITH '/' + $module_name + '.js'
-                MERGE (f)-[:DEPENDS_ON]->(target)
-                """,
-                from_file=normalized_from, 
-                module_bs=module_parts_backslash,
-                module_fs=module_parts_forward,
-                module_name=module_name
-            )
     
-    def create_function_call(self, from_file: str, called_function: str, repo_id: str = None):
-        """Create CALLS relationship between file and function within same repository"""
+    def create_function_call(self, from_file: str, called_function: str, repo_id: str = None, target_file: str = None):
+        """Create CALLS relationship between file and function within same repository.
+        
+        With target_file (a call resolved by SymbolTable) only the function
+        defined in that file is linked; otherwise every function with the name.
+        """
         normalized_from = self._normalize_path(from_file)
         with self.driver.session() as session:
-            if repo_id:
+            if target_file:
                 result = session.run(
                     """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
-                    WHERE f.path = $from_file OR f.file_path = $from_file
+                    MATCH (f:File {path: $from_file})
+                    MATCH (fn:Function {name: $called_function, file: $target_file})
+                    MERGE (f)-[:CALLS]->(fn)
+                    RETURN count(fn) as matched
+                    """,
+                    from_file=normalized_from,
+                    called_function=called_function,
+                    target_file=self._normalize_path(target_file)
+                )
+                record = result.single()
+                if record and record['matched'] > 0:
+                    logger.debug(f"✓ CALLS: {Path(from_file).name} -> {called_function}")
+            elif repo_id:
+                result = session.run(
+                    """
+                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File {path: $from_file})
                     MATCH (r)-[:CONTAINS]->(:File)-[:CONTAINS]->(fn:Function {name: $called_function})
                     MERGE (f)-[:CALLS]->(fn)
                     RETURN count(fn) as matched
@@ -164,8 +259,7 @@ class GraphDB:
             else:
                 result = session.run(
                     """
-                    MATCH (f:File)
-                    WHERE f.path = $from_file OR f.file_path = $from_file
+                    MATCH (f:File {path: $from_file})
                     MATCH (fn:Function {name: $called_function})
                     MERGE (f)-[:CALLS]->(fn)
                     RETURN count(fn) as matched
@@ -177,15 +271,31 @@ class GraphDB:
                 if record and record['matched'] > 0:
                     logger.debug(f"✓ CALLS: {Path(from_file).name} -> {called_function}")
     
-    def create_function_to_function_call(self, from_file: str, caller_func: str, callee_func: str, repo_id: str = None):
-        """Create CALLS relationship between two functions"""
+    def create_function_to_function_call(self, from_file: str, caller_func: str, callee_func: str,
+                                         repo_id: str = None, target_file: str = None):
+        """Create CALLS relationship between two functions (callee pinned to target_file if given)"""
         normalized_from = self._normalize_path(from_file)
         with self.driver.session() as session:
-            if repo_id:
+            if target_file:
                 result = session.run(
                     """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
-                    WHERE f.path = $from_file OR f.file_path = $from_file
+                    MATCH (caller:Function {name: $caller_func, file: $from_file})
+                    MATCH (callee:Function {name: $callee_func, file: $target_file})
+                    MERGE (caller)-[:CALLS]->(callee)
+                    RETURN count(callee) as matched
+                    """,
+                    from_file=normalized_from,
+                    caller_func=caller_func,
+                    callee_func=callee_func,
+                    target_file=self._normalize_path(target_file)
+                )
+                record = result.single()
+                if record and record['matched'] > 0:
+                    logger.debug(f"✓ {caller_func} -> {callee_func}")
+            elif repo_id:
+                result = session.run(
+                    """
+                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File {path: $from_file})
                     MATCH (f)-[:CONTAINS]->(caller:Function {name: $caller_func})
                     MATCH (r)-[:CONTAINS]->(:File)-[:CONTAINS]->(callee:Function {name: $callee_func})
                     MERGE (caller)-[:CALLS]->(callee)
@@ -202,8 +312,7 @@ class GraphDB:
             else:
                 result = session.run(
                     """
-                    MATCH (f:File)
-                    WHERE f.path = $from_file OR f.file_path = $from_file
+                    MATCH (f:File {path: $from_file})
                     MATCH (f)-[:CONTAINS]->(caller:Function {name: $caller_func})
                     MATCH (callee:Function {name: $callee_func})
                     MERGE (caller)-[:CALLS]->(callee)
@@ -217,76 +326,393 @@ class GraphDB:
                 if record and record['matched'] > 0:
                     logger.debug(f"✓ {caller_func} -> {callee_func}")
     
-    def create_transitive_function_calls(self, repo_id: str = None):
-        """Create transitive CALLS_TRANSITIVE relationships for function call chains"""
+    def batch_writer(self, batch_size: int = None) -> BatchWriter:
+        """BatchWriter committing batch_size statements per transaction (default write_batch_size)"""
+        return BatchWriter(
+            self.driver,
+            batch_size or self.write_batch_size,
+            self.write_max_retries,
+            self.write_retry_backoff
+        )
+    
+    def _write_chunks(self, query: str, rows: List[Dict], writer: BatchWriter = None, **params) -> int:
+        """Run an UNWIND $rows query over rows in chunks.
+        
+        Each chunk is its own write transaction, retried on transient errors,
+        unless a BatchWriter is given: then chunks are queued on it and
+        committed together with the writer's other statements.
+        
+        Returns the rows written: the query's `count(*) AS written` if it
+        returns one (rows whose MATCHes found their nodes), else all rows.
+        Queued rows are all counted, since they are not run yet.
+        """
+        if not rows:
+            return 0
+        chunks = [rows[start:start + BULK_CHUNK_SIZE] for start in range(0, len(rows), BULK_CHUNK_SIZE)]
+        if writer is not None:
+            for chunk in chunks:
+                writer.add(query, rows=chunk, **params)
+            return len(rows)
+        
+        def write(tx, chunk):
+            records = list(tx.run(query, rows=chunk, **params))
+            return records[0]['written'] if records else len(chunk)
+        
+        written = 0
         with self.driver.session() as session:
-            if repo_id:
-                # Create transitive relationships (depth 2-5)
-                result = session.run(
-                    """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(:File)-[:CONTAINS]->(a:Function)
-                    MATCH (a)-[:CALLS*2..5]->(c:Function)
-                    WHERE (r)-[:CONTAINS]->(:File)-[:CONTAINS]->(c)
-                    MERGE (a)-[:CALLS_TRANSITIVE]->(c)
-                    RETURN count(*) as created
-                    """,
-                    repo_id=repo_id
-                )
-                record = result.single()
-                return record['created'] if record else 0
-            else:
-                result = session.run(
-                    """
-                    MATCH (a:Function)-[:CALLS*2..5]->(c:Function)
-                    MERGE (a)-[:CALLS_TRANSITIVE]->(c)
-                    RETURN count(*) as created
-                    """
-                )
-                record = result.single()
-                return record['created'] if record else 0
+            for chunk in chunks:
+                written += run_with_retry(lambda: session.execute_write(write, chunk),
+                                          self.write_max_retries, self.write_retry_backoff)
+        return written
+    
+    def bulk_create_files(self, files: List[Dict], repo_id: str = None, writer: BatchWriter = None) -> int:
+        """Bulk create_file_node. Rows: {path, language, content_hash, extractor_version}"""
+        rows = []
+        for row in files:
+            if not row.get('path'):
+                logger.warning("Attempted to create File node with empty path, skipping")
+                continue
+            normalized_path = self._normalize_path(row['path'])
+            rows.append({
+                'path': normalized_path,
+                'language': row.get('language'),
+                'hash': row.get('content_hash'),
+                'extractor_version': row.get('extractor_version'),
+                'path_suffix': normalized_path.replace('\\', '/')
+            })
+        count = self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MERGE (f:File {path: row.path})
+            SET f.language = row.language,
+                f.file_path = row.path,
+                f.content_hash = row.hash,
+                f.extractor_version = row.extractor_version,
+                f.path_normalized = row.path_suffix
+            """,
+            rows, writer
+        )
+        if repo_id:
+            self._write_chunks(
+                """
+                MATCH (r:Repository {repo_id: $repo_id})
+                UNWIND $rows AS row
+                MATCH (f:File {path: row.path})
+                MERGE (r)-[:CONTAINS]->(f)
+                """,
+                rows, writer, repo_id=repo_id
+            )
+        return count
+    
+    def bulk_create_classes(self, classes: List[Dict], writer: BatchWriter = None) -> int:
+        """Bulk create_class_node. Rows: {file, name, line}"""
+        rows = [{'file': self._normalize_path(c['file']), 'name': c['name'], 'line': c['line']} for c in classes]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.file})
+            MERGE (c:Class {name: row.name, file: row.file})
+            SET c.line = row.line
+            MERGE (f)-[:CONTAINS]->(c)
+            """,
+            rows, writer
+        )
+    
+    def bulk_create_functions(self, functions: List[Dict], writer: BatchWriter = None) -> int:
+        """Bulk create_function_node. Rows: {file, name, line}"""
+        rows = [{'file': self._normalize_path(f['file']), 'name': f['name'], 'line': f['line']} for f in functions]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.file})
+            MERGE (fn:Function {name: row.name, file: row.file})
+            SET fn.line = row.line
+            MERGE (f)-[:CONTAINS]->(fn)
+            """,
+            rows, writer
+        )
     
-    def get_dependencies(self, file_path: str) -> List[str]:
-        normalized = self._normalize_path(file_path)
-        suffix = self._get_path_suffix(file_path)
-        suffix_fwd = suffix.replace('\\', '/')
+    def bulk_create_imports(self, imports: List[Dict], writer: BatchWriter = None) -> int:
+        """Bulk create_import_relationship. Rows: {file, module}"""
+        rows = [{'file': self._normalize_path(row['file']), 'module': row['module']} for row in imports]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.file})
+            MERGE (m:Module {name: row.module})
+            MERGE (f)-[:IMPORTS]->(m)
+            """,
+            rows, writer
+        )
+    
+    def bulk_create_dependencies(self, edges: List[tuple], writer: BatchWriter = None) -> int:
+        """DEPENDS_ON edges between stored files, matched by path. Edges: (source, target)"""
+        normalize = self._path_normalizer()
+        rows = [
+            {'source': normalize(source), 'target': normalize(target)}
+            for source, target in edges if source != target
+        ]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (source:File {path: row.source})
+            MATCH (target:File {path: row.target})
+            MERGE (source)-[:DEPENDS_ON]->(target)
+            RETURN count(*) AS written
+            """,
+            rows, writer
+        )
+    
+    def bulk_create_function_calls(self, calls: List[Dict], writer: BatchWriter = None) -> int:
+        """Bulk create_function_call for resolved calls. Rows: {file, target_file, callee}"""
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(c['file']), 'target_file': normalize(c['target_file']),
+             'callee': c['callee']}
+            for c in calls
+        ]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.file})
+            MATCH (fn:Function {name: row.callee, file: row.target_file})
+            MERGE (f)-[:CALLS]->(fn)
+            RETURN count(*) AS written
+            """,
+            rows, writer
+        )
+    
+    def bulk_create_function_to_function_calls(self, calls: List[Dict], writer: BatchWriter = None) -> int:
+        """Bulk create_function_to_function_call for resolved calls.
+        Rows: {file, caller, target_file, callee}"""
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(c['file']), 'caller': c['caller'],
+             'target_file': normalize(c['target_file']), 'callee': c['callee']}
+            for c in calls
+        ]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (caller:Function {name: row.caller, file: row.file})
+            MATCH (callee:Function {name: row.callee, file: row.target_file})
+            MERGE (caller)-[:CALLS]->(callee)
+            RETURN count(*) AS written
+            """,
+            rows, writer
+        )
+    
+    def bulk_create_transitive_calls(self, pairs: Iterable[tuple], writer: BatchWriter = None) -> int:
+        """CALLS_TRANSITIVE between functions. Pairs: ((file, name), (file, name))"""
+        normalize = self._path_normalizer()
+        rows = [
+            {'file': normalize(caller[0]), 'caller': caller[1],
+             'target_file': normalize(callee[0]), 'callee': callee[1]}
+            for caller, callee in pairs
+        ]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (a:Function {name: row.caller, file: row.file})
+            MATCH (c:Function {name: row.callee, file: row.target_file})
+            MERGE (a)-[:CALLS_TRANSITIVE]->(c)
+            RETURN count(*) AS written
+            """,
+            rows, writer
+        )
+    
+    def get_function_call_edges(self, repo_id: str) -> List[tuple]:
+        """Function-to-function CALLS of a repo as ((file, name), (file, name))"""
         with self.driver.session() as session:
             result = session.run(
                 """
-                MATCH (f:File)
-                WHERE f.path = $path OR f.file_path = $path
-                   OR f.path ENDS WITH $suffix OR f.path ENDS WITH $suffix_fwd
-                   OR f.path_normalized ENDS WITH $suffix_fwd
-                OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
-                OPTIONAL MATCH (f)-[:DEPENDS_ON]->(dep:File)
-                RETURN COLLECT(DISTINCT m.name) + COLLECT(DISTINCT dep.path) as dependencies
+                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(:File)-[:CONTAINS]->(a:Function)
+                MATCH (a)-[:CALLS]->(c:Function)
+                RETURN a.file as file, a.name as caller, c.file as target_file, c.name as callee
                 """,
-                path=normalized,
-                suffix=suffix,
-                suffix_fwd=suffix_fwd
+                repo_id=repo_id
             )
-            record = result.single()
+            return [((r['file'], r['caller']), (r['target_file'], r['callee'])) for r in result]
+    
+    def get_transitive_callers(self, function: tuple, repo_id: str, max_depth: int = 5) -> List[tuple]:
+        """Functions of a repo reaching function through 2..max_depth CALLS, as (file, name)"""
+        hops = f"2..{int(max_depth)}" if max_depth > 0 else "2.."
+        with self.driver.session() as session:
+            result = session.run(
+                f"""
+                MATCH (r:Repository {{repo_id: $repo_id}})-[:CONTAINS]->(:File)-[:CONTAINS]->(a:Function)
+                MATCH (a)-[:CALLS*{hops}]->(c:Function {{file: $file, name: $name}})
+                RETURN DISTINCT a.file as file, a.name as name
+                ORDER BY file, name
+                """,
+                repo_id=repo_id, file=function[0], name=function[1]
+            )
+            return [(record['file'], record['name']) for record in result]
+    
+    def get_file_hashes(self, repo_id: str) -> Dict[str, Tuple[str, str]]:
+        """Stored path -> (content_hash, extractor_version) of a repo's File nodes"""
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+                RETURN f.path as path, f.content_hash as hash, f.extractor_version as extractor_version
+                """,
+                repo_id=repo_id
+            )
+            return {
+                record['path']: (record['hash'], record['extractor_version'])
+                for record in result if record['path']
+            }
+    
+    def bulk_prune_files(self, files: List[Dict], writer: BatchWriter = None) -> int:
+        """Before rewriting modified files: drop the classes and functions they no
+        longer define, and all their IMPORTS. Rows: {path, classes, functions} (names)"""
+        rows = [
+            {'path': self._normalize_path(f['path']), 'classes': f['classes'], 'functions': f['functions']}
+            for f in files
+        ]
+        self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.path})-[:CONTAINS]->(n)
+            WHERE (n:Class AND NOT n.name IN row.classes) OR (n:Function AND NOT n.name IN row.functions)
+            DETACH DELETE n
+            """,
+            rows, writer
+        )
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.path})-[i:IMPORTS]->(:Module)
+            DELETE i
+            """,
+            rows, writer
+        )
+    
+    def bulk_delete_files(self, paths: Iterable[str], writer: BatchWriter = None) -> int:
+        """DETACH DELETE stored files with their classes and functions"""
+        rows = [{'path': self._normalize_path(path)} for path in paths]
+        return self._write_chunks(
+            """
+            UNWIND $rows AS row
+            MATCH (f:File {path: row.path})
+            FOREACH (n IN [(f)-[:CONTAINS]->(n) WHERE n:Class OR n:Function | n] | DETACH DELETE n)
+            DETACH DELETE f
+            """,
+            rows, writer
+        )
+    
+    def delete_orphan_modules(self) -> int:
+        """Delete Module nodes no file imports anymore"""
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (m:Module)
+                WHERE NOT (m)<-[:IMPORTS]-()
+                DELETE m
+                RETURN count(m) as deleted
+                """).single()
+            return record['deleted'] if record else 0
+    
+    def _stored_edges(self, repo_id: str, kind: str) -> Set[tuple]:
+        keys = EDGE_KEYS[kind]
+        with self.driver.session() as session:
+            result = session.run(STORED_EDGE_QUERIES[kind], repo_id=repo_id)
+            return {tuple(record[k] for k in keys) for record in result}
+    
+    def _delete_edges(self, kind: str, rows: List[Dict]) -> int:
+        return self._write_chunks(DELETE_EDGE_QUERIES[kind], rows)
+    
+    def get_dependencies(self, file_path: str, repo_id: str = None) -> List[str]:
+        path = self.resolve_file_path(file_path, repo_id)
+        with self.driver.session() as session:
+            record = session.run(DEPENDENCIES_QUERY, path=path).single()
             return [d for d in record["dependencies"] if d] if record else []
     
-    def get_affected_files(self, file_path: str) -> List[str]:
-        normalized = self._normalize_path(file_path)
-        suffix = self._get_path_suffix(file_path)
-        suffix_fwd = suffix.replace('\\', '/')
+    def get_affected_files(self, file_path: str, repo_id: str = None) -> List[str]:
+        path = self.resolve_file_path(file_path, repo_id)
         with self.driver.session() as session:
             result = session.run(
                 """
-                MATCH (target:File)
-                WHERE target.path = $path OR target.file_path = $path
-                   OR target.path ENDS WITH $suffix OR target.path ENDS WITH $suffix_fwd
-                   OR target.path_normalized ENDS WITH $suffix_fwd
+                MATCH (target:File {path: $path})
                 MATCH (f:File)-[:DEPENDS_ON|IMPORTS*1..3]->(target)
                 RETURN DISTINCT f.path as path
                 """,
-                path=normalized,
-                suffix=suffix,
-                suffix_fwd=suffix_fwd
+                path=path
             )
             return [record["path"] for record in result]
     
+    def get_dependents(self, file_path: str, max_hops: int = 3) -> Dict[str, int]:
+        with self.driver.session() as session:
+            result = session.run(
+                f"""
+                MATCH (target:File {{path: $path}})
+                MATCH p = (source:File)-[:DEPENDS_ON*1..{int(max_hops)}]->(target)
+                WHERE source <> target
+                RETURN COALESCE(source.file_path, source.path) as dependent, min(length(p)) as hops
+                """,
+                path=file_path
+            )
+            return {record['dependent']: record['hops'] for record in result if record['dependent']}
+    
+    def get_file_function_callers(self, file_path: str, repo_id: str = None) -> Dict[str, List[str]]:
+        with self.driver.session() as session:
+            if repo_id:
+                result = session.run("""
+                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File {path: $file_path})-[:CONTAINS]->(fn:Function)
+                    OPTIONAL MATCH (caller:File)-[:CALLS]->(fn)
+                    WHERE (r)-[:CONTAINS]->(caller) AND caller <> f
+                    RETURN fn.name as function, COLLECT(DISTINCT COALESCE(caller.file_path, caller.path)) as callers
+                    """, repo_id=repo_id, file_path=file_path)
+            else:
+                result = session.run("""
+                    MATCH (f:File {path: $file_path})-[:CONTAINS]->(fn:Function)
+                    OPTIONAL MATCH (caller:File)-[:CALLS]->(fn)
+                    WHERE caller <> f
+                    RETURN fn.name as function, COLLECT(DISTINCT COALESCE(caller.file_path, caller.path)) as callers
+                    """, file_path=file_path)
+            return {record['function']: [c for c in record['callers'] if c] for record in result}
+    
+    def get_file_summaries(self, repo_id: str) -> List[Dict]:
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+                OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
+                OPTIONAL MATCH (f)-[:DEPENDS_ON]->(dep:File)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(cls:Class)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
+                RETURN COALESCE(f.file_path, f.path) as file,
+                       f.language as language,
+                       COLLECT(DISTINCT m.name) as imports,
+                       COLLECT(DISTINCT COALESCE(dep.file_path, dep.path)) as dependencies,
+                       COLLECT(DISTINCT cls.name) as classes,
+                       COLLECT(DISTINCT fn.name) as functions
+                """, repo_id=repo_id)
+            return [dict(record) for record in result]
+    
+    def clear_repo(self, repo_id: str) -> int:
+        """Delete a repo's File nodes with their classes, functions and modules,
+        and File nodes no repository contains anymore"""
+        self.drop_path_index(repo_id)
+        with self.driver.session() as session:
+            deleted = session.run("""
+                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
+                OPTIONAL MATCH (f)-[:IMPORTS]->(m:Module)
+                DETACH DELETE f, c, fn, m
+                RETURN count(DISTINCT f) as deleted
+                """, repo_id=repo_id).single()['deleted']
+            
+            # Clean up orphaned nodes (from deleted repos)
+            session.run("""
+                MATCH (f:File)
+                WHERE NOT (f)<-[:CONTAINS]-(:Repository)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(c:Class)
+                OPTIONAL MATCH (f)-[:CONTAINS]->(fn:Function)
+                DETACH DELETE f, c, fn
+                """)
+        return deleted
+    
     def debug_file(self, file_path: str) -> Dict:
         """Debug method to see what's stored for a file"""
         with self.driver.session() as session:
@@ -310,41 +736,18 @@ class GraphDB:
         """Get all file paths stored in graph, optionally filtered by repo"""
         with self.driver.session() as session:
             if repo_id:
-                result = session.run("""
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File) 
-                    WHERE f.path IS NOT NULL
-                    RETURN f.path as path 
-                    ORDER BY f.path
-                """, repo_id=repo_id)
+                result = session.run(REPO_FILES_QUERY, repo_id=repo_id)
             else:
-                result = session.run("""
-                    MATCH (f:File) 
-                    WHERE f.path IS NOT NULL
-                    RETURN f.path as path 
-                    ORDER BY f.path
-                """)
+                result = session.run(ALL_FILES_QUERY)
             return [record["path"] for record in result if record["path"]]
     
     def get_all_functions(self, repo_id: str = None) -> List[Dict]:
         """Get all functions with their file and line info, optionally filtered by repo"""
         with self.driver.session() as session:
             if repo_id:
-                result = session.run(
-                    """
-                    MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)-[:CONTAINS]->(fn:Function)
-                    RETURN fn.name as name, fn.file as file, fn.line as line
-                    ORDER BY fn.name
-                    """,
-                    repo_id=repo_id
-                )
+                result = session.run(REPO_FUNCTIONS_QUERY, repo_id=repo_id)
             else:
-                result = session.run(
-                    """
-                    MATCH (fn:Function)
-                    RETURN fn.name as name, fn.file as file, fn.line as line
-                    ORDER BY fn.name
-                    """
-                )
+                result = session.run(ALL_FUNCTIONS_QUERY)
             return [dict(record) for record in result]
     
     def get_function_info(self, function_name: str) -> Dict:
@@ -409,21 +812,8 @@ class GraphDB:
                 )
                 func_callers = [dict(record) for record in func_result]
             
-            # Merge results: function-level callers are more specific
-            # Deduplicate by file path, preferring function-level info
-            seen_files = set()
-            merged = []
-            for fc in func_callers:
-                key = (fc.get('file', ''), fc.get('caller_name', ''))
-                if key not in seen_files:
-                    seen_files.add(key)
-                    merged.append(fc)
-            for fc in file_callers:
-                file_key = fc.get('file', '')
-                if not any(file_key == m.get('file', '') for m in merged):
-                    merged.append(fc)
-            
-            return merged
+            # Function-level callers are more specific than file-level ones
+            return self._merge_callers(func_callers, file_callers)
     
     def get_graph_data(self, repo_id: str = None) -> Dict:
         """Get nodes and edges for graph visualization"""
@@ -489,59 +879,74 @@ class GraphDB:
             
             return {'nodes': nodes, 'edges': edges}
     
-    def _normalize_path(self, path: str) -> str:
-        """Normalize path for consistent matching"""
-        try:
-            resolved = str(Path(path).resolve())
-            return resolved
-        except:
-            return path
-    
-    def _get_path_suffix(self, path: str) -> str:
-        """Get path suffix for flexible matching (returns backslash-separated)"""
-        # Normalize separators first
-        normalized = path.replace('/', '\\')
-        parts = Path(normalized).parts
-        if len(parts) >= 3:
-            return str(Path(*parts[-3:]))
-        return str(Path(normalized).name)
-    
-    def resolve_file_path(self, file_path: str) -> str:
-        """Resolve a user-provided path to the actual path stored in Neo4j.
-        
-        Tries multiple matching strategies:
-        1. Exact match on path or file_path
-        2. ENDS WITH on the path suffix (backslash)
-        3. ENDS WITH on the path suffix (forward slash)
-        4. Filename-only match as last resort
+    def find_dependency_cycle(self, max_hops: int = 5) -> str:
+        """A file on a DEPENDS_ON cycle of at most max_hops edges, or None"""
+        with self.driver.session() as session:
+            record = session.run(f"""
+                MATCH (f1:File)-[:DEPENDS_ON*1..{int(max_hops)}]->(f2:File)
+                WHERE f1 = f2
+                RETURN DISTINCT f1.path as cycle_file
+                LIMIT 1
+                """).single()
+            return record['cycle_file'] if record else None
+    
+    def link_snapshot_files(self, repo_id: str, snapshot_id: str) -> int:
+        """MERGE ANALYZED_FILE from the Snapshot to every File of the repo"""
+        with self.driver.session() as session:
+            summary = session.run("""
+                MATCH (r:Repository {repo_id: $repo_id})-[:CONTAINS]->(f:File)
+                MATCH (s:Snapshot {snapshot_id: $snapshot_id})
+                MERGE (s)-[:ANALYZED_FILE]->(f)
+                """,
+                repo_id=repo_id,
+                snapshot_id=snapshot_id
+            ).consume()
+            return summary.counters.relationships_created
+    
+    def get_snapshot_files(self, snapshot_id: str) -> List[Dict]:
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (s:Snapshot {snapshot_id: $snapshot_id})-[:ANALYZED_FILE]->(f:File)
+                RETURN f.path as path, f.content_hash as hash
+                ORDER BY f.path
+                """, snapshot_id=snapshot_id)
+            return [dict(record) for record in result]
+    
+    def count_snapshot_files(self, snapshot_id: str) -> int:
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (s:Snapshot {snapshot_id: $snapshot_id})-[:ANALYZED_FILE]->(f:File)
+                RETURN count(f) as file_count
+                """, snapshot_id=snapshot_id).single()
+            return record['file_count'] if record else 0
+    
+    def unlink_snapshot_files(self, snapshot_id: str) -> int:
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (s:Snapshot {snapshot_id: $snapshot_id})-[a:ANALYZED_FILE]->()
+                DELETE a
+                RETURN count(a) as deleted
+                """, snapshot_id=snapshot_id).single()
+            return record['deleted'] if record else 0
+    
+    def _query_file_path(self, file_path: str) -> str:
+        """Stored path for file_path from the graph itself (FILE_LOOKUPS), or None
         
-        Returns the stored path or the original if no match found.
+        Strategies, each an index lookup:
+        1. Exact match on path, then on file_path
+        2. ENDS WITH on the forward-slash path suffix (last three parts)
+        3. Filename-only match as last resort
         """
-        suffix = self._get_path_suffix(file_path)
-        suffix_fwd = suffix.replace('\\', '/')
-        filename = Path(file_path).name
+        suffix_fwd = self._get_path_suffix(file_path).replace('\\', '/')
+        filename = '/' + Path(file_path.replace('\\', '/')).name
+        values = [file_path, file_path, suffix_fwd, filename]
         
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (f:File)
-                WHERE f.path = $path OR f.file_path = $path
-                   OR f.path ENDS WITH $suffix OR f.path ENDS WITH $suffix_fwd
-                   OR f.path_normalized ENDS WITH $suffix_fwd
-                   OR f.path ENDS WITH '\\\\' + $filename
-                   OR f.path ENDS WITH '/' + $filename
-                RETURN f.path as resolved_path
-                LIMIT 1
-            """, path=file_path, suffix=suffix, suffix_fwd=suffix_fwd, filename=filename)
-            
-            record = result.single()
-            if record and record['resolved_path']:
-                return record['resolved_path']
-        
-        # Fallback: try normalizing
-        try:
-            return str(Path(file_path).resolve())
-        except:
-            return file_path
+            for (_, query), value in zip(FILE_LOOKUPS + FILE_LOOKUPS[-1:], values):
+                record = session.run(query, value=value).single()
+                if record and record['resolved_path']:
+                    return record['resolved_path']
+        return None
     
     def store_dependency_snapshot(self, repo_id: str, commit_hash: str, edges: List[tuple]):
         """Store dependency edges for a commit"""
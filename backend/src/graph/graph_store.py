@@ -0,0 +1,360 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+import logging
+from .path_index import PathIndex
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying each diff-synced edge kind (see GraphStore._sync_edges)
+EDGE_KEYS = {
+    'depends_on': ('source', 'target'),
+    'file_calls': ('file', 'target_file', 'callee'),
+    'function_calls': ('file', 'caller', 'target_file', 'callee'),
+    'transitive_calls': ('file', 'caller', 'target_file', 'callee'),
+}
+
+
+class GraphStore(ABC):
+    """Storage interface for the code structure graph.
+
+    Files, classes, functions, module imports and the DEPENDS_ON / CALLS /
+    CALLS_TRANSITIVE edges between them, as written during ingestion and
+    read by the analyzers and API. GraphDB stores them in Neo4j,
+    EmbeddedGraphDB in process (SQLite).
+
+    Paths are normalized by the store; user-supplied paths are resolved
+    through the PathIndex of the repository they belong to. Bulk methods
+    take an optional writer from batch_writer() to group their writes into
+    fewer transactions.
+    """
+
+    def __init__(self):
+        # PathIndex per repo_id, built on first lookup
+        self.path_indexes: Dict[str, PathIndex] = {}
+
+    @abstractmethod
+    def close(self):
+        ...
+
+    @abstractmethod
+    def clear_database(self):
+        ...
+
+    @abstractmethod
+    def batch_writer(self, batch_size: int = None):
+        """Context manager grouping bulk writes into transactions of batch_size statements"""
+
+    # Bulk writes. Rows are dicts; each method returns the number of rows written,
+    # leaving out edges whose endpoints are not stored (all rows if given a writer).
+
+    @abstractmethod
+    def bulk_create_files(self, files: List[Dict], repo_id: str = None, writer=None) -> int:
+        """Rows: {path, language, content_hash, extractor_version}; linked to repo_id if given"""
+
+    @abstractmethod
+    def bulk_create_classes(self, classes: List[Dict], writer=None) -> int:
+        """Rows: {file, name, line}"""
+
+    @abstractmethod
+    def bulk_create_functions(self, functions: List[Dict], writer=None) -> int:
+        """Rows: {file, name, line}"""
+
+    @abstractmethod
+    def bulk_create_imports(self, imports: List[Dict], writer=None) -> int:
+        """Rows: {file, module}"""
+
+    @abstractmethod
+    def bulk_create_dependencies(self, edges: List[tuple], writer=None) -> int:
+        """DEPENDS_ON between stored files. Edges: (source, target)"""
+
+    @abstractmethod
+    def bulk_create_function_calls(self, calls: List[Dict], writer=None) -> int:
+        """File-to-function CALLS. Rows: {file, target_file, callee}"""
+
+    @abstractmethod
+    def bulk_create_function_to_function_calls(self, calls: List[Dict], writer=None) -> int:
+        """Function-to-function CALLS. Rows: {file, caller, target_file, callee}"""
+
+    @abstractmethod
+    def bulk_create_transitive_calls(self, pairs: Iterable[tuple], writer=None) -> int:
+        """CALLS_TRANSITIVE between functions. Pairs: ((file, name), (file, name))"""
+
+    @abstractmethod
+    def bulk_prune_files(self, files: List[Dict], writer=None) -> int:
+        """Drop the classes / functions modified files no longer define, and their
+        imports. Rows: {path, classes, functions} (names)"""
+
+    @abstractmethod
+    def bulk_delete_files(self, paths: Iterable[str], writer=None) -> int:
+        """Delete files with their classes, functions and edges"""
+
+    @abstractmethod
+    def delete_orphan_modules(self) -> int:
+        """Delete modules no file imports anymore"""
+
+    # Reads
+
+    @abstractmethod
+    def get_file_hashes(self, repo_id: str) -> Dict[str, Tuple[str, str]]:
+        """Stored path -> (content_hash, extractor_version) of a repo's files"""
+
+    @abstractmethod
+    def get_function_call_edges(self, repo_id: str) -> List[tuple]:
+        """Function-to-function CALLS of a repo as ((file, name), (file, name))"""
+
+    @abstractmethod
+    def get_transitive_callers(self, function: tuple, repo_id: str, max_depth: int = 5) -> List[tuple]:
+        """Functions of a repo reaching function (file, name) through 2..max_depth
+        function-to-function CALLS (max_depth <= 0: any number), as (file, name)"""
+
+    @abstractmethod
+    def get_dependencies(self, file_path: str, repo_id: str = None) -> List[str]:
+        """Imported module names and DEPENDS_ON targets of a file"""
+
+    @abstractmethod
+    def get_affected_files(self, file_path: str, repo_id: str = None) -> List[str]:
+        """Files depending on a file through up to three DEPENDS_ON hops"""
+
+    @abstractmethod
+    def get_dependents(self, file_path: str, max_hops: int = 3) -> Dict[str, int]:
+        """Files depending on a stored path through 1..max_hops DEPENDS_ON -> fewest hops"""
+
+    @abstractmethod
+    def get_file_function_callers(self, file_path: str, repo_id: str = None) -> Dict[str, List[str]]:
+        """Function name -> other files calling it, for each function a stored path defines"""
+
+    @abstractmethod
+    def get_file_summaries(self, repo_id: str) -> List[Dict]:
+        """Rows {file, language, imports, dependencies, classes, functions} of a repo's files"""
+
+    @abstractmethod
+    def get_all_files(self, repo_id: str = None) -> List[str]:
+        ...
+
+    @abstractmethod
+    def get_all_functions(self, repo_id: str = None) -> List[Dict]:
+        """Rows: {name, file, line}, ordered by name"""
+
+    @abstractmethod
+    def get_function_info(self, function_name: str) -> Dict:
+        ...
+
+    @abstractmethod
+    def get_function_callers(self, function_name: str, repo_id: str = None) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def get_graph_data(self, repo_id: str = None) -> Dict:
+        """{nodes, edges} of the file dependency graph for visualization"""
+
+    @abstractmethod
+    def find_dependency_cycle(self, max_hops: int = 5) -> str:
+        """A file on a DEPENDS_ON cycle of at most max_hops edges, or None"""
+
+    # Snapshot file links (ANALYZED_FILE). Snapshots themselves are kept in
+    # Neo4j by VersionTracker; the store records which files each one analyzed.
+
+    @abstractmethod
+    def link_snapshot_files(self, repo_id: str, snapshot_id: str) -> int:
+        """Link every stored file of a repo to a snapshot; returns new links"""
+
+    @abstractmethod
+    def get_snapshot_files(self, snapshot_id: str) -> List[Dict]:
+        """Rows {path, hash} of the stored files linked to a snapshot"""
+
+    @abstractmethod
+    def count_snapshot_files(self, snapshot_id: str) -> int:
+        ...
+
+    @abstractmethod
+    def unlink_snapshot_files(self, snapshot_id: str) -> int:
+        """Drop a deleted snapshot's file links"""
+
+    @abstractmethod
+    def _query_file_path(self, file_path: str) -> str:
+        """Stored path for file_path from the store itself, or None"""
+
+    @abstractmethod
+    def _stored_edges(self, repo_id: str, kind: str) -> Set[tuple]:
+        """A repo's stored edges of kind as tuples ordered like EDGE_KEYS[kind]"""
+
+    @abstractmethod
+    def _delete_edges(self, kind: str, rows: List[Dict]) -> int:
+        """Delete edges of kind; rows keyed by EDGE_KEYS[kind]"""
+
+    # Shared behaviour
+
+    def _normalize_path(self, path: str) -> str:
+        """Normalize path for consistent matching"""
+        try:
+            resolved = str(Path(path).resolve())
+            return resolved
+        except:
+            return path
+
+    def _path_normalizer(self):
+        """_normalize_path that resolves each distinct path only once, for one
+        batch of edges whose endpoints repeat"""
+        normalized = {}
+
+        def normalize(path: str) -> str:
+            if path not in normalized:
+                normalized[path] = self._normalize_path(path)
+            return normalized[path]
+        return normalize
+
+    def _get_path_suffix(self, path: str) -> str:
+        """Get path suffix for flexible matching (returns backslash-separated)"""
+        # Normalize separators first
+        normalized = path.replace('/', '\\')
+        parts = Path(normalized).parts
+        if len(parts) >= 3:
+            return str(Path(*parts[-3:]))
+        return str(Path(normalized).name)
+
+    @staticmethod
+    def _merge_callers(func_callers: List[Dict], file_callers: List[Dict]) -> List[Dict]:
+        """Function-level callers, plus file-level callers from files not already listed"""
+        seen_files = set()
+        merged = []
+        for fc in func_callers:
+            key = (fc.get('file', ''), fc.get('caller_name', ''))
+            if key not in seen_files:
+                seen_files.add(key)
+                merged.append(fc)
+        for fc in file_callers:
+            file_key = fc.get('file', '')
+            if not any(file_key == m.get('file', '') for m in merged):
+                merged.append(fc)
+        return merged
+
+    def get_file_call_edges(self, repo_id: str) -> List[tuple]:
+        """File-to-function CALLS of a repo as (file, (file, name))"""
+        return [
+            (file, (target_file, callee))
+            for file, target_file, callee in self._stored_edges(repo_id, 'file_calls')
+        ]
+
+    def get_path_index(self, repo_id: str, rebuild: bool = False) -> PathIndex:
+        """The repo's PathIndex, built from its stored files if needed"""
+        index = None if rebuild else self.path_indexes.get(repo_id)
+        if index is None:
+            index = PathIndex(self.get_all_files(repo_id))
+            self.path_indexes[repo_id] = index
+            logger.info(f"🗂️ Path index built for {repo_id}: {len(index)} files")
+        return index
+
+    def drop_path_index(self, repo_id: str):
+        """Forget a repo's PathIndex once its File nodes change"""
+        self.path_indexes.pop(repo_id, None)
+
+    def clear_repo(self, repo_id: str) -> int:
+        """Delete a repo's files with their classes, functions and edges"""
+        self.drop_path_index(repo_id)
+        return self.bulk_delete_files(self.get_all_files(repo_id))
+
+    def lookup_file_path(self, file_path: str, repo_id: str = None) -> Dict:
+        """Lookup of a user-provided path in repo_id's PathIndex (see PathIndex.lookup).
+
+        Without a repo_id the stored-path queries are used, which cannot
+        tell whether a match is ambiguous.
+        """
+        if repo_id:
+            return self.get_path_index(repo_id).lookup(file_path)
+        return self._stored_path_lookup(file_path, self._query_file_path(file_path))
+
+    @staticmethod
+    def _stored_path_lookup(file_path: str, resolved: str) -> Dict:
+        """Lookup result for a path resolved by _query_file_path"""
+        return {
+            'path': resolved,
+            'candidates': [resolved] if resolved else [],
+            'matched': file_path if resolved else None,
+            'ambiguous': False
+        }
+
+    def resolve_file_path(self, file_path: str, repo_id: str = None) -> str:
+        """Resolve a user-provided path to the actual stored path.
+
+        Uses repo_id's PathIndex; an ambiguous path resolves to its first
+        candidate (sorted), with a warning. Returns the normalized input
+        if nothing matches.
+        """
+        return self._resolved_path(file_path, self.lookup_file_path(file_path, repo_id))
+
+    @staticmethod
+    def _resolved_path(file_path: str, lookup: Dict) -> str:
+        """Path to use for a lookup result (see resolve_file_path)"""
+        if lookup['ambiguous']:
+            logger.warning(f"⚠️ Ambiguous path '{file_path}' matches {len(lookup['candidates'])} files, "
+                           f"using {lookup['candidates'][0]}")
+            return lookup['candidates'][0]
+        if lookup['path']:
+            return lookup['path']
+
+        # Fallback: try normalizing
+        try:
+            return str(Path(file_path).resolve())
+        except:
+            return file_path
+
+    def _sync_edges(self, repo_id: str, kind: str, desired: Set[tuple], create) -> Tuple[int, int]:
+        """Make a repo's stored edges of kind equal desired, writing only the difference.
+
+        desired holds normalized tuples ordered like EDGE_KEYS[kind]. Stale
+        edges are deleted, new ones created with create(rows). Returns
+        (added, removed) as counted by the store: a new edge whose endpoint
+        is not stored is not added.
+        """
+        keys = EDGE_KEYS[kind]
+        stored = self._stored_edges(repo_id, kind)
+        stale = [dict(zip(keys, edge)) for edge in stored - desired]
+        removed = self._delete_edges(kind, stale) if stale else 0
+        new = [dict(zip(keys, edge)) for edge in desired - stored]
+        added = create(new) if new else 0
+        return added, removed
+
+    def sync_dependencies(self, repo_id: str, edges: Iterable[tuple]) -> Tuple[int, int]:
+        """Diff-update a repo's DEPENDS_ON edges. Edges: (source, target); returns (added, removed)"""
+        normalize = self._path_normalizer()
+        desired = {
+            (normalize(source), normalize(target))
+            for source, target in edges if source != target
+        }
+        return self._sync_edges(
+            repo_id, 'depends_on', desired,
+            lambda rows: self.bulk_create_dependencies([(row['source'], row['target']) for row in rows])
+        )
+
+    def sync_function_calls(self, repo_id: str, calls: Iterable[tuple]) -> Tuple[int, int]:
+        """Diff-update a repo's file-to-function CALLS. Calls: (file, target_file, callee)"""
+        normalize = self._path_normalizer()
+        desired = {
+            (normalize(file), normalize(target_file), callee)
+            for file, target_file, callee in calls
+        }
+        return self._sync_edges(repo_id, 'file_calls', desired, self.bulk_create_function_calls)
+
+    def sync_function_to_function_calls(self, repo_id: str, calls: Iterable[tuple]) -> Tuple[int, int]:
+        """Diff-update a repo's function-to-function CALLS. Calls: (file, caller, target_file, callee)"""
+        normalize = self._path_normalizer()
+        desired = {
+            (normalize(file), caller, normalize(target_file), callee)
+            for file, caller, target_file, callee in calls
+        }
+        return self._sync_edges(repo_id, 'function_calls', desired, self.bulk_create_function_to_function_calls)
+
+    def sync_transitive_calls(self, repo_id: str, pairs: Iterable[tuple]) -> Tuple[int, int]:
+        """Diff-update a repo's CALLS_TRANSITIVE. Pairs: ((file, name), (file, name))"""
+        normalize = self._path_normalizer()
+        desired = {
+            (normalize(caller[0]), caller[1], normalize(callee[0]), callee[1])
+            for caller, callee in pairs
+        }
+        return self._sync_edges(
+            repo_id, 'transitive_calls', desired,
+            lambda rows: self.bulk_create_transitive_calls(
+                ((row['file'], row['caller']), (row['target_file'], row['callee'])) for row in rows
+            )
+        )
@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SOURCE_EXTENSIONS = ('.py', '.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.java')
+# Files that stand for their directory: `import pkg` -> pkg/__init__.py
+PACKAGE_FILES = {'__init__', 'index'}
+
+_FILES = None  # trie key holding the files that end at a node
+
+
+def _module_components(file_path: str) -> Tuple[str, ...]:
+    """Path components of a source file with the extension stripped"""
+    parts = [part for part in file_path.replace('\\', '/').split('/') if part and part != '.']
+    if not parts:
+        return ()
+    last = parts[-1]
+    for ext in SOURCE_EXTENSIONS:
+        if last.endswith(ext):
+            parts[-1] = last[:-len(ext)]
+            break
+    return tuple(parts)
+
+
+class ImportResolver:
+    """Resolves import strings to files in the repository.
+
+    Module paths are stored in a trie keyed by path components in reverse
+    order (file name first), so an import is resolved by walking its own
+    components from the last one: O(import depth) instead of comparing it
+    against every file. All of the import's components must match the end
+    of the file's path. When several files match, the one closest to the
+    importing file wins, then the lexicographically smallest path, so
+    results are deterministic.
+
+    Python dotted modules (`a.b.c`, `..pkg.mod`) and JS specifiers
+    (`./a/b`, `../c.js`, `pkg/sub`) are normalized to components first;
+    relative imports are resolved against the importer's directory exactly,
+    and are unresolved (None) if no file is there.
+    """
+
+    def __init__(self, file_paths: Iterable[str]):
+        self.trie: Dict = {}
+        self.exact: Dict[Tuple[str, ...], str] = {}
+        self.components: Dict[str, Tuple[str, ...]] = {}
+        for file_path in sorted(set(file_paths)):
+            components = _module_components(file_path)
+            if not components:
+                continue
+            self.components[file_path] = components
+            self._insert(components, file_path)
+            if components[-1] in PACKAGE_FILES and len(components) > 1:
+                self._insert(components[:-1], file_path)
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def _insert(self, components: Tuple[str, ...], file_path: str):
+        self.exact.setdefault(components, file_path)
+        node = self.trie
+        for component in reversed(components):
+            node = node.setdefault(component, {})
+            node.setdefault(_FILES, []).append(file_path)
+
+    def resolve(self, import_name: str, importer: str = None) -> Optional[str]:
+        """File the import refers to, or None for external modules"""
+        if not import_name:
+            return None
+        components, relative_to = self._normalize(import_name, importer)
+        if import_name.startswith('.'):
+            # Relative imports name one file; never guess another elsewhere
+            if relative_to is None:
+                return None
+            return self.exact.get(relative_to + components)
+        return self._lookup(components, importer)
+
+    def _normalize(self, import_name: str, importer: Optional[str]):
+        """Split an import into components; relative imports also get a base directory"""
+        base = self._components_of(importer)[:-1] if importer else None
+        if '/' in import_name:
+            # JS-style path specifier
+            parts = []
+            relative = import_name.startswith('.')
+            for part in import_name.split('/'):
+                if part == '..':
+                    if parts:
+                        parts.pop()
+                    elif base:
+                        base = base[:-1]
+                elif part and part != '.':
+                    parts.append(part)
+            if parts:
+                parts[-1] = _module_components(parts[-1])[-1]
+            return tuple(parts), (base if relative and base is not None else None)
+
+        # Python dotted module, possibly relative (leading dots)
+        stripped = import_name.lstrip('.')
+        level = len(import_name) - len(stripped)
+        components = tuple(part for part in stripped.split('.') if part)
+        if level and base is not None:
+            return components, (base[:len(base) - (level - 1)] if level > 1 else base)
+        return components, None
+
+    def _lookup(self, components: Tuple[str, ...], importer: Optional[str]) -> Optional[str]:
+        """File whose path ends with all of components; a partial suffix
+        (`os.path` vs a repo's path.py) is not a match"""
+        if not components:
+            return None
+        node = self.trie
+        for component in reversed(components):
+            node = node.get(component)
+            if node is None:
+                return None
+        candidates = node[_FILES]
+        if len(candidates) == 1 or not importer:
+            return candidates[0]
+        return self._closest(candidates, importer)
+
+    def _components_of(self, file_path: str) -> Tuple[str, ...]:
+        components = self.components.get(file_path)
+        return components if components is not None else _module_components(file_path)
+
+    def _closest(self, candidates: List[str], importer: str) -> str:
+        importer_dir = self._components_of(importer)[:-1]
+        components = self.components
+        best, best_shared = candidates[0], -1
+        for candidate in candidates:  # already sorted by path
+            shared = 0
+            for a, b in zip(importer_dir, components[candidate]):
+                if a != b:
+                    break
+                shared += 1
+            if shared > best_shared:
+                best, best_shared = candidate, shared
+        return best
@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, List, Optional
+
+# Candidates reported for an ambiguous path
+MAX_CANDIDATES = 20
+
+
+def _components(path: str) -> List[str]:
+    return [part for part in path.replace('\\', '/').split('/') if part and part != '.']
+
+
+class PathIndex:
+    """In-memory map from user-supplied paths to the File paths stored for a repo.
+
+    Every stored path is indexed under each of its suffixes below the
+    repository root (`a.py`, `src/a.py`, `pkg/src/a.py`, ...) plus the full
+    path, with separators normalized to '/'. A lookup tries the query's own
+    suffixes longest first, so absolute paths from another checkout, paths
+    relative to the repo and bare filenames all resolve with a few dict hits.
+    When the longest matching suffix belongs to several files the lookup is
+    reported as ambiguous instead of picking one silently.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = sorted({path for path in paths if path})
+        self.suffixes: Dict[str, List[str]] = {}
+        split = [_components(path) for path in self.paths]
+        # Suffixes reaching above the common root would key every file the same
+        root_depth = self._common_depth(split)
+        for path, parts in zip(self.paths, split):
+            self.suffixes.setdefault('/'.join(parts), []).append(path)
+            for start in range(root_depth, len(parts)):
+                if start:
+                    self.suffixes.setdefault('/'.join(parts[start:]), []).append(path)
+
+    @staticmethod
+    def _common_depth(split: List[List[str]]) -> int:
+        if not split:
+            return 0
+        shortest = min(split, key=len)
+        depth = 0
+        while depth < len(shortest) - 1 and all(parts[depth] == shortest[depth] for parts in split):
+            depth += 1
+        return depth
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def lookup(self, query: str) -> Dict:
+        """Resolve a path. Returns {path, candidates, matched, ambiguous}.
+
+        path is the stored path when exactly one file matches, else None;
+        candidates lists every file sharing the longest matched suffix.
+        """
+        parts = _components(query or '')
+        for start in range(len(parts)):
+            key = '/'.join(parts[start:])
+            candidates = self.suffixes.get(key)
+            if candidates:
+                return {
+                    'path': candidates[0] if len(candidates) == 1 else None,
+                    'candidates': candidates[:MAX_CANDIDATES],
+                    'matched': key,
+                    'ambiguous': len(candidates) > 1
+                }
+        return {'path': None, 'candidates': [], 'matched': None, 'ambiguous': False}
+
+    def resolve(self, query: str) -> Optional[str]:
+        """Stored path for an unambiguous match, else None"""
+        return self.lookup(query)['path']
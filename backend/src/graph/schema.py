@@ -0,0 +1,94 @@
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (name, kind, label, properties). RANGE indexes serve equality lookups and
+# property-map MERGEs; TEXT indexes serve ENDS WITH / CONTAINS on strings.
+INDEXES: List[Tuple[str, str, str, Tuple[str, ...]]] = [
+    ('file_path', 'RANGE', 'File', ('path',)),
+    ('file_file_path', 'RANGE', 'File', ('file_path',)),
+    ('file_path_text', 'TEXT', 'File', ('path',)),
+    ('file_path_normalized_text', 'TEXT', 'File', ('path_normalized',)),
+    ('function_name', 'RANGE', 'Function', ('name',)),
+    ('function_file', 'RANGE', 'Function', ('file',)),
+    ('class_file', 'RANGE', 'Class', ('file',)),
+    ('module_name', 'RANGE', 'Module', ('name',)),
+    ('snapshot_id', 'RANGE', 'Snapshot', ('snapshot_id',)),
+    ('snapshot_repo_commit', 'RANGE', 'Snapshot', ('repo_id', 'commit_hash')),
+    ('version_file_path', 'RANGE', 'Version', ('file_path',)),
+]
+
+# Plan operators that read every node (of a label) instead of seeking an index
+SCAN_OPERATORS = {'AllNodesScan', 'NodeByLabelScan'}
+
+
+def _create_statement(name: str, kind: str, label: str, properties: Tuple[str, ...]) -> str:
+    props = ', '.join(f'n.{prop}' for prop in properties)
+    prefix = 'CREATE TEXT INDEX' if kind == 'TEXT' else 'CREATE INDEX'
+    return f"{prefix} {name} IF NOT EXISTS FOR (n:{label}) ON ({props})"
+
+
+def plan_operators(plan) -> Set[str]:
+    """Operator names in an EXPLAIN plan, without the runtime suffix (`@neo4j`)"""
+    if not plan:
+        return set()
+    operators = {plan['operatorType'].split('@')[0]}
+    for child in plan.get('children', []):
+        operators |= plan_operators(child)
+    return operators
+
+
+class SchemaManager:
+    """Creates the indexes the graph queries rely on and checks they are usable"""
+
+    def __init__(self, driver, indexes=INDEXES):
+        self.driver = driver
+        self.indexes = indexes
+
+    def ensure(self, timeout: float = 5.0) -> List[str]:
+        """Create missing indexes and wait up to timeout seconds for them to
+        come online (0: don't wait).
+
+        Returns the names of indexes that are still missing or not ONLINE.
+        """
+        with self.driver.session() as session:
+            for index in self.indexes:
+                try:
+                    session.run(_create_statement(*index)).consume()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not create index {index[0]}: {e}")
+            if timeout > 0:
+                try:
+                    session.run("CALL db.awaitIndexes($timeout)", timeout=int(timeout) or 1).consume()
+                except Exception as e:
+                    logger.warning(f"⚠️ Timed out waiting for indexes: {e}")
+        missing = self.verify()
+        if missing:
+            logger.warning(f"⚠️ Indexes not online: {', '.join(missing)}")
+        else:
+            logger.info(f"📇 {len(self.indexes)} graph indexes online")
+        return missing
+
+    def verify(self) -> List[str]:
+        """Names of expected indexes that do not exist or are not ONLINE"""
+        with self.driver.session() as session:
+            result = session.run("SHOW INDEXES YIELD name, state")
+            states = {record['name']: record['state'] for record in result}
+        return [name for name, *_ in self.indexes if states.get(name) != 'ONLINE']
+
+    def explain(self, query: str, **params) -> Set[str]:
+        """Operators the planner picks for a query (EXPLAIN, nothing is executed)"""
+        with self.driver.session() as session:
+            summary = session.run(f"EXPLAIN {query}", **params).consume()
+        return plan_operators(summary.plan)
+
+    def check_plans(self, queries: Iterable[Tuple[str, str, Dict]]) -> Dict[str, Set[str]]:
+        """EXPLAIN (name, query, params) lookups; returns the scans each one still does"""
+        scans = {}
+        for name, query, params in queries:
+            found = self.explain(query, **params) & SCAN_OPERATORS
+            if found:
+                scans[name] = found
+                logger.warning(f"⚠️ Lookup '{name}' is not index-backed: {', '.join(sorted(found))}")
+        return scans
@@ -0,0 +1,118 @@
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from .import_resolver import ImportResolver
+
+logger = logging.getLogger(__name__)
+
+SELF_RECEIVERS = {'self', 'cls', 'this'}
+# Constructors are extracted qualified with their class (parser.symbols.get_function_name)
+CONSTRUCTORS = ('__init__', 'constructor')
+
+
+class SymbolTable:
+    """Per-file symbol tables used to resolve call sites to real functions.
+
+    A call is linked only when its target can be found statically:
+    - `f()` to a function defined in the same file, or to the function an
+      import binding names (`from m import f`, `import {f} from './m'`);
+    - `Cls()` to the constructor of a class defined locally or imported
+      (stored as `Cls.__init__`, so only that class's constructor);
+    - `self.f()` / `this.f()` to a function of the same file;
+    - `mod.f()` / `Cls.f()` where `mod` / `Cls` is bound by an import.
+    Calls on other receivers (local objects, call results) and on names the
+    repository does not define (builtins, third-party packages) are dropped
+    instead of being linked to every function that happens to share the name.
+    """
+
+    def __init__(self, parsed_files: List[Dict], import_resolver: ImportResolver):
+        self.import_resolver = import_resolver
+        self.functions: Dict[str, Set[str]] = {}
+        self.classes: Dict[str, Set[str]] = {}
+        self.bindings: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self.call_sites: Dict[str, List[Dict]] = {}
+        for parsed in parsed_files:
+            file_path = parsed['file']
+            self.functions[file_path] = {f['name'] for f in parsed.get('functions', [])}
+            self.classes[file_path] = {c['name'] for c in parsed.get('classes', [])}
+            self.bindings[file_path] = {
+                b['name']: (b['module'], b['symbol']) for b in parsed.get('import_bindings', [])
+            }
+            self.call_sites[file_path] = parsed.get('call_sites', [])
+        self._module_cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def resolve_calls(self) -> Tuple[List[Tuple[str, str, str]], List[Tuple[str, str, str, str]]]:
+        """Resolved edges as (file, target_file, callee) and (file, caller, target_file, callee)"""
+        file_calls = set()
+        function_calls = set()
+        total = 0
+        for file_path, sites in self.call_sites.items():
+            for site in sites:
+                total += 1
+                target = self.resolve_call(file_path, site['callee'], site['receiver'])
+                if not target:
+                    continue
+                target_file, target_function = target
+                file_calls.add((file_path, target_file, target_function))
+                if site['caller']:
+                    function_calls.add((file_path, site['caller'], target_file, target_function))
+        logger.info(f"   📞 Resolved {len(file_calls)} of {total} call sites")
+        return sorted(file_calls), sorted(function_calls)
+
+    def resolve_call(self, file_path: str, callee: str, receiver: str) -> Optional[Tuple[str, str]]:
+        """(file, function) a call resolves to, or None when it cannot be pinned down"""
+        if not receiver:
+            if callee in self.functions.get(file_path, ()):
+                return file_path, callee
+            if callee in self.classes.get(file_path, ()):
+                return self._constructor(file_path, callee)
+            binding = self.bindings.get(file_path, {}).get(callee)
+            if binding:
+                return self._resolve_binding_call(file_path, binding)
+            return None
+
+        if receiver in SELF_RECEIVERS:
+            if callee in self.functions.get(file_path, ()):
+                return file_path, callee
+            return None
+
+        binding = self.bindings.get(file_path, {}).get(receiver)
+        if binding:
+            target_file = self._binding_file(file_path, *binding)
+            if target_file and callee in self.functions.get(target_file, ()):
+                return target_file, callee
+        return None
+
+    def _resolve_binding_call(self, file_path: str, binding: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+        module, symbol = binding
+        if not symbol:
+            return None  # calling a module object
+        target_file = self._module_file(file_path, module)
+        if not target_file:
+            return None
+        if symbol in self.functions.get(target_file, ()):
+            return target_file, symbol
+        if symbol in self.classes.get(target_file, ()):
+            return self._constructor(target_file, symbol)
+        return None
+
+    def _binding_file(self, file_path: str, module: str, symbol: str) -> Optional[str]:
+        """File behind a bound name: a submodule (`from pkg import mod`) or the module itself"""
+        if symbol and symbol != 'default':
+            separator = '' if module.endswith('.') or module.endswith('/') else ('/' if '/' in module else '.')
+            target = self._module_file(file_path, f"{module}{separator}{symbol}")
+            if target:
+                return target
+        return self._module_file(file_path, module)
+
+    def _module_file(self, file_path: str, module: str) -> Optional[str]:
+        key = (file_path, module)
+        if key not in self._module_cache:
+            self._module_cache[key] = self.import_resolver.resolve(module, file_path)
+        return self._module_cache[key]
+
+    def _constructor(self, target_file: str, class_name: str) -> Optional[Tuple[str, str]]:
+        for name in CONSTRUCTORS:
+            qualified = f"{class_name}.{name}"
+            if qualified in self.functions.get(target_file, ()):
+                return target_file, qualified
+        return None
@@ -179,9 +179,9 @@ class VersionTracker:
         
         return repo_id, exists, snapshot_id
     
-    def track_file_version(self, repo_id: str, file_path: str, repo_path: str) -> Dict:
+    def track_file_version(self, repo_id: str, file_path: str, repo_path: str, content_hash: str = None) -> Dict:
         """Track file version only if commit changed"""
-        current_hash = self.compute_file_hash(file_path)
+        current_hash = content_hash or self.compute_file_hash(file_path)
         if not current_hash:
             return {"status": "error", "message": "Could not hash file"}
         
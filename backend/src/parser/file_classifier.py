@@ -0,0 +1,82 @@
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory names that hold third-party code checked into the repository
+VENDORED_DIRS = {'vendor', 'vendors', 'third_party', 'thirdparty', 'third-party',
+                 'bower_components', 'jspm_packages', 'site-packages', 'node_modules'}
+GENERATED_SUFFIXES = ('.min.js', '-min.js', '.bundle.js', '.pack.js', '_pb2.py', '_pb2_grpc.py')
+GENERATED_MARKERS = (b'@generated', b'do not edit', b'code generated by', b'autogenerated',
+                     b'auto-generated', b'generated by the protocol buffer compiler')
+
+HEAD_BYTES = 8192  # only the start of a file is inspected
+MAX_LINE_LENGTH = 1000
+MAX_AVG_LINE_LENGTH = 200
+
+
+class FileClassifier:
+    """Flags files that should not be parsed before any parser work is done.
+
+    A file is skipped when it exceeds max_file_size, lives in a vendored
+    directory, or looks generated/minified (by name, by a generated-code
+    marker near the top, or by its line lengths). Only the first HEAD_BYTES
+    of a file are read.
+    """
+
+    def __init__(self, max_file_size: int = 1000000):
+        self.max_file_size = max_file_size
+
+    def partition(self, files: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Split scanned files into (files to parse, skipped file reports)"""
+        keep = []
+        skipped = []
+        for file_info in files:
+            reason, size = self.classify(file_info)
+            if reason:
+                skipped.append({'file': file_info['relative_path'], 'reason': reason, 'size': size})
+            else:
+                keep.append(file_info)
+        if skipped:
+            logger.info(f"   ⏭️ Skipping {len(skipped)} large, vendored or generated files")
+        return keep, skipped
+
+    def classify(self, file_info: Dict) -> Tuple[Optional[str], int]:
+        """Return (skip reason or None, file size in bytes)"""
+        try:
+            size = os.stat(file_info['path']).st_size
+        except OSError:
+            return None, 0  # let the parser report the error
+
+        if self.max_file_size and size > self.max_file_size:
+            return 'too_large', size
+
+        relative_path = file_info['relative_path'].replace('\\', '/')
+        parts = relative_path.lower().split('/')
+        if any(part in VENDORED_DIRS for part in parts[:-1]):
+            return 'vendored', size
+        if parts[-1].endswith(GENERATED_SUFFIXES):
+            return 'generated', size
+
+        try:
+            with open(file_info['path'], 'rb') as f:
+                head = f.read(HEAD_BYTES)
+        except OSError:
+            return None, size
+        return self._classify_content(head), size
+
+    def _classify_content(self, head: bytes) -> Optional[str]:
+        first_lines = b'\n'.join(head.split(b'\n', 5)[:5]).lower()
+        if any(marker in first_lines for marker in GENERATED_MARKERS):
+            return 'generated'
+
+        lines = head.split(b'\n')
+        if len(lines) > 1 and len(head) == HEAD_BYTES:
+            lines.pop()  # last line is cut off at the read boundary
+        if not lines:
+            return None
+        longest = max(len(line) for line in lines)
+        if longest > MAX_LINE_LENGTH or len(head) / len(lines) > MAX_AVG_LINE_LENGTH:
+            return 'minified'
+        return None
@@ -0,0 +1,208 @@
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from .static_parser import StaticParser
+from .parsed_file import ParsedFile
+
+BLOCK = 4096
+
+
+def _common_prefix(old: bytes, new: bytes) -> int:
+    limit = min(len(old), len(new))
+    pos = 0
+    # Compare whole blocks first (memcmp speed), then narrow down byte by byte
+    while pos + BLOCK <= limit and old[pos:pos + BLOCK] == new[pos:pos + BLOCK]:
+        pos += BLOCK
+    while pos < limit and old[pos] == new[pos]:
+        pos += 1
+    return pos
+
+
+def _common_suffix(old: bytes, new: bytes, prefix: int) -> int:
+    limit = min(len(old), len(new)) - prefix
+    size = 0
+    while size + BLOCK <= limit and old[len(old) - size - BLOCK:len(old) - size] == new[len(new) - size - BLOCK:len(new) - size]:
+        size += BLOCK
+    while size < limit and old[len(old) - size - 1] == new[len(new) - size - 1]:
+        size += 1
+    return size
+
+
+def _advance(point: Tuple[int, int], code: bytes, start: int, end: int) -> Tuple[int, int]:
+    """Point of byte end, given the point of byte start"""
+    newlines = code.count(b'\n', start, end)
+    if not newlines:
+        return (point[0], point[1] + end - start)
+    return (point[0] + newlines, end - code.rfind(b'\n', start, end) - 1)
+
+
+def _point(tree, code: bytes, byte: int) -> Tuple[int, int]:
+    """Point of byte in the code tree was parsed from.
+
+    Counted from the closest node boundary before byte, found by descending
+    the tree, so only the bytes between that boundary and byte are scanned.
+    """
+    anchor, point = 0, (0, 0)
+    node = tree.root_node
+    while node.child_count:
+        children = node.children
+        i = bisect_right(children, byte, key=lambda child: child.start_byte) - 1
+        if i < 0:
+            break
+        child = children[i]
+        if child.end_byte <= byte:
+            anchor, point = child.end_byte, child.end_point
+            break
+        anchor, point = child.start_byte, child.start_point
+        node = child
+    return _advance(point, code, anchor, byte)
+
+
+class _Segment:
+    """Extraction result for one top-level node, with lines relative to its start row"""
+    __slots__ = ('start_byte', 'end_byte', 'type', 'result')
+
+    def __init__(self, node, result: Dict):
+        self.start_byte = node.start_byte
+        self.end_byte = node.end_byte
+        self.type = node.type
+        row = node.start_point[0]
+        self.result = {
+            **result,
+            'classes': [{**c, 'line': c['line'] - row} for c in result['classes']],
+            'functions': [{**f, 'line': f['line'] - row} for f in result['functions']],
+        }
+
+
+class _FileState:
+    __slots__ = ('language', 'code', 'tree', 'segments')
+
+    def __init__(self, language: str, code: bytes, tree, segments: List[_Segment]):
+        self.language = language
+        self.code = code
+        self.tree = tree
+        self.segments = segments
+
+
+class IncrementalParser:
+    """Re-parses files incrementally for watch-style or frequent re-analysis.
+
+    Keeps the previous tree-sitter Tree per file. On the next parse the byte
+    diff against the previous content is applied with Tree.edit(), tree-sitter
+    reparses only the changed region, and extraction is re-run only for
+    top-level definitions touched by the change. Results of untouched
+    definitions are reused with their line numbers shifted.
+
+    Reparse and extraction scale with the edit; reading the file, the byte
+    diff against its previous content and assembling the result still scan
+    the whole file, as memcmp-speed slices and list copies.
+
+    parse_file returns a ParsedFile, like StaticParser.parse_file. Trees of
+    the max_files most recently parsed files are kept.
+    """
+
+    def __init__(self, static_parser: StaticParser = None, max_files: int = 1024):
+        self.static_parser = static_parser or StaticParser()
+        self.max_files = max_files
+        self.states: Dict[str, _FileState] = OrderedDict()
+
+    def forget(self, file_path: str):
+        self.states.pop(file_path, None)
+
+    def parse_file(self, file_path: str, language: str) -> ParsedFile:
+        with open(file_path, 'rb') as f:
+            code = f.read()
+        return self.parse_code(file_path, code, language)
+
+    def parse_code(self, file_path: str, code: bytes, language: str) -> ParsedFile:
+        parser = self.static_parser.parsers.get(language)
+        if not parser:
+            return {}
+
+        state = self.states.get(file_path)
+        if state is None or state.language != language:
+            tree = parser.parse(code)
+            segments = [self._extract_segment(node, code, language) for node in tree.root_node.children]
+        elif state.code == code:
+            tree, segments = state.tree, state.segments
+        else:
+            tree, segments = self._reparse(parser, state, code, language)
+
+        self.states[file_path] = _FileState(language, code, tree, segments)
+        self.states.move_to_end(file_path)
+        while len(self.states) > self.max_files:
+            self.states.popitem(last=False)
+        return self._assemble(file_path, language, code, tree, segments)
+
+    def _reparse(self, parser, state: _FileState, code: bytes, language: str):
+        old_code = state.code
+        start = _common_prefix(old_code, code)
+        suffix = _common_suffix(old_code, code, start)
+        old_end = len(old_code) - suffix
+        new_end = len(code) - suffix
+        delta = new_end - old_end
+
+        old_tree = state.tree
+        start_point = _point(old_tree, old_code, start)
+        old_tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=start_point,
+            old_end_point=_point(old_tree, old_code, old_end),
+            new_end_point=_advance(start_point, code, start, new_end),
+        )
+        tree = parser.parse(code, old_tree)
+        changed = [(r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)]
+        changed.append((start, new_end))
+
+        # Old segments entirely outside the edit, keyed by their new position
+        reusable = {}
+        for segment in state.segments:
+            if segment.end_byte < start:
+                reusable[(segment.start_byte, segment.end_byte, segment.type)] = segment
+            elif segment.start_byte > old_end:
+                key = (segment.start_byte + delta, segment.end_byte + delta, segment.type)
+                reusable[key] = segment
+
+        segments = []
+        for node in tree.root_node.children:
+            segment = reusable.get((node.start_byte, node.end_byte, node.type))
+            touched = any(node.start_byte <= end and start_byte <= node.end_byte for start_byte, end in changed)
+            if segment is None or touched:
+                segment = self._extract_segment(node, code, language)
+            else:
+                segment.start_byte, segment.end_byte = node.start_byte, node.end_byte
+            segments.append(segment)
+        return tree, segments
+
+    def _extract_segment(self, node, code: bytes, language: str) -> _Segment:
+        return _Segment(node, self.static_parser.extract(node, code, language))
+
+    def _assemble(self, file_path: str, language: str, code: bytes, tree, segments: List[_Segment]) -> ParsedFile:
+        result = {
+            'classes': [],
+            'functions': [],
+            'imports': [],
+            'function_calls': [],
+            'function_to_function_calls': [],
+            'call_sites': [],
+            'import_bindings': []
+        }
+        seen_sites = set()
+        for node, segment in zip(tree.root_node.children, segments):
+            row = node.start_point[0]
+            extracted = segment.result
+            result['classes'].extend({**c, 'line': c['line'] + row} for c in extracted['classes'])
+            result['functions'].extend({**f, 'line': f['line'] + row} for f in extracted['functions'])
+            result['imports'].extend(extracted['imports'])
+            result['function_calls'].extend(extracted['function_calls'])
+            result['function_to_function_calls'].extend(extracted['function_to_function_calls'])
+            for site in extracted['call_sites']:
+                key = (site['caller'], site['callee'], site['receiver'])
+                if key not in seen_sites:  # unique per file, not per segment
+                    seen_sites.add(key)
+                    result['call_sites'].append(site)
+            result['import_bindings'].extend(extracted['import_bindings'])
+        return ParsedFile.from_extracted(file_path, language, hashlib.sha256(code).hexdigest(), result)
@@ -0,0 +1,208 @@
+import os
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Worker-local parser, created once per process by _init_worker
+_worker_parser = None
+
+
+def _init_worker(backends: Dict = None, cache_dir: str = None, cache_max_bytes: int = 0):
+    global _worker_parser
+    from .static_parser import StaticParser
+    from .parse_cache import ParseCache
+    cache = ParseCache(cache_dir, cache_max_bytes) if cache_dir else None
+    _worker_parser = StaticParser(backends, cache)
+
+
+def _parse_one(file_info: Dict, parser=None) -> Tuple[Dict, Dict, str]:
+    """Parse a single file inside a worker (or with parser); never raises"""
+    try:
+        parsed = (parser or _worker_parser).parse_file(file_info['path'], file_info['language'])
+        return file_info, parsed, None
+    except Exception as e:
+        return file_info, None, f"{type(e).__name__}: {e}"
+
+
+def _parse_chunk(chunk: List[Dict]) -> List[Tuple[Dict, Dict, str]]:
+    return [_parse_one(file_info) for file_info in chunk]
+
+
+def _finished(future) -> List[Tuple[Dict, Dict, str]]:
+    """A chunk future's results if it completed successfully, else None"""
+    if future.done() and not future.cancelled() and future.exception() is None:
+        return future.result()
+    return None
+
+
+class ParallelParser:
+    """Parses files across a process pool with one StaticParser per worker.
+
+    Results are yielded as (file_info, parsed, error) tuples. A file that fails
+    to parse yields parsed=None and an error string instead of aborting the run,
+    including a file whose worker process dies while parsing it.
+
+    With incremental set, an IncrementalParser that lives as long as this
+    object re-parses, in this process, every file it still holds a tree for
+    and every file that changed (mtime or size) since this object last saw
+    it; the rest go to the pool. Re-analysing an edited file then only
+    reparses the edit, whatever the pool size.
+    """
+
+    def __init__(self, workers: int = 0, chunksize: int = 16, backends: Dict = None,
+                 cache_dir: str = None, cache_max_bytes: int = 256 * 1024 * 1024,
+                 incremental: bool = False):
+        self.workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self.chunksize = max(1, chunksize)
+        self.backends = backends or {}
+        # Parse results are cached on disk by content hash when cache_dir is set
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.incremental = incremental
+        self.incremental_parser = None
+        self.signatures: Dict[str, Tuple[int, int]] = {}  # path -> (mtime_ns, size) when last seen
+
+    def parse_files(self, files: List[Dict], ordered: bool = True) -> Iterator[Tuple[Dict, Dict, str]]:
+        yield from self._parse_files(files, ordered)
+        if self.cache_dir:
+            from .parse_cache import ParseCache
+            ParseCache(self.cache_dir, self.cache_max_bytes).prune()
+
+    def _parse_files(self, files: List[Dict], ordered: bool) -> Iterator[Tuple[Dict, Dict, str]]:
+        if not files:
+            return
+
+        parser = self._incremental() if self.incremental else None
+        # Small inputs and single-worker configs are not worth the pool startup
+        if self.workers == 1 or len(files) <= self.chunksize:
+            in_process = files
+        elif parser is not None:
+            in_process = [file_info for file_info in files if self._reparse_in_process(file_info)]
+        else:
+            in_process = []
+        local = {id(file_info) for file_info in in_process}
+        pooled = [file_info for file_info in files if id(file_info) not in local]
+        if parser is None and in_process:
+            _init_worker(*self._worker_args())
+
+        if not pooled:
+            for file_info in files:
+                yield _parse_one(file_info, parser)
+            return
+        if not in_process:
+            yield from self._parse_pooled(pooled, ordered)
+            return
+
+        logger.info(f"   ♻️ Re-parsing {len(in_process)} seen files incrementally")
+        pooled_results = self._parse_pooled(pooled, ordered)
+        try:
+            if not ordered:
+                for file_info in in_process:
+                    yield _parse_one(file_info, parser)
+                yield from pooled_results
+                return
+            # Pooled results arrive in input order; in-process files fill the gaps
+            for file_info in files:
+                yield _parse_one(file_info, parser) if id(file_info) in local else next(pooled_results)
+        finally:
+            pooled_results.close()
+
+    def _parse_pooled(self, files: List[Dict], ordered: bool) -> Iterator[Tuple[Dict, Dict, str]]:
+        chunks = [files[i:i + self.chunksize] for i in range(0, len(files), self.chunksize)]
+        logger.info(f"   ⚙️ Parsing with {self.workers} workers ({len(chunks)} chunks)")
+
+        # Keep only a few chunks in flight per worker, so a slow consumer holds
+        # back parsing instead of letting finished results pile up in memory
+        max_pending = self.workers * 2
+        pool = self._new_pool()
+        try:
+            remaining = iter(chunks)
+            pending = {}  # future -> chunk, in submission order
+            while True:
+                lost = []
+                for chunk in remaining:
+                    try:
+                        pending[pool.submit(_parse_chunk, chunk)] = chunk
+                    except BrokenProcessPool:
+                        lost.append(chunk)
+                        break
+                    if len(pending) >= max_pending:
+                        break
+                if not lost:
+                    if not pending:
+                        return
+                    if ordered:
+                        future = next(iter(pending))
+                    else:
+                        future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        results = None
+                    except Exception as e:
+                        # The chunk itself failed (e.g. an unpicklable result)
+                        error = f"{type(e).__name__}: {e}"
+                        results = [(file_info, None, error) for file_info in pending[future]]
+                    if results is not None:
+                        del pending[future]
+                        yield from results
+                        continue
+
+                # A worker died (e.g. a crash inside a grammar) and took the pool
+                # with it, failing every chunk still in flight. Keep the chunks that
+                # finished and retry the rest one file at a time in a fresh pool, so
+                # only the file that crashes fails.
+                logger.warning("   ⚠️ Parser worker died; retrying unfinished files one at a time")
+                in_flight = [(chunk, _finished(future)) for future, chunk in pending.items()]
+                in_flight += [(chunk, None) for chunk in lost]
+                pending.clear()
+                pool = self._replace_pool(pool)
+                for chunk, results in in_flight:
+                    if results is not None:
+                        yield from results
+                        continue
+                    for file_info in chunk:
+                        try:
+                            [result] = pool.submit(_parse_chunk, [file_info]).result()
+                        except BrokenProcessPool as e:
+                            result = (file_info, None, f"{type(e).__name__}: {e}")
+                            pool = self._replace_pool(pool)
+                        yield result
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _reparse_in_process(self, file_info: Dict) -> bool:
+        """Whether the incremental parser should take a file: it still holds the
+        file's tree, or the file changed since this parser last saw it"""
+        path = file_info['path']
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None  # the pool reports the error
+        previous = self.signatures.get(path)
+        self.signatures[path] = signature
+        if path in self.incremental_parser.states:
+            return True
+        return None not in (previous, signature) and previous != signature
+
+    def _incremental(self):
+        if self.incremental_parser is None:
+            from .static_parser import StaticParser
+            from .incremental_parser import IncrementalParser
+            self.incremental_parser = IncrementalParser(StaticParser(self.backends))
+        return self.incremental_parser
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=self._worker_args())
+
+    def _replace_pool(self, pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        pool.shutdown(cancel_futures=True)
+        return self._new_pool()
+
+    def _worker_args(self) -> Tuple:
+        return (self.backends, self.cache_dir, self.cache_max_bytes)
@@ -0,0 +1,105 @@
+import os
+import zlib
+import marshal
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PC1' + bytes([marshal.version])
+
+
+class ParseCache:
+    """Content-addressed on-disk cache of StaticParser.parse_file results.
+
+    Entries are keyed by the SHA-256 of the file content plus the language,
+    extraction backend and extractor version, so any content or parser change
+    is a miss. Values are marshal-encoded and zlib-compressed. The directory is
+    kept under max_bytes by evicting least recently used entries in prune().
+    Writes go through a temp file + rename, so parse workers in several
+    processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def make_key(self, content_hash: str, language: str, backend: str, version: str) -> str:
+        return hashlib.sha256(f"{version}|{language}|{backend}|{content_hash}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key[2:]}.bin"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC):
+            self._discard(path)
+            return None
+        try:
+            result = marshal.loads(zlib.decompress(data[len(MAGIC):]))
+        except Exception as e:
+            logger.debug(f"Discarding corrupt parse cache entry {path}: {e}")
+            self._discard(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict):
+        path = self._entry_path(key)
+        try:
+            payload = MAGIC + zlib.compress(marshal.dumps(result), 1)
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not write parse cache entry: {e}")
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        # Leave some headroom so the next run does not immediately evict again
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            if self._discard(path):
+                total -= size
+                evicted += 1
+        logger.info(f"   🗑️ Evicted {evicted} parse cache entries")
+        return evicted
+
+    def _discard(self, path) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
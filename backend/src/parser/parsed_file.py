@@ -0,0 +1,124 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator
+
+FIELDS = ('file', 'language', 'content_hash', 'classes', 'functions', 'imports',
+          'function_calls', 'function_to_function_calls', 'call_sites', 'import_bindings')
+
+
+class ParsedFile(MutableMapping):
+    """Compact parse result for one file.
+
+    Symbol names are interned and stored once per file in `symbols`; classes,
+    functions, calls and call edges are arrays of indices into it, with line
+    numbers in parallel arrays. Call sites are three index arrays (caller,
+    callee, receiver) and import bindings are interned tuples. Reading a key
+    such as 'classes' builds the same list of dicts StaticParser used to
+    return, so existing callers keep working, but nothing is held in that
+    form between reads. Extra keys set by callers (e.g. 'version_status')
+    are kept in a small side dict.
+    """
+    __slots__ = ('file', 'language', 'content_hash', 'symbols', 'class_names', 'class_lines',
+                 'function_names', 'function_lines', 'imports', 'calls', 'edge_callers',
+                 'edge_callees', 'site_callers', 'site_callees', 'site_receivers', 'bindings', 'extra')
+
+    def __init__(self, file: str, language: str, content_hash: str = None):
+        self.file = file
+        self.language = sys.intern(language)
+        self.content_hash = content_hash
+        self.symbols = ()
+        self.class_names, self.class_lines = array('I'), array('I')
+        self.function_names, self.function_lines = array('I'), array('I')
+        self.imports = ()
+        self.calls = array('I')
+        self.edge_callers, self.edge_callees = array('I'), array('I')
+        self.site_callers, self.site_callees, self.site_receivers = array('I'), array('I'), array('I')
+        self.bindings = ()
+        self.extra = None
+
+    @classmethod
+    def from_extracted(cls, file: str, language: str, content_hash: str, extracted: Dict) -> 'ParsedFile':
+        """Build from the dict returned by StaticParser.extract"""
+        parsed = cls(file, language, content_hash)
+        symbols = {}
+
+        def index(name: str) -> int:
+            idx = symbols.get(name)
+            if idx is None:
+                idx = symbols[name] = len(symbols)
+            return idx
+
+        parsed.class_names = array('I', [index(c['name']) for c in extracted.get('classes', ())])
+        parsed.class_lines = array('I', [c.get('line', 0) for c in extracted.get('classes', ())])
+        parsed.function_names = array('I', [index(f['name']) for f in extracted.get('functions', ())])
+        parsed.function_lines = array('I', [f.get('line', 0) for f in extracted.get('functions', ())])
+        parsed.calls = array('I', [index(name) for name in extracted.get('function_calls', ())])
+        edges = extracted.get('function_to_function_calls', ())
+        parsed.edge_callers = array('I', [index(e['caller']) for e in edges])
+        parsed.edge_callees = array('I', [index(e['callee']) for e in edges])
+        sites = extracted.get('call_sites', ())
+        parsed.site_callers = array('I', [index(c['caller']) for c in sites])
+        parsed.site_callees = array('I', [index(c['callee']) for c in sites])
+        parsed.site_receivers = array('I', [index(c['receiver']) for c in sites])
+        parsed.bindings = tuple(
+            (sys.intern(b['name']), sys.intern(b['module']), sys.intern(b['symbol']))
+            for b in extracted.get('import_bindings', ())
+        )
+        parsed.symbols = tuple(sys.intern(name) for name in symbols)
+        parsed.imports = tuple(sys.intern(imp) for imp in extracted.get('imports', ()))
+        return parsed
+
+    def _build(self, key: str):
+        symbols = self.symbols
+        if key == 'classes':
+            return [{'name': symbols[n], 'line': line} for n, line in zip(self.class_names, self.class_lines)]
+        if key == 'functions':
+            return [{'name': symbols[n], 'line': line} for n, line in zip(self.function_names, self.function_lines)]
+        if key == 'imports':
+            return list(self.imports)
+        if key == 'function_calls':
+            return [symbols[n] for n in self.calls]
+        if key == 'function_to_function_calls':
+            return [{'caller': symbols[a], 'callee': symbols[b]} for a, b in zip(self.edge_callers, self.edge_callees)]
+        if key == 'call_sites':
+            return [
+                {'caller': symbols[a], 'callee': symbols[b], 'receiver': symbols[r]}
+                for a, b, r in zip(self.site_callers, self.site_callees, self.site_receivers)
+            ]
+        if key == 'import_bindings':
+            return [{'name': name, 'module': module, 'symbol': symbol} for name, module, symbol in self.bindings]
+        return getattr(self, key)
+
+    def __getitem__(self, key: str):
+        if key in FIELDS:
+            return self._build(key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key in FIELDS:
+            raise KeyError(f"'{key}' is read-only on ParsedFile")
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if not self.extra or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __contains__(self, key) -> bool:
+        return key in FIELDS or bool(self.extra and key in self.extra)
+
+    def __repr__(self) -> str:
+        return f"ParsedFile({self.file!r}, {self.language!r}, {len(self.function_names)} functions)"
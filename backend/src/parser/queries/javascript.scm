@@ -0,0 +1,10 @@
+; Structural extraction queries for JavaScript (see query_extractor.py)
+
+(function_declaration) @function
+
+(import_statement (string) @import)
+
+(import_statement) @import.statement
+
+(call_expression function: (identifier) @call.name) @call
+(call_expression function: (member_expression property: (_) @call.name)) @call
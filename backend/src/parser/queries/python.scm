@@ -0,0 +1,14 @@
+; Structural extraction queries for Python (see query_extractor.py)
+
+(class_definition) @class
+
+(function_definition) @function
+
+(import_statement (dotted_name) @import)
+(import_from_statement (dotted_name) @import)
+
+(import_statement) @import.statement
+(import_from_statement) @import.statement
+
+(call function: (identifier) @call.name) @call
+(call function: (attribute attribute: (identifier) @call.name)) @call
@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Dict, List
+from tree_sitter import Query
+from .symbols import get_call_receiver, get_function_name, get_import_bindings
+
+try:
+    from tree_sitter import QueryCursor
+except ImportError:  # tree-sitter < 0.25 runs matches on the Query itself
+    QueryCursor = None
+
+QUERY_DIR = Path(__file__).parent / 'queries'
+
+
+def _position(node):
+    # Pre-order position: earlier start first, enclosing node before nested one
+    return (node.start_byte, -node.end_byte)
+
+
+class QueryExtractor:
+    """Extraction backend built on precompiled tree-sitter queries.
+
+    Pattern matching runs inside tree-sitter; Python only sorts the captures
+    and attributes calls to their enclosing function. Produces the same
+    output as StaticParser._walk for the same tree.
+    """
+
+    def __init__(self, languages: Dict):
+        self.languages = languages
+        self.queries = {}
+
+    def _get_query(self, language: str) -> Query:
+        query = self.queries.get(language)
+        if query is None:
+            source = (QUERY_DIR / f"{language}.scm").read_text(encoding='utf-8')
+            query = Query(self.languages[language], source)
+            self.queries[language] = query
+        return query
+
+    def _matches(self, query: Query, node) -> List:
+        if QueryCursor is not None:
+            return QueryCursor(query).matches(node)
+        return query.matches(node)
+
+    def extract(self, root, code, language) -> Dict:
+        classes = []
+        functions = []
+        imports = []
+        statements = []
+        calls = []
+        for _, captures in self._matches(self._get_query(language), root):
+            if 'import.statement' in captures:
+                statements.append(captures['import.statement'][0])
+            elif 'call' in captures:
+                calls.append((captures['call'][0], captures['call.name'][0]))
+            elif 'function' in captures:
+                functions.append(captures['function'][0])
+            elif 'class' in captures:
+                classes.append(captures['class'][0])
+            elif 'import' in captures:
+                imports.extend(captures['import'])
+
+        classes.sort(key=_position)
+        functions.sort(key=_position)
+        imports.sort(key=_position)
+        statements.sort(key=_position)
+        calls.sort(key=lambda c: _position(c[0]))
+
+        # Sweep calls against function ranges to find each call's innermost function
+        function_calls = [(get_function_name(fn, code), [], set()) for fn in functions]
+        call_names = []
+        call_sites = []
+        seen_sites = set()
+        stack = []
+        next_fn = 0
+        for call_node, name_node in calls:
+            called = self._get_node_text(name_node, code)
+            if not called:
+                continue
+            call_names.append(called)
+            while next_fn < len(functions) and functions[next_fn].start_byte <= call_node.start_byte:
+                while stack and functions[stack[-1]].end_byte <= functions[next_fn].start_byte:
+                    stack.pop()
+                stack.append(next_fn)
+                next_fn += 1
+            while stack and functions[stack[-1]].end_byte <= call_node.start_byte:
+                stack.pop()
+            caller = ""
+            if stack:
+                caller, callees, seen = function_calls[stack[-1]]
+                if called not in seen:
+                    seen.add(called)
+                    callees.append(called)
+            site = (caller, called, get_call_receiver(call_node, code, language))
+            if site not in seen_sites:
+                seen_sites.add(site)
+                call_sites.append(site)
+
+        import_names = [self._get_node_text(node, code) for node in imports]
+        if language == 'javascript':
+            import_names = [name.strip('"\'') for name in import_names]
+
+        return {
+            'classes': [
+                {'name': self._get_node_text(node.child_by_field_name('name'), code), 'line': node.start_point[0] + 1}
+                for node in classes
+            ],
+            'functions': [
+                {'name': name, 'line': node.start_point[0] + 1}
+                for node, (name, _, _) in zip(functions, function_calls)
+            ],
+            'imports': import_names,
+            'function_calls': call_names,
+            'function_to_function_calls': [
+                {'caller': caller, 'callee': callee}
+                for caller, callees, _ in function_calls
+                for callee in callees
+            ],
+            'call_sites': [
+                {'caller': caller, 'callee': callee, 'receiver': receiver}
+                for caller, callee, receiver in call_sites
+            ],
+            'import_bindings': [
+                {'name': name, 'module': module, 'symbol': symbol}
+                for statement in statements
+                for name, module, symbol in get_import_bindings(statement, code, language)
+            ]
+        }
+
+    def _get_node_text(self, node, code) -> str:
+        if not node:
+            return ""
+        return code[node.start_byte:node.end_byte].decode('utf8')
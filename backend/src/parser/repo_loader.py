@@ -1,87 +1,342 @@
 import os
+import re
+import hashlib
 import subprocess
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+EXCLUDED_DIRS = {'node_modules', 'venv', '__pycache__', '.git', 'dist', 'build'}
+
 class RepositoryLoader:
-    def __init__(self, workspace_dir: str = "./workspace"):
+    """Checks repositories out into the workspace from a local mirror cache.
+
+    Each remote URL gets one bare mirror under <workspace>/.mirrors that is
+    refreshed with `git fetch`, so re-analysis only transfers new objects. The
+    analysed tree is a `git worktree` of that mirror. Mirrors beyond
+    mirror_max_bytes are garbage-collected least recently used first.
+    """
+    
+    def __init__(self, workspace_dir: str = "./workspace", mirror_max_bytes: int = 5 * 1024 ** 3):
         self.workspace_dir = Path(workspace_dir)
         self.workspace_dir.mkdir(exist_ok=True)
+        self.mirror_dir = self.workspace_dir / '.mirrors'
+        self.mirror_max_bytes = mirror_max_bytes
         
     def clone_repository(self, repo_url: str) -> Path:
         if not repo_url:
             raise ValueError("Repository URL cannot be empty")
         
-        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
-        if not repo_name:
-            raise ValueError(f"Could not extract repository name from URL: {repo_url}")
-        
-        target_path = self.workspace_dir / repo_name
+        target_path = self.workspace_path(repo_url)
         
-        logger.info(f"🔄 Starting repository clone: {repo_url}")
+        logger.info(f"🔄 Starting repository checkout: {repo_url}")
         logger.info(f"📁 Target directory: {target_path}")
         
-        if target_path.exists():
-            logger.info(f"⚠️  Directory exists, removing: {target_path}")
-            import shutil
-            import stat
-            import time
-            
-            def remove_readonly(func, path, _):
-                os.chmod(path, stat.S_IWRITE)
-                func(path)
-            
-            try:
-                shutil.rmtree(target_path, onerror=remove_readonly)
-                time.sleep(0.5)  # Wait for filesystem
-            except Exception as e:
-                logger.warning(f"Failed to remove directory: {e}")
-                # Try alternative cleanup
-                try:
-                    subprocess.run(['rmdir', '/S', '/Q', str(target_path)], shell=True, check=False)
-                    time.sleep(0.5)
-                except:
-                    pass
+        mirror_path = self.update_mirror(repo_url)
+        commit = self._git(['rev-parse', 'HEAD^{commit}'], cwd=mirror_path).strip()
+        
+        if self._is_worktree_of(target_path, mirror_path):
+            logger.info(f"♻️ Reusing worktree, checking out {commit[:8]}")
+            self._git(['checkout', '--detach', '--force', commit], cwd=target_path)
+            self._git(['clean', '-ffdx'], cwd=target_path)
+        else:
+            if target_path.exists():
+                logger.info(f"⚠️  Directory exists, removing: {target_path}")
+                self._remove_directory(target_path)
+            self._git(['worktree', 'prune'], cwd=mirror_path)
+            self._git(['worktree', 'add', '--detach', '--force', str(target_path.resolve()), commit], cwd=mirror_path)
+        logger.info(f"✅ Repository checked out to: {target_path}")
+        
+        self.gc_mirrors(keep=mirror_path)
+        return target_path
+    
+    def workspace_path(self, repo_url: str) -> Path:
+        """Directory the repository is (or would be) checked out to"""
+        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
+        if not repo_name:
+            raise ValueError(f"Could not extract repository name from URL: {repo_url}")
+        return self.workspace_dir / repo_name
+    
+    def checked_out_path(self, repo_url: str, commit: str) -> Optional[Path]:
+        """Workspace directory of repo_url if it exists with commit checked out, else None"""
+        target_path = self.workspace_path(repo_url)
+        if not (target_path / '.git').exists():
+            return None
+        try:
+            head = self._git(['rev-parse', 'HEAD'], cwd=target_path, timeout=30).strip()
+        except (RuntimeError, subprocess.TimeoutExpired):
+            return None
+        return target_path if head == commit else None
+    
+    def resolve_remote_head(self, repo_url: str) -> Optional[str]:
+        """Commit the remote HEAD points to, via `git ls-remote`; None if unreachable"""
+        try:
+            output = self._git(['ls-remote', repo_url, 'HEAD'], timeout=30)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"Could not resolve remote HEAD for {repo_url}: {e}")
+            return None
+        for line in output.splitlines():
+            commit, _, ref = line.partition('\t')
+            if ref == 'HEAD' and commit:
+                return commit
+        return None
+    
+    def update_mirror(self, repo_url: str) -> Path:
+        """Create or refresh the bare mirror for repo_url and return its path"""
+        mirror_path = self._mirror_path(repo_url)
+        if (mirror_path / 'HEAD').exists():
+            logger.info("📥 Fetching new objects into mirror cache...")
+            self._git(['fetch', '--prune', '--quiet', 'origin'], cwd=mirror_path)
+        else:
+            if mirror_path.exists():
+                self._remove_directory(mirror_path)  # interrupted clone
+            logger.info("📥 Cloning repository into mirror cache (this may take a few minutes)...")
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = mirror_path.with_name(mirror_path.name + '.tmp')
+            if tmp_path.exists():
+                self._remove_directory(tmp_path)
+            self._git(['clone', '--mirror', '--quiet', repo_url, str(tmp_path)])
+            os.replace(tmp_path, mirror_path)
+        os.utime(mirror_path)  # last-used time for GC
+        return mirror_path
+    
+    def gc_mirrors(self, keep: Path = None) -> int:
+        """Delete least recently used mirrors until the cache fits the quota"""
+        if not self.mirror_dir.exists():
+            return 0
+        mirrors = []
+        total = 0
+        for entry in os.scandir(self.mirror_dir):
+            if entry.is_dir() and entry.name.endswith('.git'):
+                size = self._dir_size(entry.path)
+                mirrors.append((entry.stat().st_mtime, size, Path(entry.path)))
+                total += size
         
-        logger.info("📥 Cloning repository (this may take a few minutes)...")
+        removed = 0
+        for _, size, path in sorted(mirrors):
+            if total <= self.mirror_max_bytes:
+                break
+            if keep and path.resolve() == keep.resolve():
+                continue
+            logger.info(f"   🗑️ Evicting mirror {path.name} ({size / 1024 / 1024:.0f} MiB)")
+            self._remove_directory(path)
+            total -= size
+            removed += 1
+        return removed
+    
+    def _mirror_path(self, repo_url: str) -> Path:
+        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '') or 'repo'
+        url_hash = hashlib.sha256(repo_url.rstrip('/').encode()).hexdigest()[:12]
+        return self.mirror_dir / f"{repo_name}-{url_hash}.git"
+    
+    def _is_worktree_of(self, target_path: Path, mirror_path: Path) -> bool:
+        if not (target_path / '.git').is_file():
+            return False
+        try:
+            common_dir = self._git(['rev-parse', '--git-common-dir'], cwd=target_path).strip()
+        except RuntimeError:
+            return False
+        return (target_path / common_dir).resolve() == mirror_path.resolve()
+    
+    def _git(self, args: List[str], cwd: Path = None, timeout: int = 300) -> str:
         try:
             result = subprocess.run(
-                ['git', 'clone', '--depth', '1', repo_url, str(target_path)],
-                capture_output=True, text=True, timeout=300
+                ['git', *args], cwd=cwd,
+                capture_output=True, text=True, timeout=timeout
             )
-            if result.returncode != 0:
-                raise RuntimeError(f"git clone failed: {result.stderr.strip()}")
         except FileNotFoundError:
             raise RuntimeError(
                 "Git is not installed or not in PATH. "
                 "Please install Git from https://git-scm.com/download/win and restart your terminal."
             )
-        logger.info(f"✅ Repository cloned successfully to: {target_path}")
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+    
+    def _remove_directory(self, path: Path):
+        import shutil
+        import stat
         
-        return target_path
+        def make_writable(func, path, _):
+            # Git marks pack files read-only; POSIX also needs the parent writable
+            for target in (os.path.dirname(path), path):
+                os.chmod(target, os.stat(target).st_mode | stat.S_IRWXU)
+            func(path)
+        
+        try:
+            shutil.rmtree(path, onerror=make_writable)
+        except OSError as e:
+            logger.warning(f"Failed to remove directory {path}: {e}")
+    
+    def _dir_size(self, path: str) -> int:
+        total = 0
+        stack = [path]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+        return total
     
     def scan_files(self, repo_path: Path, extensions: List[str]) -> List[Dict]:
         logger.info(f"🔍 Scanning repository for files with extensions: {extensions}")
+        wanted = set(extensions)
+        relative_paths = self._git_ls_files(repo_path)
+        if relative_paths is None:
+            relative_paths = self._walk_files(repo_path)
+        
         files = []
-        for ext in extensions:
-            for file_path in repo_path.rglob(f"*{ext}"):
-                if self._should_include(file_path):
+        for rel in relative_paths:
+            ext = os.path.splitext(rel)[1]
+            if ext in wanted:
+                rel_path = Path(rel)
+                if self._should_include(rel_path):
                     files.append({
-                        "path": str(file_path),
-                        "relative_path": str(file_path.relative_to(repo_path)),
+                        "path": str(repo_path / rel_path),
+                        "relative_path": str(rel_path),
                         "language": self._detect_language(ext)
                     })
+        files.sort(key=lambda f: f["relative_path"])
         logger.info(f"✅ Found {len(files)} files to analyze")
         return files
     
+    def _git_ls_files(self, repo_path: Path) -> Optional[List[str]]:
+        """List tracked and untracked-but-not-ignored files via git (fast path)"""
+        if not (repo_path / '.git').exists():
+            return None
+        try:
+            result = subprocess.run(
+                ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+                capture_output=True, cwd=repo_path, timeout=60
+            )
+            # --cached still lists tracked files deleted from the worktree
+            deleted = subprocess.run(
+                ['git', 'ls-files', '-z', '--deleted'],
+                capture_output=True, cwd=repo_path, timeout=60
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0 or deleted.returncode != 0:
+            return None
+        paths = result.stdout.decode('utf-8', errors='surrogateescape').split('\0')
+        missing = set(deleted.stdout.decode('utf-8', errors='surrogateescape').split('\0'))
+        return [p for p in dict.fromkeys(paths) if p and p not in missing]
+    
+    def _walk_files(self, repo_path: Path) -> List[str]:
+        """Single os.scandir walk that prunes excluded and gitignored directories"""
+        files = []
+        root_rules = GitIgnore.load(repo_path, '')
+        stack = [(str(repo_path), '', root_rules)]
+        while stack:
+            dir_path, rel_dir, rules = stack.pop()
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError as e:
+                logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+                continue
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name in EXCLUDED_DIRS or rules.is_ignored(rel, True):
+                        continue
+                    stack.append((entry.path, rel, rules.extend(GitIgnore.load(entry.path, rel))))
+                elif not rules.is_ignored(rel, False):
+                    files.append(rel)
+        return files
+    
     def _should_include(self, path: Path) -> bool:
-        exclude = {'node_modules', 'venv', '__pycache__', '.git', 'dist', 'build'}
-        return not any(part in exclude for part in path.parts)
+        return not any(part in EXCLUDED_DIRS for part in path.parts)
     
     def _detect_language(self, ext: str) -> str:
         mapping = {'.py': 'python', '.js': 'javascript', '.java': 'java'}
         return mapping.get(ext, 'unknown')
+
+
+class GitIgnore:
+    """Minimal .gitignore matcher used when git itself is not available"""
+    
+    def __init__(self, rules: List[tuple] = None):
+        self.rules = rules or []  # (regex, negated, dir_only)
+    
+    @classmethod
+    def load(cls, dir_path, rel_dir: str) -> 'GitIgnore':
+        rules = []
+        try:
+            with open(os.path.join(dir_path, '.gitignore'), encoding='utf-8', errors='ignore') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return cls()
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/') if dir_only else line
+            # Patterns with a slash are anchored to the .gitignore's directory
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            prefix = re.escape(f"{rel_dir}/") if rel_dir else ''
+            if not anchored:
+                prefix += '(?:.*/)?'
+            rules.append((re.compile(f"^{prefix}{cls._translate(line)}$"), negated, dir_only))
+        return cls(rules)
+    
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        regex = ''
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                regex += '(?:.*/)?'
+                i += 3
+            elif pattern.startswith('**', i):
+                regex += '.*'
+                i += 2
+            elif pattern[i] == '*':
+                regex += '[^/]*'
+                i += 1
+            elif pattern[i] == '?':
+                regex += '[^/]'
+                i += 1
+            elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+                end = pattern.index(']', i + 1)
+                regex += '[' + pattern[i + 1:end].replace('!', '^', 1) + ']'
+                i = end + 1
+            else:
+                regex += re.escape(pattern[i])
+                i += 1
+        return regex
+    
+    def extend(self, other: 'GitIgnore') -> 'GitIgnore':
+        if not other.rules:
+            return self
+        return GitIgnore(self.rules + other.rules)
+    
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negated
+        return ignored
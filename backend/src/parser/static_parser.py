@@ -3,123 +3,180 @@ import tree_sitter_javascript as tsjavascript
 from tree_sitter import Language, Parser
 from pathlib import Path
 from typing import Dict, List
+import hashlib
+import mmap
+import os
+from .query_extractor import QueryExtractor
+from .parse_cache import ParseCache
+from .parsed_file import ParsedFile
+from .symbols import get_call_receiver, get_function_name, get_import_bindings
+
+# Node types that open a function scope; calls inside are attributed to it
+FUNCTION_TYPES = ('function_definition', 'function_declaration')
+CALL_TYPES = {'python': 'call', 'javascript': 'call_expression'}
+EXTRACTION_BACKENDS = ('walker', 'query')
+# Bump whenever extraction output changes, to invalidate cached parse results
+EXTRACTOR_VERSION = '4'
+# Files at least this large are mapped instead of copied into memory
+MMAP_THRESHOLD = 256 * 1024
+
 
 class StaticParser:
-    def __init__(self):
-        self.parsers = {
-            'python': Parser(Language(tspython.language())),
-            'javascript': Parser(Language(tsjavascript.language()))
+    def __init__(self, backends: Dict[str, str] = None, cache: ParseCache = None):
+        languages = {
+            'python': Language(tspython.language()),
+            'javascript': Language(tsjavascript.language())
         }
-    
-    def parse_file(self, file_path: str, language: str) -> Dict:
-        with open(file_path, 'rb') as f:
-            code = f.read()
-        
+        self.parsers = {name: Parser(lang) for name, lang in languages.items()}
+        # Extraction backend per language: 'walker' (default) or 'query'
+        self.backends = dict(backends or {})
+        for language, backend in self.backends.items():
+            if backend not in EXTRACTION_BACKENDS:
+                raise ValueError(f"Unknown extraction backend '{backend}' for {language}")
+        self.query_extractor = QueryExtractor(languages)
+        self.cache = cache
+
+    def parse_file(self, file_path: str, language: str) -> ParsedFile:
+        """Parse a file into a compact ParsedFile ({} for unsupported languages)"""
         parser = self.parsers.get(language)
         if not parser:
             return {}
-        
+
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                return self._parse_code(file_path, f.read(), language, parser)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as code:
+                return self._parse_code(file_path, code, language, parser)
+
+    def _parse_code(self, file_path: str, code, language: str, parser) -> ParsedFile:
+        content_hash = hashlib.sha256(code).hexdigest()
+        cache_key = None
+        if self.cache:
+            backend = self.backends.get(language, 'walker')
+            cache_key = self.cache.make_key(content_hash, language, backend, EXTRACTOR_VERSION)
+            extracted = self.cache.get(cache_key)
+            if extracted is not None:
+                return ParsedFile.from_extracted(file_path, language, content_hash, extracted)
+
         tree = parser.parse(code)
-        
-        return {
-            'file': file_path,
-            'language': language,
-            'classes': self._extract_classes(tree.root_node, code),
-            'functions': self._extract_functions(tree.root_node, code),
-            'imports': self._extract_imports(tree.root_node, code, language),
-            'function_calls': self._extract_function_calls(tree.root_node, code, language),
-            'function_to_function_calls': self._extract_function_to_function_calls(tree.root_node, code, language)
-        }
-    
-    def _extract_classes(self, node, code) -> List[Dict]:
+        extracted = self.extract(tree.root_node, code, language)
+        if cache_key:
+            self.cache.put(cache_key, extracted)
+
+        return ParsedFile.from_extracted(file_path, language, content_hash, extracted)
+
+    def extract(self, root, code, language) -> Dict:
+        if self.backends.get(language) == 'query':
+            return self.query_extractor.extract(root, code, language)
+        return self._walk(root, code, language)
+
+    def _walk(self, root, code, language) -> Dict:
+        """Collect classes, functions, imports and calls in a single traversal.
+
+        Iterates with a TreeCursor instead of recursing, so arbitrarily deep
+        (e.g. generated) code cannot hit the Python recursion limit. A stack of
+        open function scopes attributes each call to its innermost function.
+        """
         classes = []
-        if node.type == 'class_definition':
-            classes.append({
-                'name': self._get_node_text(node.child_by_field_name('name'), code),
-                'line': node.start_point[0] + 1
-            })
-        for child in node.children:
-            classes.extend(self._extract_classes(child, code))
-        return classes
-    
-    def _extract_functions(self, node, code) -> List[Dict]:
         functions = []
-        if node.type in ('function_definition', 'function_declaration'):
-            functions.append({
-                'name': self._get_node_text(node.child_by_field_name('name'), code),
-                'line': node.start_point[0] + 1
-            })
-        for child in node.children:
-            functions.extend(self._extract_functions(child, code))
-        return functions
-    
-    def _extract_imports(self, node, code, language) -> List[str]:
         imports = []
-        if language == 'python':
-            if node.type == 'import_statement':
-                for child in node.children:
-                    if child.type == 'dotted_name':
-                        imports.append(self._get_node_text(child, code))
-            elif node.type == 'import_from_statement':
-                for child in node.children:
-                    if child.type == 'dotted_name':
-                        imports.append(self._get_node_text(child, code))
-        elif language == 'javascript' and node.type == 'import_statement':
-            for child in node.children:
-                if child.type == 'string':
-                    imports.append(self._get_node_text(child, code).strip('"\'\''))
-        for child in node.children:
-            imports.extend(self._extract_imports(child, code, language))
-        return imports
-    
-    def _extract_function_calls(self, node, code, language) -> List[str]:
-        """Extract function calls from code"""
         calls = []
-        if language == 'python' and node.type == 'call':
-            func_node = node.child_by_field_name('function')
-            if func_node:
-                if func_node.type == 'identifier':
-                    calls.append(self._get_node_text(func_node, code))
-                elif func_node.type == 'attribute':
-                    calls.append(self._get_node_text(func_node, code).split('.')[-1])
-        elif language == 'javascript' and node.type == 'call_expression':
-            func_node = node.child_by_field_name('function')
-            if func_node:
-                if func_node.type == 'identifier':
-                    calls.append(self._get_node_text(func_node, code))
-                elif func_node.type == 'member_expression':
-                    prop = func_node.child_by_field_name('property')
-                    if prop:
-                        calls.append(self._get_node_text(prop, code))
-        for child in node.children:
-            calls.extend(self._extract_function_calls(child, code, language))
-        return calls
-    
+        scopes = []  # (depth, callee list, seen callees, name) of open functions
+        function_calls = []  # (caller, callee list) in definition order
+        call_sites = []  # unique (caller, callee, receiver) in source order
+        seen_sites = set()
+        bindings = []
+        call_type = CALL_TYPES.get(language)
+
+        cursor = root.walk()
+        depth = 0
+        while True:
+            node = cursor.node
+            node_type = node.type
+
+            if node_type == call_type:
+                called = self._get_called_name(node, code, language)
+                if called:
+                    calls.append(called)
+                    caller = ""
+                    if scopes:
+                        _, callees, seen, caller = scopes[-1]
+                        if called not in seen:
+                            seen.add(called)
+                            callees.append(called)
+                    site = (caller, called, get_call_receiver(node, code, language))
+                    if site not in seen_sites:
+                        seen_sites.add(site)
+                        call_sites.append(site)
+            elif node_type in FUNCTION_TYPES:
+                name = get_function_name(node, code)
+                functions.append({'name': name, 'line': node.start_point[0] + 1})
+                callees = []
+                scopes.append((depth, callees, set(), name))
+                function_calls.append((name, callees))
+            elif node_type == 'class_definition':
+                classes.append({
+                    'name': self._get_node_text(node.child_by_field_name('name'), code),
+                    'line': node.start_point[0] + 1
+                })
+            elif node_type == 'import_statement' or node_type == 'import_from_statement':
+                imports.extend(self._get_imported_modules(node, code, language))
+                bindings.extend(get_import_bindings(node, code, language))
+
+            if cursor.goto_first_child():
+                depth += 1
+                continue
+            if scopes and scopes[-1][0] == depth:
+                scopes.pop()  # childless function node
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return {
+                        'classes': classes,
+                        'functions': functions,
+                        'imports': imports,
+                        'function_calls': calls,
+                        'function_to_function_calls': [
+                            {'caller': caller, 'callee': callee}
+                            for caller, callees in function_calls
+                            for callee in callees
+                        ],
+                        'call_sites': [
+                            {'caller': caller, 'callee': callee, 'receiver': receiver}
+                            for caller, callee, receiver in call_sites
+                        ],
+                        'import_bindings': [
+                            {'name': name, 'module': module, 'symbol': symbol}
+                            for name, module, symbol in bindings
+                        ]
+                    }
+                depth -= 1
+                if scopes and scopes[-1][0] == depth:
+                    scopes.pop()
+
+    def _get_imported_modules(self, node, code, language) -> List[str]:
+        if language == 'python':
+            return [self._get_node_text(child, code) for child in node.children if child.type == 'dotted_name']
+        if language == 'javascript' and node.type == 'import_statement':
+            return [
+                self._get_node_text(child, code).strip('"\'\'')
+                for child in node.children if child.type == 'string'
+            ]
+        return []
+
+    def _get_called_name(self, node, code, language) -> str:
+        """Name of the function invoked by a call node (last attribute for method calls)"""
+        func_node = node.child_by_field_name('function')
+        if not func_node:
+            return ""
+        if func_node.type == 'identifier':
+            return self._get_node_text(func_node, code)
+        if language == 'python' and func_node.type == 'attribute':
+            return self._get_node_text(func_node, code).split('.')[-1]
+        if language == 'javascript' and func_node.type == 'member_expression':
+            return self._get_node_text(func_node.child_by_field_name('property'), code)
+        return ""
+
     def _get_node_text(self, node, code) -> str:
         if not node:
             return ""
         return code[node.start_byte:node.end_byte].decode('utf8')
-    
-    def _extract_function_to_function_calls(self, node, code, language) -> List[Dict]:
-        """Extract which functions call which other functions"""
-        result = []
-        
-        if language == 'python':
-            if node.type == 'function_definition':
-                func_name = self._get_node_text(node.child_by_field_name('name'), code)
-                calls = self._extract_function_calls(node, code, language)
-                for called in set(calls):
-                    result.append({'caller': func_name, 'callee': called})
-        elif language == 'javascript':
-            if node.type == 'function_declaration':
-                func_name = self._get_node_text(node.child_by_field_name('name'), code)
-                calls = self._extract_function_calls(node, code, language)
-                for called in set(calls):
-                    result.append({'caller': func_name, 'callee': called})
-        
-        for child in node.children:
-            if child.type in ('function_definition', 'function_declaration'):
-                continue  # Each nested function is handled in its own recursion pass
-            result.extend(self._extract_function_to_function_calls(child, code, language))
-        
-        return result
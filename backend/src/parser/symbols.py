@@ -0,0 +1,95 @@
+import re
+from typing import List, Tuple
+
+# Receivers we can resolve statically: plain names and dotted name chains
+_DOTTED_NAME = re.compile(r'^[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*$')
+_WHITESPACE = re.compile(r'\s+')
+UNKNOWN_RECEIVER = '?'
+# Constructor names, stored qualified with their class (`Foo.__init__`)
+CONSTRUCTORS = ('__init__', 'constructor')
+_CLASS_BODIES = ('block', 'class_body')
+_CLASS_TYPES = ('class_definition', 'class_declaration', 'class')
+
+
+def _text(node, code) -> str:
+    if not node:
+        return ""
+    return code[node.start_byte:node.end_byte].decode('utf8')
+
+
+def get_function_name(node, code) -> str:
+    """Name a function definition is stored under.
+
+    Functions are keyed by (file, name), so a constructor is qualified with
+    the class that defines it; every other function keeps its plain name.
+    """
+    name = _text(node.child_by_field_name('name'), code)
+    if name not in CONSTRUCTORS:
+        return name
+    parent = node.parent
+    if parent is not None and parent.type == 'decorated_definition':
+        parent = parent.parent
+    if parent is None or parent.type not in _CLASS_BODIES:
+        return name
+    owner = parent.parent
+    if owner is None or owner.type not in _CLASS_TYPES:
+        return name
+    class_name = _text(owner.child_by_field_name('name'), code)
+    return f"{class_name}.{name}" if class_name else name
+
+
+def get_call_receiver(call_node, code, language) -> str:
+    """Object a call is made on: '' for `f()`, 'a.b' for `a.b.f()`, '?' if not a name chain"""
+    func_node = call_node.child_by_field_name('function')
+    if not func_node or func_node.type == 'identifier':
+        return ""
+    if func_node.type not in ('attribute', 'member_expression'):
+        return UNKNOWN_RECEIVER
+    receiver = _WHITESPACE.sub('', _text(func_node.child_by_field_name('object'), code))
+    return receiver if _DOTTED_NAME.match(receiver) else UNKNOWN_RECEIVER
+
+
+def get_import_bindings(node, code, language) -> List[Tuple[str, str, str]]:
+    """Local names bound by an import statement as (name, module, symbol).
+
+    symbol is '' when the name refers to the module itself
+    (`import a.b`, `import * as ns from 'm'`).
+    """
+    bindings = []
+    if language == 'python':
+        if node.type == 'import_statement':
+            for child in node.children_by_field_name('name'):
+                if child.type == 'aliased_import':
+                    module = _text(child.child_by_field_name('name'), code)
+                    bindings.append((_text(child.child_by_field_name('alias'), code), module, ''))
+                else:
+                    module = _text(child, code)
+                    bindings.append((module, module, ''))
+        elif node.type == 'import_from_statement':
+            module = _WHITESPACE.sub('', _text(node.child_by_field_name('module_name'), code))
+            for child in node.children_by_field_name('name'):
+                if child.type == 'aliased_import':
+                    symbol = _text(child.child_by_field_name('name'), code)
+                    bindings.append((_text(child.child_by_field_name('alias'), code), module, symbol))
+                else:
+                    symbol = _text(child, code)
+                    bindings.append((symbol, module, symbol))
+    elif language == 'javascript' and node.type == 'import_statement':
+        module = _text(node.child_by_field_name('source'), code).strip('"\'`')
+        for clause in node.children:
+            if clause.type != 'import_clause':
+                continue
+            for child in clause.children:
+                if child.type == 'identifier':
+                    bindings.append((_text(child, code), module, 'default'))
+                elif child.type == 'namespace_import':
+                    for name in child.children:
+                        if name.type == 'identifier':
+                            bindings.append((_text(name, code), module, ''))
+                elif child.type == 'named_imports':
+                    for spec in child.children:
+                        if spec.type == 'import_specifier':
+                            symbol = _text(spec.child_by_field_name('name'), code)
+                            alias = spec.child_by_field_name('alias')
+                            bindings.append((_text(alias, code) if alias else symbol, module, symbol))
+    return bindings
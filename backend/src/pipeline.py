@@ -0,0 +1,94 @@
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # end-of-stream marker passed between stages
+
+
+class Stage:
+    """One pipeline step: `func(item)` runs on `workers` threads.
+
+    func returns the item to hand to the next stage, or None to drop it.
+    """
+
+    def __init__(self, name: str, func: Callable, workers: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """Runs items through stages connected by bounded queues.
+
+    Every stage runs concurrently on its own threads, so slow I/O stages
+    (Neo4j, Chroma) overlap with the producer and with each other. When a
+    queue is full the upstream stage blocks, which keeps memory bounded no
+    matter how far ahead the producer gets. An item whose stage raises is
+    dropped and reported in `errors`; the other items keep flowing.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 64):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.errors: List[Dict] = []
+        self._errors_lock = threading.Lock()
+
+    def run(self, source: Iterable, describe: Callable = str) -> List[Dict]:
+        """Feed every item from source through all stages; blocks until drained"""
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            remaining = [stage.workers]  # workers still running, shared by the stage
+            lock = threading.Lock()
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, inbox, outbox, remaining, lock, describe),
+                    name=f"{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in source:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        return self.errors
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox, remaining: List[int],
+              lock: threading.Lock, describe: Callable):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                name = describe(item)
+                logger.warning(f"   ⚠ {stage.name} failed for {name}: {e}")
+                with self._errors_lock:
+                    self.errors.append({'file': name, 'stage': stage.name, 'error': f"{type(e).__name__}: {e}"})
+                continue
+            if outbox is not None and result is not None:
+                outbox.put(result)
+
+        # The last worker of a stage to finish closes the next stage
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            for _ in range(self._next_workers(stage)):
+                outbox.put(_DONE)
+
+    def _next_workers(self, stage: Stage) -> int:
+        return self.stages[self.stages.index(stage) + 1].workers
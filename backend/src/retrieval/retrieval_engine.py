@@ -1,19 +1,19 @@
 from typing import List, Dict, Set
 from .vector_store import VectorStore
-from ..graph.graph_db import GraphDB
+from ..graph.graph_store import GraphStore
 
 class RetrievalEngine:
-    def __init__(self, vector_store: VectorStore, graph_db: GraphDB):
+    def __init__(self, vector_store: VectorStore, graph_db: GraphStore):
         self.vector_store = vector_store
         self.graph_db = graph_db
     
-    def retrieve_evidence(self, query: str, context_file: str = None) -> Dict:
-        semantic_results = self.vector_store.search(query, n_results=10)
+    def retrieve_evidence(self, query: str, context_file: str = None, repo_id: str = None) -> Dict:
+        semantic_results = self.vector_store.search(repo_id, query, n_results=10)
         
         structural_context = set()
         if context_file:
-            deps = self.graph_db.get_dependencies(context_file)
-            affected = self.graph_db.get_affected_files(context_file)
+            deps = self.graph_db.get_dependencies(context_file, repo_id)
+            affected = self.graph_db.get_affected_files(context_file, repo_id)
             structural_context = set(deps + affected)
         
         evidence = self._merge_results(semantic_results, structural_context)
@@ -1,34 +1,71 @@
 import chromadb
-from typing import List, Dict
+from typing import Dict, Iterable, List, Tuple
 
 class VectorStore:
+    """Code embeddings, one Chroma collection per repository.
+    
+    Re-analyzing or deleting a repository only touches its own collection,
+    so other repositories keep their embeddings and semantic search.
+    """
+    
     def __init__(self, persist_directory: str):
         self.client = chromadb.PersistentClient(path=persist_directory)
-        self.collection = self.client.get_or_create_collection(
-            name="code_embeddings",
-            metadata={"hnsw:space": "cosine"}
-        )
+        self.collections = {}
+    
+    @staticmethod
+    def collection_name(repo_id: str) -> str:
+        return f"code_embeddings_{repo_id}"
     
-    def add_code_chunk(self, chunk_id: str, code: str, metadata: Dict):
-        self.collection.add(
+    def collection(self, repo_id: str):
+        collection = self.collections.get(repo_id)
+        if collection is None:
+            collection = self.client.get_or_create_collection(
+                name=self.collection_name(repo_id),
+                metadata={"hnsw:space": "cosine"}
+            )
+            self.collections[repo_id] = collection
+        return collection
+    
+    def add_code_chunk(self, repo_id: str, chunk_id: str, code: str, metadata: Dict):
+        # Upsert: a modified file replaces its previous chunk
+        self.collection(repo_id).upsert(
             ids=[chunk_id],
             documents=[code],
             metadatas=[metadata]
         )
     
-    def add_batch(self, chunks: List[Dict]):
+    def add_batch(self, repo_id: str, chunks: List[Dict]):
         ids = [c['id'] for c in chunks]
         documents = [c['code'] for c in chunks]
         metadatas = [c['metadata'] for c in chunks]
         
-        self.collection.add(
+        self.collection(repo_id).upsert(
             ids=ids,
             documents=documents,
             metadatas=metadatas
         )
     
-    def search(self, query: str, n_results: int = 5) -> List[Dict]:
-        results = self.collection.query(
+    def get_chunk_hashes(self, repo_id: str) -> Dict[str, Tuple[str, str]]:
+        """Chunk id -> (content_hash, extractor_version) metadata of a repo's stored chunks"""
+        stored = self.collection(repo_id).get(include=['metadatas'])
+        return {
+            chunk_id: ((metadata or {}).get('content_hash', ''), (metadata or {}).get('extractor_version'))
+            for chunk_id, metadata in zip(stored['ids'], stored['metadatas'])
+        }
+    
+    def delete_chunks(self, repo_id: str, chunk_ids: Iterable[str]):
+        chunk_ids = list(chunk_ids)
+        if chunk_ids:
+            self.collection(repo_id).delete(ids=chunk_ids)
+    
+    def search(self, repo_id: str, query: str, n_results: int = 5) -> List[Dict]:
+        if not repo_id:
+            return []
+        collection = self.collection(repo_id)
+        n_results = min(n_results, collection.count())
+        if n_results == 0:
+            return []
+        results = collection.query(
             query_texts=[query],
             n_results=n_results
         )
@@ -43,9 +80,10 @@ class VectorStore:
             for i in range(len(results['ids'][0]))
         ]
     
-    def clear(self):
-        self.client.delete_collection("code_embeddings")
-        self.collection = self.client.get_or_create_collection(
-            name="code_embeddings",
-            metadata={"hnsw:space": "cosine"}
-        )
+    def drop_repo(self, repo_id: str):
+        """Delete a repository's collection (recreated empty on next use)"""
+        self.collections.pop(repo_id, None)
+        try:
+            self.client.delete_collection(self.collection_name(repo_id))
+        except Exception:
+            pass  # never had embeddings
@@ -0,0 +1,47 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the backend as `src.*`, like main.py and the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Required settings without defaults, so src.config imports; the environment wins
+for name, value in (
+    ("NEO4J_URI", "bolt://localhost:7687"),
+    ("NEO4J_USER", "neo4j"),
+    ("NEO4J_PASSWORD", "password"),
+    ("CHROMA_PATH", "./chroma_db"),
+    ("GROQ_API_KEY", "unused"),
+):
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture(scope="session")
+def neo4j_driver():
+    """Driver for the Neo4j at NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD; skips when unreachable"""
+    neo4j = pytest.importorskip("neo4j")
+    driver = neo4j.GraphDatabase.driver(
+        os.environ.get("NEO4J_URI", "bolt://localhost:7687"),
+        auth=(os.environ.get("NEO4J_USER", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password"))
+    )
+    try:
+        driver.verify_connectivity()
+    except Exception as e:
+        driver.close()
+        pytest.skip(f"Neo4j not reachable: {e}")
+    yield driver
+    driver.close()
+
+
+@pytest.fixture
+def engine():
+    """AnalysisEngine whose code graph is an in-memory EmbeddedGraphDB"""
+    pytest.importorskip("pydantic_settings")
+    from src.analysis_engine import AnalysisEngine
+    from src.graph.embedded_graph_db import EmbeddedGraphDB
+    engine = AnalysisEngine()
+    engine.graph_db = EmbeddedGraphDB()
+    yield engine
+    engine.graph_db.close()
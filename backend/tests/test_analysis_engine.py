@@ -0,0 +1,156 @@
+"""Engine ingestion stages on the embedded graph store"""
+from pathlib import Path
+
+import pytest
+
+from src.graph.blast_radius import BlastRadiusAnalyzer
+from src.parser.repo_loader import RepositoryLoader
+from src.parser.static_parser import StaticParser
+from test_repo_loader import commit, git, make_remote
+
+SOURCES = {
+    'app.py': 'from service import handle\n\n\ndef run():\n    return handle()\n',
+    'service.py': 'from store import load\n\n\ndef handle():\n    return load()\n',
+    'store.py': 'def load():\n    return read()\n\n\ndef read():\n    return 1\n',
+}
+
+
+def write_repo(root: Path):
+    for name, text in SOURCES.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+
+
+def analyze(engine, repo: Path, repo_id: str = 'repo'):
+    """The graph stages of AnalysisEngine._full_analysis, in order"""
+    engine.current_repo_id = repo_id
+    engine.stored_file_hashes = engine.graph_db.get_file_hashes(repo_id)
+    engine.graph_diff = {'added': [], 'modified': [], 'unchanged': []}
+    parser = StaticParser()
+    files = engine.repo_loader.scan_files(repo, ['.py'])
+    parsed_files = [parser.parse_file(f['path'], f['language']) for f in files]
+    for parsed in parsed_files:
+        engine._store_in_graph(parsed)
+    engine._remove_deleted_files()
+    engine.dependency_mapper.build_graph(parsed_files)
+    function_calls = engine._store_call_graph(parsed_files)
+    engine._store_dependencies_in_neo4j()
+    engine.graph_db.get_path_index(repo_id, rebuild=True)
+    engine._store_transitive_calls(function_calls)
+    engine.blast_radius_analyzer = BlastRadiusAnalyzer(
+        engine.dependency_mapper, engine.graph_db, engine.get_call_reachability
+    )
+
+
+def test_transitive_callers_right_after_analysis(engine, tmp_path, monkeypatch):
+    # Checkouts live under the relative ./workspace, so parsed paths are relative
+    monkeypatch.chdir(tmp_path)
+    write_repo(Path('workspace/proj'))
+    analyze(engine, Path('workspace/proj'))
+    stored = {name: str((tmp_path / 'workspace/proj' / name).resolve()) for name in SOURCES}
+
+    reachability = engine.call_reachability
+    assert sorted(reachability.callers((stored['store.py'], 'read'))) == [
+        (stored['app.py'], 'run'), (stored['service.py'], 'handle')
+    ]
+    assert reachability.callers((stored['store.py'], 'load')) == [(stored['app.py'], 'run')]
+
+    # Same lookups as analyze_function / blast radius, with the stored path
+    info = engine.graph_db.get_function_info('load')
+    assert reachability.callers((info['file'], 'load')) == [(stored['app.py'], 'run')]
+    impact = engine.blast_radius_analyzer._get_function_impact(stored['store.py'], 'repo')
+    assert impact['transitive_callers'] == [stored['app.py']]
+
+    # A reload from the stored CALLS edges gives the same index
+    engine.call_reachability = None
+    assert sorted(engine.get_call_reachability().pairs()) == sorted(reachability.pairs())
+
+
+class ChunkStore:
+    """VectorStore stand-in; chunk writes are not what these tests check"""
+
+    def get_chunk_hashes(self, repo_id):
+        return {}
+
+    def add_code_chunk(self, *args, **kwargs):
+        pass
+
+    def delete_chunks(self, *args, **kwargs):
+        pass
+
+    def drop_repo(self, repo_id):
+        pass
+
+
+def test_embedded_backend_serves_the_snapshot_cache(neo4j_driver, engine, tmp_path, monkeypatch):
+    # Snapshots stay in Neo4j; their file links live in the embedded store
+    url, _ = make_remote(tmp_path, 'project', SOURCES)
+    engine.repo_loader = RepositoryLoader(str(tmp_path / 'workspace'))
+    engine.vector_store = ChunkStore()
+    monkeypatch.setattr(engine, '_generate_and_cache_architecture',
+                        lambda: {'macro': 'layered', 'meso': '', 'micro': ''})
+    first = engine.analyze_repository(url)
+    try:
+        assert first['status'] == 'completed'
+        assert engine.graph_db.count_snapshot_files(engine.current_snapshot_id) == len(SOURCES)
+
+        reanalyzed = []
+        monkeypatch.setattr(engine, '_full_analysis', lambda *args: reanalyzed.append(args))
+        second = engine.analyze_repository(url)
+        assert second['cached'] is True and not reanalyzed
+        assert second['total_files'] == len(SOURCES)
+    finally:
+        with neo4j_driver.session() as session:
+            session.run("""
+                MATCH (r:Repository {repo_id: $repo_id})
+                OPTIONAL MATCH (r)-[:HAS_SNAPSHOT|HAS_COMMIT|CONTAINS]->(n)
+                OPTIONAL MATCH (n)-[:HAS_VERSION]->(v)
+                DETACH DELETE r, n, v
+                """, repo_id=first['repo_id'])
+
+
+def test_transitive_callers_from_the_graph_above_the_size_cap(engine, tmp_path, monkeypatch):
+    from src.config import settings
+    from src.graph.call_closure import GraphCallReachability
+    monkeypatch.setattr(settings, 'transitive_call_max_functions', 3)
+    monkeypatch.chdir(tmp_path)
+    write_repo(Path('workspace/proj'))
+    analyze(engine, Path('workspace/proj'))
+    stored = {name: str((tmp_path / 'workspace/proj' / name).resolve()) for name in SOURCES}
+
+    reachability = engine.get_call_reachability()
+    assert isinstance(reachability, GraphCallReachability)
+    assert reachability.callers((stored['store.py'], 'read')) == [
+        (stored['app.py'], 'run'), (stored['service.py'], 'handle')
+    ]
+    impact = engine.blast_radius_analyzer._get_function_impact(stored['store.py'], 'repo')
+    assert impact['transitive_callers'] == [stored['app.py']]
+
+
+class Cloned(Exception):
+    pass
+
+
+def test_unchanged_remote_head_skips_the_clone(engine, tmp_path, monkeypatch):
+    url, work = make_remote(tmp_path, 'project', SOURCES)
+    engine.repo_loader = RepositoryLoader(str(tmp_path / 'workspace'))
+    head = engine.repo_loader.resolve_remote_head(url)
+    snapshot = {'snapshot_id': 's1', 'total_files': len(SOURCES), 'patterns': {'layered': {}},
+                'coupling': {}, 'arch_macro': 'layered', 'architecture': {'macro': 'layered'}}
+    lookups = []
+    monkeypatch.setattr(engine, '_get_cached_snapshot',
+                        lambda repo_id, commit: lookups.append(commit) or (snapshot if commit == head else None))
+    monkeypatch.setattr(engine.repo_loader, 'clone_repository', lambda url: (_ for _ in ()).throw(Cloned()))
+    monkeypatch.setattr(engine, '_rebuild_from_cache', lambda repo_id: None)
+    monkeypatch.setattr(engine, '_compute_arch_stats', lambda: {})
+
+    result = engine.analyze_repository(url)
+    assert result['cached'] is True and result['repo_path'] is None
+    assert result['total_files'] == len(SOURCES) and lookups == [head]
+
+    # A new commit on the remote misses the cache and clones
+    (work / 'app.py').write_text('def run():\n    return 2\n')
+    commit(work, 'second')
+    git(work, 'push', '-q', 'origin', 'HEAD')
+    with pytest.raises(Cloned):
+        engine.analyze_repository(url)
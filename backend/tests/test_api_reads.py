@@ -0,0 +1,74 @@
+"""Async read routes of main.py, against stand-ins for the graph stores"""
+import asyncio
+
+import pytest
+
+pytest.importorskip('fastapi')
+import main
+from src.config import settings
+from src.graph.embedded_graph_db import EmbeddedGraphDB
+
+A, B = '/repo/src/a.py', '/repo/src/b.py'
+
+
+class FakeAsyncGraphDB:
+    """AsyncGraphDB stand-in; get_commits waits until both requests are in flight"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.both_started = asyncio.Event()
+
+    async def get_commits(self, repo_id):
+        self.in_flight += 1
+        if self.in_flight == 2:
+            self.both_started.set()
+        await asyncio.wait_for(self.both_started.wait(), timeout=5)
+        return [{'repo_id': repo_id, 'hash': 'c1'}]
+
+    async def get_commit_file_hashes(self, repo_id, commit1, commit2):
+        return [{'path': 'added.py', 'hash1': None, 'hash2': 'h'},
+                {'path': 'removed.py', 'hash1': 'h', 'hash2': None},
+                {'path': 'changed.py', 'hash1': 'h1', 'hash2': 'h2'},
+                {'path': 'same.py', 'hash1': 'h', 'hash2': 'h'}]
+
+    async def resolve_file_path(self, graph_db, file_path, repo_id=None):
+        return A if file_path == 'src/a.py' else file_path
+
+    async def get_dependencies(self, path):
+        return [B] if path == A else []
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setitem(main.engine.__dict__, 'async_graph_db', FakeAsyncGraphDB())
+    monkeypatch.setattr(main.engine, 'current_repo_id', 'repo')
+    return main
+
+
+def test_reads_await_without_blocking_each_other(api):
+    async def both():
+        return await asyncio.gather(api.get_commits('r1'), api.get_commits('r2'))
+
+    # Each call only returns once the other has started, so they must interleave
+    assert asyncio.run(both()) == [[{'repo_id': 'r1', 'hash': 'c1'}], [{'repo_id': 'r2', 'hash': 'c1'}]]
+
+
+def test_compare_commits_from_awaited_hashes(api):
+    result = asyncio.run(api.compare_commits('repo', 'aaaaaaaaaa', 'bbbbbbbbbb'))
+    assert (result['added'], result['removed'], result['modified']) == (['added.py'], ['removed.py'], ['changed.py'])
+    assert result['commit1'] == 'aaaaaaaa' and result['summary']['total_changes'] == 3
+
+
+def test_dependencies_on_either_backend(api, monkeypatch):
+    monkeypatch.setattr(settings, 'graph_backend', 'neo4j')
+    monkeypatch.setitem(main.engine.__dict__, 'graph_db', object())  # only handed to the async layer
+    assert asyncio.run(api.get_dependencies('src/a.py')) == {'file': 'src/a.py', 'dependencies': [B]}
+
+    store = EmbeddedGraphDB()
+    with store.batch_writer() as writer:
+        store.bulk_create_files([{'path': A, 'language': 'python'}, {'path': B, 'language': 'python'}], 'repo', writer)
+    store.sync_dependencies('repo', [(A, B)])
+    monkeypatch.setattr(settings, 'graph_backend', 'embedded')
+    monkeypatch.setitem(main.engine.__dict__, 'graph_db', store)
+    assert asyncio.run(api.get_dependencies('src/a.py')) == {'file': 'src/a.py', 'dependencies': [B]}
+    store.close()
@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip('neo4j')
+from neo4j.exceptions import ClientError, TransientError
+
+from src.graph.batch_writer import BatchWriter, run_with_retry
+
+
+class FlakyDriver:
+    """Driver stand-in: records committed transactions; the first `failures`
+    transactions raise `error` after running their statements"""
+
+    def __init__(self, failures=0, error=TransientError):
+        self.failures = failures
+        self.error = error
+        self.attempts = []
+        self.committed = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work):
+        ran = []
+        work(Transaction(ran))
+        self.attempts.append(ran)
+        if self.failures:
+            self.failures -= 1
+            raise self.error('deadlock detected')
+        self.committed.append(ran)
+
+
+class Transaction:
+    def __init__(self, ran):
+        self.ran = ran
+
+    def run(self, query, **params):
+        self.ran.append((query, params['n']))
+        return self
+
+    def consume(self):
+        pass
+
+
+def test_statements_commit_in_batches_and_flush_on_exit():
+    driver = FlakyDriver()
+    with BatchWriter(driver, batch_size=3, backoff=0) as writer:
+        for n in range(7):
+            writer.add('MERGE (x {n: $n})', n=n)
+        assert len(driver.committed) == 2
+    assert [[n for _, n in batch] for batch in driver.committed] == [[0, 1, 2], [3, 4, 5], [6]]
+    assert (writer.statements, writer.transactions) == (7, 3)
+
+
+def test_transient_errors_retry_the_whole_batch():
+    driver = FlakyDriver(failures=2)
+    with BatchWriter(driver, batch_size=2, backoff=0) as writer:
+        writer.add('q', n=1)
+        writer.add('q', n=2)
+    assert [[n for _, n in batch] for batch in driver.attempts] == [[1, 2]] * 3
+    assert driver.committed == [[('q', 1), ('q', 2)]]
+    assert writer.transactions == 1
+
+
+def test_retries_give_up_and_other_errors_are_not_retried():
+    driver = FlakyDriver(failures=3)
+    writer = BatchWriter(driver, batch_size=10, max_retries=2, backoff=0)
+    writer.add('q', n=1)
+    with pytest.raises(TransientError):
+        writer.flush()
+    assert len(driver.attempts) == 3 and writer.statements == 0
+
+    driver = FlakyDriver(failures=1, error=ClientError)
+    with pytest.raises(ClientError):
+        run_with_retry(lambda: driver.execute_write(lambda tx: None), backoff=0)
+    assert len(driver.attempts) == 1
@@ -0,0 +1,79 @@
+import csv
+
+from src.graph.bulk_loader import LOAD_STATEMENTS, TABLES, CSVBulkLoader
+from src.graph.embedded_graph_db import EmbeddedGraphDB
+from src.parser.parsed_file import ParsedFile
+
+A, B = '/repo/a.py', '/repo/b.py'
+
+
+class RecordingSession:
+    def __init__(self, runs):
+        self.runs = runs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.runs.append((query, params))
+        return self
+
+    def consume(self):
+        pass
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.runs = []
+
+    def session(self):
+        return RecordingSession(self.runs)
+
+
+def read_table(loader, table):
+    with open(loader.directory / TABLES[table][0], newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_rows_are_written_as_csv_and_loaded_in_order(tmp_path):
+    graph_db = EmbeddedGraphDB()
+    graph_db.driver = RecordingDriver()
+    loader = CSVBulkLoader(graph_db, str(tmp_path), url_prefix='file:///', batch_size=500)
+    loader.add_parsed(ParsedFile.from_extracted(A, 'python', 'ha', {
+        'classes': [{'name': 'Store', 'line': 2}],
+        'functions': [{'name': 'run', 'line': 5}],
+        'imports': ['os'],
+    }), extractor_version='4')
+    loader.add_parsed(ParsedFile.from_extracted(B, 'python', 'hb', {'functions': [{'name': 'load', 'line': 1}]}))
+    loader.add_dependencies([(A, B)])
+    loader.add_calls([(A, B, 'load')], [(A, 'run', B, 'load')])
+
+    counts = loader.load('repo')
+    assert counts == {'files': 2, 'classes': 1, 'functions': 2, 'imports': 1,
+                      'depends_on': 1, 'calls': 1, 'function_calls': 1}
+    assert read_table(loader, 'files') == [TABLES['files'][1], [A, A, 'python', 'ha', '4'], [B, B, 'python', 'hb', '']]
+    assert read_table(loader, 'functions') == [TABLES['functions'][1], [A, 'run', '5'], [B, 'load', '1']]
+    assert read_table(loader, 'function_calls') == [TABLES['function_calls'][1], [A, 'run', B, 'load']]
+
+    # One LOAD CSV per table, nodes before relationships, committed in batches
+    runs = graph_db.driver.runs
+    assert [params['url'] for _, params in runs] == [
+        f"file:///bulk/{TABLES[table][0]}" for table, _ in LOAD_STATEMENTS
+    ]
+    assert all(params['repo_id'] == 'repo' and 'IN TRANSACTIONS OF 500 ROWS' in query for query, params in runs)
+
+    loader.cleanup()
+    assert not loader.directory.exists()
+
+
+def test_empty_tables_are_not_loaded(tmp_path):
+    graph_db = EmbeddedGraphDB()
+    graph_db.driver = RecordingDriver()
+    loader = CSVBulkLoader(graph_db, str(tmp_path), url_prefix='file:///import')
+    loader.add_parsed(ParsedFile.from_extracted(A, 'python', 'ha', {}))
+    loader.load('repo')
+    assert [params['url'] for _, params in graph_db.driver.runs] == ['file:///import/bulk/files.csv']
+    loader.cleanup()
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from src.graph.call_closure import CallReachability
+
+
+def brute_force(edges, max_depth):
+    """Functions reachable from each node by a walk of 2..max_depth calls"""
+    successors = {}
+    for a, b in edges:
+        successors.setdefault(a, set()).add(b)
+        successors.setdefault(b, set())
+    limit = max_depth if max_depth > 0 else len(successors) + 1
+    reach = {}
+    for start in successors:
+        frontier, found = set(successors[start]), set()
+        for _ in range(2, limit + 1):
+            frontier = set().union(*(successors[v] for v in frontier)) if frontier else set()
+            found |= frontier
+        reach[start] = found
+    return reach
+
+
+def random_edges(rng, n, m, acyclic):
+    edges = set()
+    while len(edges) < m:
+        a, b = rng.randrange(n), rng.randrange(n)
+        if acyclic and a >= b:
+            continue
+        edges.add((f"f{a}", f"f{b}"))
+    return sorted(edges)
+
+
+@pytest.mark.parametrize("max_depth", [0, 2, 3, 5])
+@pytest.mark.parametrize("acyclic", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_walk(seed, acyclic, max_depth):
+    rng = random.Random(seed)
+    edges = random_edges(rng, 40, rng.randrange(20, 90), acyclic)
+    reachability = CallReachability(edges, max_depth)
+    expected = brute_force(edges, max_depth)
+
+    for node, reached in expected.items():
+        assert set(reachability.reachable(node)) == reached
+        assert set(reachability.callers(node)) == {v for v, r in expected.items() if node in r}
+    assert set(reachability.pairs()) == {(v, u) for v, r in expected.items() for u in r}
+    assert len(reachability) == sum(len(r) for r in expected.values())
+
+
+def test_direct_calls_only_are_not_transitive():
+    reachability = CallReachability([("a", "b"), ("b", "c")], max_depth=5)
+    assert reachability.reachable("a") == ["c"]
+    assert reachability.callers("c") == ["a"]
+    assert reachability.callers("b") == []
+    assert reachability.callers("unknown") == []
+
+
+def test_depth_cap_on_long_chain():
+    chain = [(f"f{i}", f"f{i + 1}") for i in range(10)]
+    reachability = CallReachability(chain, max_depth=3)
+    assert sorted(reachability.reachable("f0")) == ["f2", "f3"]
+    assert sorted(reachability.callers("f9")) == ["f6", "f7"]
@@ -0,0 +1,31 @@
+from src.graph.dependency_mapper import DependencyMapper
+from src.graph.embedded_graph_db import EmbeddedGraphDB
+
+MAIN, TEXT, INIT = '/repo/app/main.py', '/repo/app/utils/text.py', '/repo/app/utils/__init__.py'
+PARSED = [
+    {'file': MAIN, 'language': 'python', 'imports': ['os', 'app.utils.text', 'app.utils', 'app.main']},
+    {'file': TEXT, 'language': 'python', 'imports': ['re', 'app.utils']},
+    {'file': INIT, 'language': 'python', 'imports': []},
+]
+
+
+def test_file_dependencies_are_the_resolved_imports():
+    mapper = DependencyMapper()
+    mapper.build_graph(PARSED)
+    # External modules stay in the graph but are not file dependencies; self-imports are dropped
+    assert sorted(mapper.file_dependencies()) == [(MAIN, INIT), (MAIN, TEXT), (TEXT, INIT)]
+    assert mapper.graph.has_edge(MAIN, 'os') and not mapper.graph.has_edge(MAIN, MAIN)
+    assert mapper.graph.nodes[MAIN] == {'language': 'python'}
+
+
+def test_resolved_edges_are_written_in_one_sync():
+    mapper = DependencyMapper()
+    mapper.build_graph(PARSED)
+    store = EmbeddedGraphDB()
+    with store.batch_writer() as writer:
+        store.bulk_create_files([{'path': p['file'], 'language': 'python'} for p in PARSED], 'repo', writer)
+    assert store.sync_dependencies('repo', mapper.file_dependencies()) == (3, 0)
+    assert store.get_affected_files(INIT, 'repo') == [MAIN, TEXT]
+    # Same imports again: nothing to write
+    assert store.sync_dependencies('repo', mapper.file_dependencies()) == (0, 0)
+    store.close()
@@ -0,0 +1,38 @@
+from src.parser.file_classifier import HEAD_BYTES, FileClassifier
+
+
+def scanned(root, relative_path, content):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return {'path': str(path), 'relative_path': relative_path, 'language': 'python'}
+
+
+def test_partition_reports_skipped_files(tmp_path):
+    source = b'def run():\n    return 1\n'
+    files = [
+        scanned(tmp_path, 'src/app.py', source),
+        scanned(tmp_path, 'src/big.py', source * 100),
+        scanned(tmp_path, 'vendor/lib/util.py', source),
+        scanned(tmp_path, 'proto/api_pb2.py', source),
+        scanned(tmp_path, 'src/schema.py', b'# Code generated by sqlc. DO NOT EDIT.\n' + source),
+        scanned(tmp_path, 'static/app.js', b'var a=1;' * 110 + b'\n'),
+    ]
+    keep, skipped = FileClassifier(max_file_size=1000).partition(files)
+    assert keep == files[:1]
+    assert skipped == [
+        {'file': 'src/big.py', 'reason': 'too_large', 'size': len(source) * 100},
+        {'file': 'vendor/lib/util.py', 'reason': 'vendored', 'size': len(source)},
+        {'file': 'proto/api_pb2.py', 'reason': 'generated', 'size': len(source)},
+        {'file': 'src/schema.py', 'reason': 'generated', 'size': len(source) + 39},
+        {'file': 'static/app.js', 'reason': 'minified', 'size': 881},
+    ]
+
+
+def test_long_file_with_short_lines_is_kept(tmp_path):
+    classifier = FileClassifier(max_file_size=0)  # no size limit
+    source = b''.join(b'def f%d():\n    return %d\n' % (i, i) for i in range(2000))
+    assert len(source) > HEAD_BYTES
+    assert classifier.classify(scanned(tmp_path, 'src/long.py', source)) == (None, len(source))
+    # A missing file is left for the parser to report
+    assert classifier.classify({'path': str(tmp_path / 'gone.py'), 'relative_path': 'gone.py'}) == (None, 0)
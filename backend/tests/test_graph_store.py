@@ -0,0 +1,162 @@
+"""GraphStore contract, exercised on EmbeddedGraphDB (no server needed)"""
+import pytest
+
+from src.graph.embedded_graph_db import EmbeddedGraphDB
+
+REPO = 'repo'
+A, B, C = '/repo/src/a.py', '/repo/src/b.py', '/repo/src/c.py'
+OTHER = '/other/src/a.py'
+
+
+@pytest.fixture
+def store():
+    store = EmbeddedGraphDB()
+    with store.batch_writer() as writer:
+        store.bulk_create_files([
+            {'path': A, 'language': 'python', 'content_hash': 'ha', 'extractor_version': '3'},
+            {'path': B, 'language': 'python', 'content_hash': 'hb', 'extractor_version': '2'},
+            {'path': C, 'language': 'python', 'content_hash': 'hc', 'extractor_version': '3'},
+        ], REPO, writer)
+        store.bulk_create_files([{'path': OTHER, 'language': 'python', 'content_hash': 'ho'}], 'other', writer)
+        store.bulk_create_classes([{'file': B, 'name': 'Helper', 'line': 1}], writer)
+        store.bulk_create_functions([
+            {'file': A, 'name': 'run', 'line': 3},
+            {'file': B, 'name': 'helper', 'line': 5},
+            {'file': B, 'name': 'unused', 'line': 9},
+            {'file': C, 'name': 'leaf', 'line': 1},
+        ], writer)
+        store.bulk_create_imports([{'file': A, 'module': 'os'}, {'file': A, 'module': 'src.b'}], writer)
+    store.sync_dependencies(REPO, [(A, B), (B, C)])
+    store.sync_function_calls(REPO, [(A, B, 'helper')])
+    store.sync_function_to_function_calls(REPO, [(A, 'run', B, 'helper'), (B, 'helper', C, 'leaf')])
+    yield store
+    store.close()
+
+
+def test_file_reads(store):
+    assert store.get_all_files(REPO) == [A, B, C]
+    assert store.get_all_files() == sorted([A, B, C, OTHER])
+    assert store.get_file_hashes(REPO) == {A: ('ha', '3'), B: ('hb', '2'), C: ('hc', '3')}
+    assert store.get_dependencies(A, REPO) == ['os', 'src.b', B]
+    assert store.get_affected_files(C, REPO) == [A, B]
+    assert store.get_dependents(C) == {B: 1, A: 2}
+    assert store.get_dependents(C, max_hops=1) == {B: 1}
+
+
+def test_function_reads(store):
+    assert [f['name'] for f in store.get_all_functions(REPO)] == ['helper', 'leaf', 'run', 'unused']
+    assert store.get_function_info('helper') == {'name': 'helper', 'file': B, 'line': 5}
+    assert store.get_function_callers('helper', REPO) == [{'file': A, 'caller_name': 'run', 'line': 3}]
+    assert store.get_file_function_callers(B, REPO) == {'helper': [A], 'unused': []}
+    assert sorted(store.get_function_call_edges(REPO)) == [((A, 'run'), (B, 'helper')), ((B, 'helper'), (C, 'leaf'))]
+
+
+def test_file_summaries_and_graph_data(store):
+    summaries = {row['file']: row for row in store.get_file_summaries(REPO)}
+    assert summaries[A]['imports'] == ['os', 'src.b']
+    assert summaries[A]['dependencies'] == [B]
+    assert summaries[B]['classes'] == ['Helper']
+    assert sorted(summaries[B]['functions']) == ['helper', 'unused']
+    graph = store.get_graph_data(REPO)
+    assert {node['id'] for node in graph['nodes']} == {A, B, C}
+    assert {(e['source'], e['target']) for e in graph['edges']} == {(A, B), (B, C)}
+
+
+def test_resolve_file_path_per_repo(store):
+    assert store.resolve_file_path('src/b.py', REPO) == B
+    assert store.resolve_file_path('src/a.py', 'other') == OTHER
+
+
+def test_sync_counts_only_edges_written(store):
+    missing = '/repo/src/missing.py'
+    assert store.sync_dependencies(REPO, [(A, B), (B, C), (A, missing)]) == (0, 0)
+    assert store.sync_dependencies(REPO, [(A, B), (A, C)]) == (1, 1)
+    assert store.sync_function_to_function_calls(
+        REPO, [(A, 'run', B, 'helper'), (B, 'helper', C, 'leaf'), (A, 'run', B, 'undefined')]
+    ) == (0, 0)
+    assert store.sync_transitive_calls(REPO, [((A, 'run'), (C, 'leaf'))]) == (1, 0)
+    assert store.sync_transitive_calls(REPO, []) == (0, 1)
+
+
+def test_prune_keeps_only_current_definitions(store):
+    store.bulk_prune_files([{'path': B, 'classes': [], 'functions': ['helper']}])
+    assert [f['name'] for f in store.get_all_functions(REPO)] == ['helper', 'leaf', 'run']
+    assert store.get_file_summaries(REPO)[1]['classes'] == []
+    # Calls to the kept function survive the prune
+    assert store.get_function_callers('helper', REPO)[0]['file'] == A
+
+
+def test_delete_files_drops_their_edges(store):
+    assert store.bulk_delete_files([B]) == 1
+    assert store.get_all_files(REPO) == [A, C]
+    assert store.get_dependencies(A, REPO) == ['os', 'src.b']
+    assert store.get_dependents(C) == {}
+    assert store.get_function_call_edges(REPO) == []
+
+
+def test_clear_repo_leaves_other_repos(store):
+    assert store.clear_repo(REPO) == 3
+    assert store.get_all_files(REPO) == []
+    assert store.get_all_files('other') == [OTHER]
+    assert store.get_all_functions() == []
+
+
+def test_snapshot_file_links(store):
+    assert store.link_snapshot_files(REPO, 's1') == 3
+    assert store.link_snapshot_files(REPO, 's1') == 0  # already linked
+    assert store.get_snapshot_files('s1') == [
+        {'path': A, 'hash': 'ha'}, {'path': B, 'hash': 'hb'}, {'path': C, 'hash': 'hc'}
+    ]
+    store.bulk_delete_files([B])
+    assert store.count_snapshot_files('s1') == 2
+    assert store.unlink_snapshot_files('s1') == 2
+    assert store.get_snapshot_files('s1') == []
+
+
+def test_file_call_edges_and_cycles(store):
+    assert store.get_file_call_edges(REPO) == [(A, (B, 'helper'))]
+    assert store.find_dependency_cycle() is None
+    store.sync_dependencies(REPO, [(A, B), (B, C), (C, A)])
+    assert store.find_dependency_cycle() == A
+    assert store.find_dependency_cycle(max_hops=2) is None
+
+
+def test_function_graph_reads_the_store(store):
+    from src.graph.function_graph import FunctionGraphBuilder
+    builder = FunctionGraphBuilder(store)
+    graph = builder.get_function_graph_data(REPO)
+    assert {node['id'] for node in graph['nodes']} == {
+        f'{A}::run', f'{B}::helper', f'{B}::unused', f'{C}::leaf', A
+    }
+    assert sorted((edge['source'], edge['target']) for edge in graph['edges']) == sorted([
+        (A, f'{B}::helper'), (f'{A}::run', f'{B}::helper'), (f'{B}::helper', f'{C}::leaf')
+    ])
+    chain = builder.get_function_call_chain('helper', REPO)
+    assert [node['id'] for node in chain['nodes']] == [f'{B}::helper', A]
+    assert chain['edges'] == [{'source': A, 'target': f'{B}::helper', 'type': 'calls'}]
+    assert builder.get_function_call_chain('missing', REPO) == {'nodes': [], 'edges': []}
+
+
+@pytest.mark.parametrize("max_depth", [0, 2, 3])
+def test_transitive_callers_match_call_reachability(store, max_depth):
+    from src.graph.call_closure import CallReachability
+    with store.batch_writer() as writer:
+        store.bulk_create_functions([{'file': C, 'name': 'back', 'line': 5}], writer)
+    # run -> helper -> leaf -> back -> run: a cycle, plus unused -> run
+    calls = [(A, 'run', B, 'helper'), (B, 'helper', C, 'leaf'), (C, 'leaf', C, 'back'),
+             (C, 'back', A, 'run'), (B, 'unused', A, 'run')]
+    store.sync_function_to_function_calls(REPO, calls)
+    reachability = CallReachability(store.get_function_call_edges(REPO), max_depth)
+    for function in reachability.nodes:
+        assert store.get_transitive_callers(function, REPO, max_depth) == sorted(reachability.callers(function))
+    assert store.get_transitive_callers((C, 'leaf'), 'other', max_depth) == []
+
+
+def test_sync_resolves_each_path_once_per_batch(store, monkeypatch):
+    resolved = []
+    normalize_path = store._normalize_path
+    monkeypatch.setattr(store, '_normalize_path', lambda path: resolved.append(path) or normalize_path(path))
+    pairs = [((A, 'run'), (C, 'leaf')), ((A, 'run'), (B, 'helper')), ((B, 'helper'), (C, 'leaf'))]
+    assert store.sync_transitive_calls(REPO, pairs) == (3, 0)
+    # Once in the diff, once more when the new edges are written
+    assert sorted(resolved) == sorted([A, B, C] * 2)
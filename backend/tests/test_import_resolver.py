@@ -0,0 +1,49 @@
+from src.graph.import_resolver import ImportResolver
+
+FILES = [
+    '/repo/app/main.py',
+    '/repo/app/path.py',
+    '/repo/app/utils/__init__.py',
+    '/repo/app/utils/text.py',
+    '/repo/lib/utils/text.py',
+    '/repo/web/src/api/client.js',
+    '/repo/web/src/components/index.js',
+]
+
+
+def test_full_suffix_match():
+    resolver = ImportResolver(FILES)
+    assert resolver.resolve('app.utils.text') == '/repo/app/utils/text.py'
+    assert resolver.resolve('app.utils') == '/repo/app/utils/__init__.py'
+    assert resolver.resolve('path') == '/repo/app/path.py'
+
+
+def test_partial_suffix_is_not_a_match():
+    resolver = ImportResolver(FILES)
+    assert resolver.resolve('os.path') is None
+    assert resolver.resolve('xml.utils.text') is None
+    assert resolver.resolve('requests.api.client') is None
+    assert resolver.resolve('') is None
+
+
+def test_closest_candidate_wins():
+    resolver = ImportResolver(FILES)
+    assert resolver.resolve('utils.text', '/repo/lib/main.py') == '/repo/lib/utils/text.py'
+    assert resolver.resolve('utils.text', '/repo/app/main.py') == '/repo/app/utils/text.py'
+
+
+def test_relative_imports():
+    resolver = ImportResolver(FILES)
+    assert resolver.resolve('.path', '/repo/app/main.py') == '/repo/app/path.py'
+    assert resolver.resolve('../api/client', '/repo/web/src/components/index.js') == '/repo/web/src/api/client.js'
+    assert resolver.resolve('./components', '/repo/web/src/app.js') == '/repo/web/src/components/index.js'
+
+
+def test_unresolved_relative_import_is_not_looked_up_elsewhere():
+    resolver = ImportResolver(FILES)
+    # text.py only exists under other directories
+    assert resolver.resolve('.text', '/repo/app/main.py') is None
+    assert resolver.resolve('./text', '/repo/app/main.py') is None
+    assert resolver.resolve('..utils.text', '/repo/web/src/app.js') is None
+    assert resolver.resolve('.path') is None  # no importer to resolve against
+    assert resolver.resolve('.text', '/repo/app/utils/__init__.py') == '/repo/app/utils/text.py'
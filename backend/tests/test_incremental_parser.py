@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from src.parser.incremental_parser import IncrementalParser, _point
+from src.parser.parallel_parser import ParallelParser
+from src.parser.static_parser import StaticParser
+
+PYTHON = b'''import os
+from pkg.util import helper
+
+
+class Store:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def load(self):
+        return helper(self.path)
+
+
+def run(store):
+    data = store.load()
+    return process(data)
+
+
+def process(data):
+    return [helper(item) for item in data]
+'''
+
+JAVASCRIPT = b'''import { helper } from './util';
+
+class Store {
+  load() {
+    return helper(this.path);
+  }
+}
+
+function run(store) {
+  return process(store.load());
+}
+
+function process(data) {
+  return data.map(helper);
+}
+'''
+
+EDITS = {
+    'python': [
+        (b'return process(data)', b'return process(data, store)'),
+        (b'def process(data):', b'def validate(data):\n    return bool(data)\n\n\ndef process(data):'),
+        (b'from pkg.util import helper\n', b''),
+        (b'    def load(self):\n        return helper(self.path)\n', b''),
+        (b'class Store:', b'class Store(Base):'),
+    ],
+    'javascript': [
+        (b'return process(store.load());', b'const data = store.load();\n  return process(data);'),
+        (b'function process(data) {', b'function validate(data) {\n  return !!data;\n}\n\nfunction process(data) {'),
+        (b"import { helper } from './util';\n", b''),
+    ],
+}
+
+
+def fresh(code, language):
+    parser = StaticParser()
+    return dict(parser._parse_code('module', code, language, parser.parsers[language]))
+
+
+@pytest.mark.parametrize('language, code', [('python', PYTHON), ('javascript', JAVASCRIPT)])
+def test_edits_match_fresh_parse(language, code):
+    incremental = IncrementalParser()
+    assert dict(incremental.parse_code('module', code, language)) == fresh(code, language)
+    for old, new in EDITS[language]:
+        assert old in code
+        code = code.replace(old, new)
+        assert dict(incremental.parse_code('module', code, language)) == fresh(code, language)
+
+
+def test_random_edits_match_fresh_parse():
+    rng = random.Random(0)
+    lines = PYTHON.splitlines(keepends=True)
+    incremental = IncrementalParser()
+    incremental.parse_code('module', PYTHON, 'python')
+    for _ in range(30):
+        edited = list(lines)
+        i = rng.randrange(len(edited))
+        if rng.random() < 0.5:
+            del edited[i]
+        else:
+            edited.insert(i, rng.choice(lines))
+        code = b''.join(edited)
+        assert dict(incremental.parse_code('module', code, 'python')) == fresh(code, 'python')
+
+
+def test_point_matches_line_count():
+    parser = StaticParser().parsers['python']
+    tree = parser.parse(PYTHON)
+    for byte in range(len(PYTHON) + 1):
+        row = PYTHON.count(b'\n', 0, byte)
+        column = byte - PYTHON.rfind(b'\n', 0, byte) - 1
+        assert _point(tree, PYTHON, byte) == (row, column)
+
+
+def test_keeps_max_files_trees():
+    incremental = IncrementalParser(max_files=2)
+    for name in ('a', 'b', 'c'):
+        incremental.parse_code(name, PYTHON, 'python')
+    assert list(incremental.states) == ['b', 'c']
+
+
+def test_parallel_parser_reuses_trees_in_process(tmp_path):
+    path = tmp_path / 'module.py'
+    path.write_bytes(PYTHON)
+    files = [{'path': str(path), 'language': 'python'}]
+    parser = ParallelParser(workers=1, incremental=True)
+
+    [(_, parsed, error)] = parser.parse_files(files)
+    assert error is None and parsed['functions'][0]['name'] == 'Store.__init__'
+    tree = parser.incremental_parser.states[str(path)].tree
+
+    path.write_bytes(PYTHON.replace(b'def run(store):', b'def start(store):'))
+    [(_, parsed, error)] = parser.parse_files(files)
+    assert error is None and 'start' in [f['name'] for f in parsed['functions']]
+    assert parser.incremental_parser.states[str(path)].tree is not tree
+
+
+def test_changed_files_reparse_incrementally_with_a_pool(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f'module{i}.py'
+        path.write_bytes(PYTHON)
+        paths.append(path)
+    files = [{'path': str(path), 'language': 'python'} for path in paths]
+    parser = ParallelParser(workers=2, chunksize=1, incremental=True)
+
+    def parse():
+        results = list(parser.parse_files(files))
+        assert [info['path'] for info, _, _ in results] == [f['path'] for f in files]
+        assert all(error is None for _, _, error in results)
+        return [parsed for _, parsed, _ in results]
+
+    parse()
+    assert not parser.incremental_parser.states  # first sight: all parsed in the pool
+
+    edited = PYTHON.replace(b'def run(store):', b'def start(store):')
+    paths[1].write_bytes(edited + b'\n')  # size changes, so the edit is seen
+    parsed = parse()
+    assert list(parser.incremental_parser.states) == [str(paths[1])]
+    assert 'start' in [f['name'] for f in parsed[1]['functions']]
+    assert dict(parsed[1]) == {**fresh(edited + b'\n', 'python'), 'file': str(paths[1])}
+    tree = parser.incremental_parser.states[str(paths[1])].tree
+
+    paths[1].write_bytes(edited)
+    parsed = parse()
+    assert parser.incremental_parser.states[str(paths[1])].tree is not tree
+    assert dict(parsed[1]) == {**fresh(edited, 'python'), 'file': str(paths[1])}
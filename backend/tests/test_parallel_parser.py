@@ -0,0 +1,86 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from src.parser import parallel_parser
+from src.parser.parallel_parser import ParallelParser
+
+
+def crashing_parse_chunk(chunk):
+    """_parse_chunk, except the worker process dies on any file named crash.py"""
+    if any(os.path.basename(f['path']) == 'crash.py' for f in chunk):
+        os._exit(1)
+    return [parallel_parser._parse_one(file_info) for file_info in chunk]
+
+
+def write_files(tmp_path, names):
+    files = []
+    for name in names:
+        path = tmp_path / name
+        path.write_text(f'def {path.stem}():\n    return 1\n')
+        files.append({'path': str(path), 'language': 'python'})
+    return files
+
+
+def test_worker_crash_fails_only_its_file(tmp_path, monkeypatch):
+    names = [f'm{i}.py' for i in range(12)]
+    names[5] = 'crash.py'
+    files = write_files(tmp_path, names)
+    # Submitted by reference, so workers run it whether they fork or spawn
+    monkeypatch.setattr(parallel_parser, '_parse_chunk', crashing_parse_chunk)
+    parser = ParallelParser(workers=2, chunksize=2)
+
+    for ordered in (True, False):
+        results = list(parser.parse_files(files, ordered=ordered))
+        if ordered:
+            assert [info['path'] for info, _, _ in results] == [f['path'] for f in files]
+        by_name = {os.path.basename(info['path']): (parsed, error) for info, parsed, error in results}
+        assert sorted(by_name) == sorted(names)
+
+        parsed, error = by_name.pop('crash.py')
+        assert parsed is None and error.startswith('BrokenProcessPool')
+        for name, (parsed, error) in by_name.items():
+            assert error is None
+            assert [f['name'] for f in parsed['functions']] == [name[:-3]]
+
+
+class BreaksOnSubmit:
+    """Pool whose submit raises BrokenProcessPool after `working` submissions"""
+
+    def __init__(self, pool, working):
+        self.pool = pool
+        self.working = working
+
+    def submit(self, *args):
+        if self.working == 0:
+            raise BrokenProcessPool('pool broke while submitting')
+        self.working -= 1
+        return self.pool.submit(*args)
+
+    def shutdown(self, **kwargs):
+        self.pool.shutdown(**kwargs)
+
+
+def test_pool_breaking_at_submit_retries_the_lost_chunk(tmp_path, monkeypatch):
+    files = write_files(tmp_path, [f'm{i}.py' for i in range(12)])
+    parser = ParallelParser(workers=2, chunksize=2)
+    new_pool = parser._new_pool
+    pools = iter([BreaksOnSubmit(new_pool(), 3)])
+    monkeypatch.setattr(parser, '_new_pool', lambda: next(pools, None) or new_pool())
+
+    results = list(parser.parse_files(files))
+    assert [info['path'] for info, _, _ in results] == [f['path'] for f in files]
+    assert all(error is None for _, _, error in results)
+
+
+def test_pool_matches_serial_parse(tmp_path):
+    files = write_files(tmp_path, [f'm{i}.py' for i in range(20)])
+    files.append({'path': str(tmp_path / 'missing.py'), 'language': 'python'})
+    serial = [(info, parsed and dict(parsed), error)
+              for info, parsed, error in ParallelParser(workers=1).parse_files(files)]
+    assert serial[-1][1] is None and serial[-1][2].startswith('FileNotFoundError')
+
+    parser = ParallelParser(workers=2, chunksize=3)
+    ordered = [(info, parsed and dict(parsed), error) for info, parsed, error in parser.parse_files(files)]
+    assert ordered == serial
+    unordered = list(parser.parse_files(files, ordered=False))
+    assert sorted(info['path'] for info, _, _ in unordered) == sorted(f['path'] for f in files)
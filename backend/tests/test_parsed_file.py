@@ -0,0 +1,43 @@
+import pickle
+
+import pytest
+
+from src.parser.parsed_file import FIELDS, ParsedFile
+
+EXTRACTED = {
+    'classes': [{'name': 'Store', 'line': 4}],
+    'functions': [{'name': 'load', 'line': 5}, {'name': 'run', 'line': 9}],
+    'imports': ['os', 'pkg.util'],
+    'function_calls': ['helper', 'load', 'helper'],
+    'function_to_function_calls': [{'caller': 'load', 'callee': 'helper'}, {'caller': 'run', 'callee': 'load'}],
+    'call_sites': [{'caller': 'run', 'callee': 'load', 'receiver': 'store'}],
+    'import_bindings': [{'name': 'helper', 'module': 'pkg.util', 'symbol': 'helper'}],
+}
+
+
+def test_round_trip_and_interning():
+    parsed = ParsedFile.from_extracted('/repo/a.py', 'python', 'abc', EXTRACTED)
+    assert dict(parsed) == {'file': '/repo/a.py', 'language': 'python', 'content_hash': 'abc', **EXTRACTED}
+    assert list(parsed) == list(FIELDS)
+    # Each distinct name is stored once
+    assert sorted(parsed.symbols) == ['Store', 'helper', 'load', 'run', 'store']
+    other = ParsedFile.from_extracted('/repo/b.py', 'python', 'def', EXTRACTED)
+    assert other['functions'][0]['name'] is parsed['functions'][0]['name']
+
+
+def test_extra_keys_and_read_only_fields():
+    parsed = ParsedFile.from_extracted('/repo/a.py', 'python', 'abc', EXTRACTED)
+    parsed['version_status'] = 'modified'
+    assert parsed['version_status'] == 'modified' and 'version_status' in parsed
+    assert len(parsed) == len(FIELDS) + 1
+    assert parsed.get('missing') is None
+    with pytest.raises(KeyError):
+        parsed['functions'] = []
+    del parsed['version_status']
+    assert 'version_status' not in parsed and len(parsed) == len(FIELDS)
+
+
+def test_pickles_for_worker_processes():
+    parsed = ParsedFile.from_extracted('/repo/a.py', 'python', 'abc', EXTRACTED)
+    parsed['version_status'] = 'new'
+    assert dict(pickle.loads(pickle.dumps(parsed))) == dict(parsed)
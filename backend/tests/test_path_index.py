@@ -0,0 +1,32 @@
+from src.graph.embedded_graph_db import EmbeddedGraphDB
+from src.graph.path_index import PathIndex
+
+
+def test_lookup_by_suffix_and_ambiguity():
+    index = PathIndex(['/w/repo/src/a.py', '/w/repo/src/util/a.py', '/w/repo/src/b.py'])
+    assert index.resolve('src/b.py') == '/w/repo/src/b.py'
+    assert index.resolve('/other/checkout/src/util/a.py') == '/w/repo/src/util/a.py'
+    lookup = index.lookup('a.py')
+    assert lookup['ambiguous']
+    assert lookup['candidates'] == ['/w/repo/src/a.py', '/w/repo/src/util/a.py']
+
+
+def test_paths_resolve_against_their_own_repo():
+    store = EmbeddedGraphDB()
+    store.bulk_create_files([{'path': '/w/one/src/app.py', 'language': 'python'}], repo_id='one')
+    store.bulk_create_files([{'path': '/w/two/src/app.py', 'language': 'python'}], repo_id='two')
+
+    assert store.resolve_file_path('src/app.py', 'one') == '/w/one/src/app.py'
+    assert store.resolve_file_path('src/app.py', 'two') == '/w/two/src/app.py'
+    # Building one repo's index does not change what the other resolves to
+    store.get_path_index('one', rebuild=True)
+    assert store.lookup_file_path('app.py', 'two')['path'] == '/w/two/src/app.py'
+
+
+def test_dropped_index_is_rebuilt_from_stored_files():
+    store = EmbeddedGraphDB()
+    store.bulk_create_files([{'path': '/w/one/a.py', 'language': 'python'}], repo_id='one')
+    assert store.resolve_file_path('a.py', 'one') == '/w/one/a.py'
+    store.bulk_create_files([{'path': '/w/one/b.py', 'language': 'python'}], repo_id='one')
+    store.drop_path_index('one')
+    assert store.resolve_file_path('b.py', 'one') == '/w/one/b.py'
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from src.pipeline import Pipeline, Stage
+
+
+def test_items_flow_through_every_stage():
+    done = []
+    pipeline = Pipeline([
+        Stage('double', lambda n: n * 2, workers=3),
+        Stage('drop odd tens', lambda n: None if n % 20 == 10 else n),
+        Stage('collect', done.append),
+    ], queue_size=2)
+    assert pipeline.run(range(50)) == []
+    assert sorted(done) == [n * 2 for n in range(50) if (n * 2) % 20 != 10]
+
+
+def test_failed_items_are_reported_and_the_rest_continue():
+    done = []
+
+    def check(n):
+        if n % 7 == 0:
+            raise ValueError(f"bad {n}")
+        return n
+
+    errors = Pipeline([Stage('check', check, workers=2), Stage('collect', done.append)]).run(
+        range(30), describe=lambda n: f"item{n}"
+    )
+    assert sorted(done) == [n for n in range(30) if n % 7]
+    assert sorted(errors, key=lambda e: int(e['file'][4:])) == [
+        {'file': f"item{n}", 'stage': 'check', 'error': f"ValueError: bad {n}"} for n in range(0, 30, 7)
+    ]
+
+
+def test_full_queues_hold_back_the_producer():
+    release = threading.Event()
+    produced = []
+    done = []
+
+    def source():
+        for n in range(100):
+            produced.append(n)
+            yield n
+
+    def slow_sink(n):
+        release.wait()
+        done.append(n)
+
+    pipeline = Pipeline([Stage('pass', lambda n: n), Stage('sink', slow_sink)], queue_size=2)
+    runner = threading.Thread(target=pipeline.run, args=(source(),))
+    runner.start()
+    time.sleep(0.3)
+    # Two queues of 2, one item held by each stage, one by the blocked producer
+    assert len(produced) <= 7
+    release.set()
+    runner.join(timeout=10)
+    assert not runner.is_alive()
+    assert done == list(range(100))
@@ -0,0 +1,152 @@
+import subprocess
+
+import pytest
+
+from src.parser.repo_loader import GitIgnore, RepositoryLoader
+
+
+def git(cwd, *args):
+    subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True)
+
+
+def write(path, text=''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    return RepositoryLoader(str(tmp_path / 'workspace'))
+
+
+def test_gitignore_dir_patterns(tmp_path):
+    (tmp_path / '.gitignore').write_text('/build/\nlogs/\nsrc/gen/\n')
+    rules = GitIgnore.load(tmp_path, '')
+    assert rules.is_ignored('build', True)
+    assert not rules.is_ignored('src/build', True)  # leading slash anchors
+    assert rules.is_ignored('logs', True) and rules.is_ignored('src/logs', True)
+    assert rules.is_ignored('src/gen', True) and not rules.is_ignored('lib/src/gen', True)
+    assert not rules.is_ignored('logs', False)
+
+
+def test_scan_walk_prunes_ignored_dirs(tmp_path, loader):
+    repo = tmp_path / 'repo'
+    write(repo / '.gitignore', '/out/\n')
+    write(repo / 'out' / 'gen.py')
+    write(repo / 'pkg' / 'out' / 'kept.py')
+    write(repo / 'main.py')
+    files = loader.scan_files(repo, ['.py'])
+    assert [f['relative_path'] for f in files] == ['main.py', 'pkg/out/kept.py']
+
+
+def test_scan_skips_tracked_files_deleted_from_worktree(tmp_path, loader):
+    repo = tmp_path / 'repo'
+    write(repo / 'a.py')
+    write(repo / 'b.py')
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    (repo / 'b.py').unlink()
+    write(repo / 'c.py')
+    files = loader.scan_files(repo, ['.py'])
+    assert [f['relative_path'] for f in files] == ['a.py', 'c.py']
+
+
+def make_remote(tmp_path, name, files):
+    """Bare repository served over file://, plus the clone used to push to it"""
+    work = tmp_path / f'{name}-work'
+    for rel, text in files.items():
+        write(work / rel, text)
+    git(work, 'init', '-q')
+    commit(work, 'initial')
+    bare = tmp_path / 'remotes' / f'{name}.git'
+    bare.parent.mkdir(exist_ok=True)
+    git(tmp_path, 'clone', '-q', '--bare', str(work), str(bare))
+    git(work, 'remote', 'add', 'origin', str(bare))
+    return f'file://{bare}', work
+
+
+def commit(work, message):
+    git(work, 'add', '-A')
+    git(work, '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', message)
+
+
+def test_clone_then_reuse_worktree(tmp_path, loader):
+    url, work = make_remote(tmp_path, 'project', {'app.py': 'v1\n', 'old.py': ''})
+
+    path = loader.clone_repository(url)
+    assert path == loader.workspace_path(url)
+    assert (path / 'app.py').read_text() == 'v1\n'
+    assert (path / '.git').is_file()  # a worktree of the mirror
+
+    write(work / 'app.py', 'v2\n')
+    (work / 'old.py').unlink()
+    commit(work, 'update')
+    git(work, 'push', '-q', 'origin', 'HEAD')
+    write(path / 'scratch.py', 'left over\n')
+    git_file = (path / '.git').read_text()
+
+    assert loader.clone_repository(url) == path
+    assert (path / '.git').read_text() == git_file  # same worktree, checked out again
+    assert (path / 'app.py').read_text() == 'v2\n'
+    assert not (path / 'old.py').exists() and not (path / 'scratch.py').exists()
+    assert loader.resolve_remote_head(url) == loader._git(['rev-parse', 'HEAD'], cwd=path).strip()
+
+
+def test_clone_replaces_plain_directory(tmp_path, loader):
+    url, _ = make_remote(tmp_path, 'project', {'app.py': 'v1\n'})
+    stale = loader.workspace_path(url)
+    write(stale / 'stale.py')
+    path = loader.clone_repository(url)
+    assert (path / 'app.py').exists() and not (path / 'stale.py').exists()
+
+
+def test_gc_evicts_least_recently_used_mirror(tmp_path):
+    loader = RepositoryLoader(str(tmp_path / 'workspace'), mirror_max_bytes=0)
+    first, _ = make_remote(tmp_path, 'first', {'a.py': ''})
+    second, _ = make_remote(tmp_path, 'second', {'b.py': ''})
+
+    loader.clone_repository(first)
+    assert loader._mirror_path(first).exists()  # the mirror in use is never evicted
+    loader.clone_repository(second)
+    assert not loader._mirror_path(first).exists()
+    assert loader._mirror_path(second).exists()
+
+    # An evicted mirror is cloned again on the next checkout
+    path = loader.clone_repository(first)
+    assert (path / 'a.py').exists()
+
+
+def test_remove_directory_handles_read_only_entries(tmp_path, loader):
+    target = tmp_path / 'target'
+    write(target / 'nested' / 'pack.idx', 'data')
+    (target / 'nested' / 'pack.idx').chmod(0o444)
+    (target / 'nested').chmod(0o555)
+    loader._remove_directory(target)
+    assert not target.exists()
+
+
+def test_checked_out_path_requires_the_commit(tmp_path, loader):
+    url, work = make_remote(tmp_path, 'project', {'app.py': 'v1\n'})
+    head = loader.resolve_remote_head(url)
+    assert loader.checked_out_path(url, head) is None  # nothing checked out yet
+
+    path = loader.clone_repository(url)
+    assert loader.checked_out_path(url, head) == path
+
+    write(work / 'app.py', 'v2\n')
+    commit(work, 'update')
+    git(work, 'push', '-q', 'origin', 'HEAD')
+    assert loader.checked_out_path(url, loader.resolve_remote_head(url)) is None
+
+
+def test_resolve_remote_head_follows_pushes(tmp_path, loader):
+    url, work = make_remote(tmp_path, 'project', {'app.py': 'v1\n'})
+    head = loader.resolve_remote_head(url)
+    assert head == subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=work, check=True,
+                                  capture_output=True, text=True).stdout.strip()
+    write(work / 'app.py', 'v2\n')
+    commit(work, 'second')
+    git(work, 'push', '-q', 'origin', 'HEAD')
+    assert loader.resolve_remote_head(url) not in (None, head)
+    assert loader.resolve_remote_head(f'file://{tmp_path}/missing.git') is None
+    assert not loader.mirror_dir.exists()  # nothing was fetched
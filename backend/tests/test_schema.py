@@ -0,0 +1,37 @@
+import pytest
+
+from src.graph.schema import SCAN_OPERATORS, SchemaManager, plan_operators
+
+
+def test_plan_operators_strips_runtime_suffix_and_walks_children():
+    plan = {
+        'operatorType': 'ProduceResults@neo4j',
+        'children': [{'operatorType': 'NodeIndexSeek@neo4j', 'children': []}],
+    }
+    assert plan_operators(plan) == {'ProduceResults', 'NodeIndexSeek'}
+    assert plan_operators(None) == set()
+
+
+@pytest.fixture(scope="module")
+def schema(neo4j_driver):
+    manager = SchemaManager(neo4j_driver)
+    missing = manager.ensure(timeout=120)
+    assert not missing, f"indexes not online: {missing}"
+    return manager
+
+
+def test_file_lookups_are_index_backed(schema):
+    from src.graph.graph_db import FILE_LOOKUPS
+    scans = schema.check_plans((name, query, {'value': '/x.py'}) for name, query in FILE_LOOKUPS)
+    assert scans == {}
+
+
+@pytest.mark.parametrize("query, params", [
+    ("MATCH (f:File {path: $path}) RETURN f", {'path': '/x.py'}),
+    ("MATCH (fn:Function {name: $name, file: $file}) RETURN fn", {'name': 'f', 'file': '/x.py'}),
+    ("MATCH (c:Class {file: $file}) RETURN c", {'file': '/x.py'}),
+    ("MATCH (m:Module {name: $name}) RETURN m", {'name': 'os'}),
+    ("MATCH (s:Snapshot {snapshot_id: $id}) RETURN s", {'id': 's'}),
+])
+def test_merge_keys_are_index_backed(schema, query, params):
+    assert not schema.explain(query, **params) & SCAN_OPERATORS
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.parser.file_classifier import FileClassifier
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ('neo4j', 'groq', 'chromadb', 'sentence_transformers', 'networkx', 'git')
+
+
+def test_importing_main_defers_heavy_imports():
+    pytest.importorskip('fastapi')
+    snippet = (
+        "import sys, main\n"
+        "from src.analysis_engine import AnalysisEngine\n"
+        "AnalysisEngine()\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    # A fresh interpreter, so modules imported by other tests do not count
+    result = subprocess.run([sys.executable, '-c', snippet], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
+
+
+def test_subsystems_are_built_once_and_can_be_replaced(engine, monkeypatch):
+    from src.analysis_engine import AnalysisEngine
+    built = []
+    factory = AnalysisEngine.file_classifier.factory
+    monkeypatch.setattr(AnalysisEngine.file_classifier, 'factory', lambda e: built.append(e) or factory(e))
+    classifier = engine.file_classifier
+    assert isinstance(classifier, FileClassifier) and engine.file_classifier is classifier
+    assert built == [engine]
+
+    replacement = FileClassifier(0)
+    engine.file_classifier = replacement
+    assert engine.file_classifier is replacement and built == [engine]
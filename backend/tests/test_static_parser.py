@@ -0,0 +1,157 @@
+import pytest
+
+from src.parser.static_parser import StaticParser
+
+PYTHON = b'''import os, sys
+from pkg.util import helper
+from . import sibling
+
+
+@register
+class Store(Base):
+    def load(self):
+        return helper(self.path).strip()
+
+    def save(self, data):
+        os.makedirs(self.path)
+        return write(data, lambda item: encode(item))
+
+
+def run(store):
+    data = store.load()
+    return [process(item) for item in data] or run(store)
+
+
+async def process(data):
+    await asyncio.sleep(helper(data))
+'''
+
+JAVASCRIPT = b'''import { helper } from './util';
+import React from "react";
+
+class Store {
+  load() {
+    return helper(this.path).trim();
+  }
+}
+
+function run(store) {
+  const data = store.load();
+  return data.map(item => process(item));
+}
+
+function process(data) {
+  console.log(helper(data));
+  return run(data);
+}
+'''
+
+NESTED = b'''def outer():
+    setup()
+
+    def inner():
+        return work()
+
+    return inner()
+'''
+
+
+def text(node, code):
+    return code[node.start_byte:node.end_byte].decode('utf8') if node else ""
+
+
+def called_name(node, code, language):
+    func = node.child_by_field_name('function')
+    if func is None:
+        return ""
+    if func.type == 'identifier':
+        return text(func, code)
+    if language == 'python' and func.type == 'attribute':
+        return text(func, code).split('.')[-1]
+    if language == 'javascript' and func.type == 'member_expression':
+        return text(func.child_by_field_name('property'), code)
+    return ""
+
+
+def recursive_extract(node, code, language):
+    """The recursive extraction StaticParser used before the single-pass walker"""
+    result = {'classes': [], 'functions': [], 'imports': [], 'function_calls': []}
+    if node.type == 'class_definition':
+        result['classes'].append({'name': text(node.child_by_field_name('name'), code),
+                                  'line': node.start_point[0] + 1})
+    if node.type in ('function_definition', 'function_declaration'):
+        result['functions'].append({'name': text(node.child_by_field_name('name'), code),
+                                    'line': node.start_point[0] + 1})
+    if language == 'python' and node.type in ('import_statement', 'import_from_statement'):
+        result['imports'] += [text(c, code) for c in node.children if c.type == 'dotted_name']
+    if language == 'javascript' and node.type == 'import_statement':
+        result['imports'] += [text(c, code).strip('"\'') for c in node.children if c.type == 'string']
+    if node.type == {'python': 'call', 'javascript': 'call_expression'}[language]:
+        name = called_name(node, code, language)
+        if name:
+            result['function_calls'].append(name)
+    for child in node.children:
+        for key, values in recursive_extract(child, code, language).items():
+            result[key] += values
+    return result
+
+
+def extract(code, language, backend='walker'):
+    parser = StaticParser({language: backend})
+    return dict(parser._parse_code('module', code, language, parser.parsers[language]))
+
+
+@pytest.mark.parametrize('language, code', [('python', PYTHON), ('javascript', JAVASCRIPT)])
+def test_walker_matches_recursive_extraction(language, code):
+    parser = StaticParser()
+    expected = recursive_extract(parser.parsers[language].parse(code).root_node, code, language)
+    parsed = extract(code, language)
+    for key, values in expected.items():
+        assert parsed[key] == values, key
+    # Each function's distinct callees, as the recursive pass paired them
+    by_caller = {}
+    for edge in parsed['function_to_function_calls']:
+        by_caller.setdefault(edge['caller'], []).append(edge['callee'])
+    assert all(len(callees) == len(set(callees)) for callees in by_caller.values())
+    if language == 'python':
+        assert by_caller == {'load': ['strip', 'helper'], 'save': ['makedirs', 'write', 'encode'],
+                             'run': ['load', 'process', 'run'], 'process': ['sleep', 'helper']}
+    else:
+        assert by_caller == {'run': ['load', 'map', 'process'], 'process': ['log', 'helper', 'run']}
+
+
+def test_calls_belong_to_the_innermost_function():
+    parsed = extract(NESTED, 'python')
+    assert [f['name'] for f in parsed['functions']] == ['outer', 'inner']
+    assert parsed['function_to_function_calls'] == [
+        {'caller': 'outer', 'callee': 'setup'},
+        {'caller': 'outer', 'callee': 'inner'},
+        {'caller': 'inner', 'callee': 'work'},
+    ]
+
+
+def test_deep_nesting_does_not_recurse():
+    depth = 2000
+    code = b'x = ' + b'(' * depth + b'f()' + b')' * depth + b'\n'
+    parsed = extract(code, 'python')
+    assert parsed['function_calls'] == ['f']
+
+
+@pytest.mark.parametrize('language, code', [('python', PYTHON), ('javascript', JAVASCRIPT), ('python', NESTED)])
+def test_query_backend_matches_walker(language, code):
+    assert extract(code, language, 'query') == extract(code, language, 'walker')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        StaticParser({'python': 'regex'})
+
+
+def test_large_files_are_mapped_with_the_same_result(tmp_path, monkeypatch):
+    from src.parser import static_parser
+    path = tmp_path / 'module.py'
+    path.write_bytes(PYTHON * 4)
+    parser = StaticParser()
+    read = dict(parser.parse_file(str(path), 'python'))
+    monkeypatch.setattr(static_parser, 'MMAP_THRESHOLD', 0)
+    assert dict(parser.parse_file(str(path), 'python')) == read
@@ -0,0 +1,74 @@
+from src.graph.import_resolver import ImportResolver
+from src.graph.symbol_table import SymbolTable
+from src.parser.static_parser import StaticParser
+
+MODELS = b'''class Base:
+    def __init__(self):
+        self.ready = True
+
+
+class User(Base):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+class Plain:
+    pass
+'''
+
+APP = b'''from models import User, Plain, Base
+
+
+def main():
+    user = User('ann')
+    plain = Plain()
+    return Local(user, plain)
+
+
+class Local:
+    @staticmethod
+    def __init__(*args):
+        helper()
+
+
+def helper():
+    return Base()
+'''
+
+
+def parse(files, backend='walker'):
+    parser = StaticParser({'python': backend})
+    return [
+        parser._parse_code(path, code, 'python', parser.parsers['python'])
+        for path, code in files.items()
+    ]
+
+
+def resolve(backend='walker'):
+    files = {'/repo/models.py': MODELS, '/repo/app.py': APP}
+    parsed = parse(files, backend)
+    table = SymbolTable(parsed, ImportResolver(files))
+    return parsed, table.resolve_calls()
+
+
+def test_constructors_are_keyed_by_class():
+    for backend in ('walker', 'query'):
+        parsed, _ = resolve(backend)
+        assert [f['name'] for f in parsed[0]['functions']] == ['Base.__init__', 'User.__init__']
+        assert [f['name'] for f in parsed[1]['functions']] == ['main', 'Local.__init__', 'helper']
+
+
+def test_class_call_links_only_its_own_constructor():
+    _, (file_calls, function_calls) = resolve()
+    assert ('/repo/app.py', 'main', '/repo/models.py', 'User.__init__') in function_calls
+    assert ('/repo/app.py', 'main', '/repo/app.py', 'Local.__init__') in function_calls
+    assert ('/repo/app.py', 'helper', '/repo/models.py', 'Base.__init__') in function_calls
+    assert ('/repo/app.py', 'Local.__init__', '/repo/app.py', 'helper') in function_calls
+    # Plain defines no constructor, so its call links to nothing
+    assert {edge for edge in file_calls if edge[0] == '/repo/app.py'} == {
+        ('/repo/app.py', '/repo/models.py', 'User.__init__'),
+        ('/repo/app.py', '/repo/models.py', 'Base.__init__'),
+        ('/repo/app.py', '/repo/app.py', 'Local.__init__'),
+        ('/repo/app.py', '/repo/app.py', 'helper'),
+    }
@@ -0,0 +1,54 @@
+import pytest
+
+chromadb = pytest.importorskip('chromadb')
+
+from src.retrieval.vector_store import VectorStore
+
+
+class LengthEmbedding(chromadb.EmbeddingFunction):
+    """Tiny deterministic embedding, so tests need no model download"""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in input]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = VectorStore(str(tmp_path / 'chroma'))
+    create = store.client.get_or_create_collection
+    monkeypatch.setattr(store.client, 'get_or_create_collection',
+                        lambda **kwargs: create(embedding_function=LengthEmbedding(), **kwargs))
+    return store
+
+
+def chunk(code, content_hash):
+    return {'id': 'src/app.py', 'code': code, 'metadata': {'content_hash': content_hash, 'extractor_version': '4'}}
+
+
+def test_repositories_have_separate_collections(store):
+    assert store.collection_name('r1') != store.collection_name('r2')
+    store.add_batch('r1', [chunk('def one(): pass', 'h1')])
+    store.add_batch('r2', [chunk('def two(): return 2', 'h2')])
+    # Same chunk id in both repositories, each keeps its own
+    assert store.get_chunk_hashes('r1') == {'src/app.py': ('h1', '4')}
+    assert store.get_chunk_hashes('r2') == {'src/app.py': ('h2', '4')}
+    assert [r['code'] for r in store.search('r1', 'def', n_results=5)] == ['def one(): pass']
+    assert store.search(None, 'def') == []
+
+
+def test_dropping_a_repository_keeps_the_others(store):
+    store.add_batch('r1', [chunk('def one(): pass', 'h1')])
+    store.add_batch('r2', [chunk('def two(): return 2', 'h2')])
+    store.drop_repo('r1')
+    assert store.get_chunk_hashes('r1') == {}
+    assert store.get_chunk_hashes('r2') == {'src/app.py': ('h2', '4')}
+    store.drop_repo('never-analyzed')
+
+    store.add_code_chunk('r2', 'src/app.py', 'def two(): return 3', {'content_hash': 'h3', 'extractor_version': '4'})
+    store.delete_chunks('r2', [])
+    assert store.get_chunk_hashes('r2') == {'src/app.py': ('h3', '4')}
+    store.delete_chunks('r2', ['src/app.py'])
+    assert store.get_chunk_hashes('r2') == {}